@@ -8,12 +8,16 @@ except (ImportError, KeyError):
 
 import streamlit as st
 import os
-import re
 import json
 import time
 from datetime import datetime
 from katonic.llm import generate_completion
-from katonic.llm.log_requests import log_request_to_platform
+from src.utils.llm_cache import get_response_cache, make_cache_key
+from src.utils.log_queue import get_log_queue
+from src.utils.artifact_store import get_artifact_store
+from src.utils.resilience import call_with_resilience
+from src.utils.rate_limiter import estimate_tokens, get_rate_limiter
+from src.utils.agent_metrics import get_agent_metrics
 
 st.set_page_config(
     page_title="CrewAI Lead Qualification",
@@ -63,20 +67,34 @@ def katonic_llm_wrapper(query, model_id, user_email, project_name, model_name):
     """
     Wrapper function to use Katonic LLM with automatic request logging
     """
+    # Serve repeated prompts (reruns, re-submissions) from the response cache
+    cache = get_response_cache()
+    cache_key = make_cache_key(model_id, None, query)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        st.sidebar.info("♻️ Response served from cache")
+        return cached, 0.0
+    
+    get_rate_limiter(model_id).acquire(estimate_tokens(query))
+    
     start_time = time.time()
     status = "success"
     response = ""
-    message_id = None
     
     try:
-        # Generate completion using Katonic
-        response = generate_completion(
-            model_id=model_id,
-            data={"query": query}
+        # Generate completion using Katonic, retrying transient gateway errors
+        response = call_with_resilience(
+            model_id,
+            lambda: generate_completion(
+                model_id=model_id,
+                data={"query": query}
+            )
         )
         
         latency = time.time() - start_time
         status = "success"
+        if isinstance(response, str):
+            cache.set(cache_key, response)
         
     except Exception as e:
         latency = time.time() - start_time
@@ -85,38 +103,40 @@ def katonic_llm_wrapper(query, model_id, user_email, project_name, model_name):
         st.error(f"❌ Katonic LLM Error: {e}")
     
     finally:
-        # Log the request to Katonic platform
-        try:
-            message_id = log_request_to_platform(
-                input_query=query[:500],
-                response=response[:500] if status == "success" else response,
-                user_name=user_email,
-                model_name=model_name,
-                product_type="AI Studio",
-                product_name="Lead Qualification System",
-                project_name=project_name,
-                latency=latency,
-                status=status
-            )
-            
-            if message_id and status == "success":
-                st.sidebar.success(f"✅ Request logged: {message_id[:8]}...")
-            elif message_id and status == "failed":
-                st.sidebar.warning(f"⚠️ Failed request logged: {message_id[:8]}...")
-        except Exception as log_error:
-            st.sidebar.warning(f"⚠️ Logging failed: {log_error}")
-    
-    return response, latency, message_id
+        # Queue the request log for background delivery to Katonic platform
+        get_log_queue().submit(
+            input_query=query[:500],
+            response=response[:500] if status == "success" else response,
+            user_name=user_email,
+            model_name=model_name,
+            product_type="AI Studio",
+            product_name="Lead Qualification System",
+            project_name=project_name,
+            latency=latency,
+            status=status
+        )
+    
+    return response, latency
 
 # Import CrewAI functions
 try:
-    from src.crew.lead_crew_simple import run_email_qualification_simple, run_form_qualification_simple
-    crew_avlable = True
+    from src.crew.lead_crew import run_email_qualification_simple, run_form_qualification_simple
+    from src.crew.cascade import run_cascade_qualification, get_cascade_stats
+    from src.agents.registry import AgentRegistry
+    from src.agents.lead_agents import AGENT_PROFILES
+    from src.models import Lead
+    crewai_available = True
 except ImportError:
     st.warning("⚠️ CrewAI integration not available. Using direct Katonic LLM instead.")
     crewai_available = False
 
 from src.utils.validators import validate_email, validate_form_data
+from src.utils.text_analysis import parse_text_analysis
+
+@st.cache_resource
+def get_agent_registry():
+    """Agent registry shared across script reruns and user sessions"""
+    return AgentRegistry()
 
 #--------------------------------#
 #         Streamlit App          #
@@ -289,6 +309,44 @@ def render_sidebar():
             help="Lower values make output more focused and deterministic"
         )
         
+        agent_models = {}
+        model_prices = {}
+        if crewai_available:
+            with st.expander("🧭 Per-Agent Models"):
+                st.caption("Leave the model ID blank to use the Katonic model above. "
+                           "Prices are per 1K tokens and only used for the cost report.")
+                for agent_name, profile in AGENT_PROFILES.items():
+                    st.markdown(f"**{profile['role']}**")
+                    agent_model_id = st.text_input(
+                        "Model ID", key=f"{agent_name}_model_id", type="password",
+                        placeholder="Default model"
+                    )
+                    agent_temperature = st.slider(
+                        "Temperature", 0.0, 1.0, temperature, 0.1, key=f"{agent_name}_temperature"
+                    )
+                    agent_max_tokens = st.number_input(
+                        "Max output tokens (0 = no limit)", min_value=0, max_value=8192, value=0, step=64,
+                        key=f"{agent_name}_max_tokens"
+                    )
+                    prompt_column, completion_column = st.columns(2)
+                    with prompt_column:
+                        prompt_price = st.number_input(
+                            "Prompt $/1K", min_value=0.0, value=0.0, step=0.0005, format="%.4f",
+                            key=f"{agent_name}_prompt_price"
+                        )
+                    with completion_column:
+                        completion_price = st.number_input(
+                            "Output $/1K", min_value=0.0, value=0.0, step=0.0005, format="%.4f",
+                            key=f"{agent_name}_completion_price"
+                        )
+                    agent_models[agent_name] = {
+                        "model_id": agent_model_id or None,
+                        "temperature": agent_temperature,
+                        "max_tokens": int(agent_max_tokens) or None
+                    }
+                    if prompt_price or completion_price:
+                        model_prices[agent_model_id or katonic_model_id] = (prompt_price, completion_price)
+        
         st.subheader("🎯 Lead Qualification Setup")
         
         st.markdown("**Target Industries**")
@@ -315,6 +373,26 @@ def render_sidebar():
             label_visibility="collapsed"
         )
         
+        st.markdown("**Scoring Mode**")
+        scoring_mode = st.radio(
+            "Scoring Mode",
+            ["Rubric engine (faster)", "LLM lead scorer"],
+            index=1,
+            label_visibility="collapsed",
+            help="The rubric engine applies the scoring guide locally and saves one LLM call per lead"
+        )
+        
+        st.markdown("**Execution Mode**")
+        execution_mode = st.radio(
+            "Execution Mode",
+            ["Full agent crew", "Single fused call", "Cheap-first cascade"],
+            index=0,
+            label_visibility="collapsed",
+            help="The fused call asks for the whole analysis in one schema-checked response. "
+                 "The cascade answers obvious leads with local rules, then tries the fused call, "
+                 "and only runs the full crew when neither is confident"
+        )
+        
         with st.expander("📊 Scoring Guide"):
             st.markdown("""
             **Lead Scoring (100 points total):**
@@ -360,10 +438,29 @@ def render_sidebar():
         
         if not crewai_available:
             st.warning("⚠️ CrewAI integration disabled")
+        elif execution_mode.startswith("Cheap"):
+            for tier, counters in get_cascade_stats().stats().items():
+                if counters['attempts']:
+                    st.caption(
+                        f"{tier}: {counters['hit_rate']:.0%} answered of {counters['attempts']}, "
+                        f"{counters['mean_latency_ms']:.0f} ms avg"
+                    )
+        
+        if crewai_available:
+            for agent_name, counters in get_agent_metrics().stats(model_prices).items():
+                cost = f"${counters['cost']:.4f}" if counters['cost'] is not None else "cost n/a"
+                st.caption(
+                    f"{agent_name}: {counters['calls']} calls ({counters['cached']} cached), "
+                    f"{counters['mean_latency_ms']:.0f} ms avg, {cost}"
+                )
         
         return {
             "model": model_name,
             "temperature": temperature,
+            "scoring": "rules" if scoring_mode.startswith("Rubric") else "llm",
+            "cascade": execution_mode.startswith("Cheap"),
+            "backend": "fused" if execution_mode.startswith("Single") else "crew",
+            "agent_models": agent_models or None,
             "target_config": {
                 "industries": target_industries,
                 "company_sizes": target_company_sizes,
@@ -403,52 +500,6 @@ def get_qualification_style(qualification, score):
     else:
         return "cold-lead", "#6b7280", "❓"
 
-def parse_text_analysis(text_response):
-    """Parse text response into structured format"""
-    # Initialize default structure
-    result = {
-        'score': 0,
-        'qualification': 'Unknown',
-        'score_breakdown': {},
-        'recommendations': {},
-        'analysis_summary': text_response,
-        'contact_info': {},
-        'company_analysis': {}
-    }
-    
-    # Try to extract score using regex
-    score_match = re.search(r'score.*?(\d+)/100', text_response.lower())
-    if score_match:
-        result['score'] = int(score_match.group(1))
-    
-    # Try to extract qualification
-    qual_match = re.search(r'(hot|warm|cold)', text_response.lower())
-    if qual_match:
-        result['qualification'] = qual_match.group(1).title()
-    
-    # Try to extract score breakdown
-    breakdown_patterns = {
-        'email_domain_score': r'email.*?(\d+)/20',
-        'company_fit_score': r'company.*?fit.*?(\d+)/40',
-        'role_score': r'role.*?(\d+)/20',
-        'message_intent_score': r'message.*?intent.*?(\d+)/20'
-    }
-    
-    for key, pattern in breakdown_patterns.items():
-        match = re.search(pattern, text_response.lower())
-        if match:
-            result['score_breakdown'][key] = int(match.group(1))
-    
-    # Extract recommendations
-    if 'recommend' in text_response.lower():
-        result['recommendations'] = {
-            'next_action': 'Review analysis for specific recommendations',
-            'priority': 'Medium',
-            'reasoning': 'See detailed analysis above'
-        }
-    
-    return result
-
 # Simple lead qualification function using direct Katonic LLM
 def simple_lead_qualification(input_data, input_method, target_config):
     """Simple lead qualification using direct Katonic LLM calls"""
@@ -496,7 +547,7 @@ def simple_lead_qualification(input_data, input_method, target_config):
     - Summary of key findings and strategic recommendations
     """
     
-    response, latency, message_id = katonic_llm_wrapper(
+    response, latency = katonic_llm_wrapper(
         query=prompt,
         model_id=katonic_model_id,
         user_email=user_email,
@@ -681,14 +732,34 @@ if email_submitted or form_submitted:
     # Initialize tracking variables
     request_id = f"req_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     total_latency = 0
-    message_ids = []
+    logged_before = get_log_queue().stats()['submitted']
     
     # Run AI analysis
     with st.status("🤖 AI agents are analyzing...", expanded=True) as status:
         try:
             start_time = time.time()
             
-            if crewai_available:
+            if crewai_available and config['cascade']:
+                status.update(label="🪜 Trying the cheapest confident tier...")
+                if input_method == "email":
+                    lead = Lead(kind='email', email=sender_email, subject=email_subject, content=email_content)
+                else:
+                    lead = Lead(kind='form', email=form_email, name=form_name, company=form_company,
+                                designation=form_designation or '', content=form_query)
+                result = run_cascade_qualification(
+                    lead,
+                    target_config=config['target_config'],
+                    model_id=katonic_model_id,
+                    user_email=user_email,
+                    project_name=project_name,
+                    model_name=config['model'],
+                    registry=get_agent_registry(),
+                    scoring=config['scoring'],
+                    artifact_store=get_artifact_store(),
+                    agent_models=config['agent_models']
+                )
+                parsed_result = result.to_dict()
+            elif crewai_available:
                 # Use CrewAI if available
                 if input_method == "email":
                     status.update(label="📧 Email Parser Agent extracting information...")
@@ -700,7 +771,12 @@ if email_submitted or form_submitted:
                         model_id=katonic_model_id,
                         user_email=user_email,
                         project_name=project_name,
-                        model_name=config['model']
+                        model_name=config['model'],
+                        registry=get_agent_registry(),
+                        scoring=config['scoring'],
+                        artifact_store=get_artifact_store(),
+                        backend=config['backend'],
+                        agent_models=config['agent_models']
                     )
                 else:
                     status.update(label="📝 Form Parser Agent structuring data...")
@@ -714,12 +790,16 @@ if email_submitted or form_submitted:
                         model_id=katonic_model_id,
                         user_email=user_email,
                         project_name=project_name,
-                        model_name=config['model']
+                        model_name=config['model'],
+                        registry=get_agent_registry(),
+                        scoring=config['scoring'],
+                        artifact_store=get_artifact_store(),
+                        backend=config['backend'],
+                        agent_models=config['agent_models']
                     )
                 
-                # For CrewAI, we'll use the text result directly
-                parsed_result = parse_text_analysis(str(result))
-                parsed_result['analysis_summary'] = str(result)
+                # Read the per-task structured outputs directly
+                parsed_result = result.to_dict()
             else:
                 # Use simple Katonic LLM approach
                 status.update(label="🔍 Analyzing lead information...")
@@ -732,24 +812,18 @@ if email_submitted or form_submitted:
             status.update(label="✅ AI analysis complete!", state="complete", expanded=False)
             
             # Additional logging for the complete analysis
-            try:
-                query_summary = f"Lead Qualification - {input_method.title()}"
-                message_id = log_request_to_platform(
-                    input_query=query_summary,
-                    response=parsed_result.get('analysis_summary', '')[:500],
-                    user_name=user_email,
-                    model_name=config['model'],
-                    product_type="AI Studio",
-                    product_name="Lead Qualification System",
-                    project_name=project_name,
-                    latency=total_latency,
-                    status="success"
-                )
-                
-                if message_id:
-                    message_ids.append(message_id)
-            except Exception as log_err:
-                st.warning(f"⚠️ Failed to log complete analysis: {log_err}")
+            query_summary = f"Lead Qualification - {input_method.title()}"
+            get_log_queue().submit(
+                input_query=query_summary,
+                response=parsed_result.get('analysis_summary', '')[:500],
+                user_name=user_email,
+                model_name=config['model'],
+                product_type="AI Studio",
+                product_name="Lead Qualification System",
+                project_name=project_name,
+                latency=total_latency,
+                status="success"
+            )
             
         except Exception as e:
             end_time = time.time()
@@ -758,23 +832,18 @@ if email_submitted or form_submitted:
             status.update(label="❌ Error occurred", state="error")
             
             # Log error to Katonic
-            try:
-                error_query = f"Lead Qualification Error - {input_method.title()}"
-                message_id = log_request_to_platform(
-                    input_query=error_query,
-                    response=f"Error: {str(e)}",
-                    user_name=user_email,
-                    model_name=config['model'],
-                    product_type="AI Studio",
-                    product_name="Lead Qualification System",
-                    project_name=project_name,
-                    latency=processing_time,
-                    status="failed"
-                )
-                if message_id:
-                    message_ids.append(message_id)
-            except Exception as log_err:
-                st.warning(f"⚠️ Failed to log error: {log_err}")
+            error_query = f"Lead Qualification Error - {input_method.title()}"
+            get_log_queue().submit(
+                input_query=error_query,
+                response=f"Error: {str(e)}",
+                user_name=user_email,
+                model_name=config['model'],
+                product_type="AI Studio",
+                product_name="Lead Qualification System",
+                project_name=project_name,
+                latency=processing_time,
+                status="failed"
+            )
             
             st.error(f"An error occurred: {str(e)}")
             st.stop()
@@ -801,8 +870,10 @@ if email_submitted or form_submitted:
             <em>Powered by Katonic LLM Gateway | Model: {config['model']} | Processing time: {processing_time:.2f}s</em>
     """
     
-    if message_ids:
-        workflow_html += f"""<br><span class="katonic-badge">🔄 {len(message_ids)} requests logged to Katonic Platform</span>"""
+    # Records this analysis queued for the platform (other sessions share the queue)
+    requests_logged = get_log_queue().stats()['submitted'] - logged_before
+    if requests_logged:
+        workflow_html += f"""<br><span class="katonic-badge">🔄 {requests_logged} requests queued for the Katonic Platform</span>"""
     
     workflow_html += """
         </p>
@@ -944,21 +1015,23 @@ if email_submitted or form_submitted:
     """, unsafe_allow_html=True)
     
     # Katonic Logging Summary
-    if message_ids:
+    if requests_logged:
+        log_stats = get_log_queue().stats()
         st.markdown("---")
         st.markdown("### 📊 Katonic Logging Summary")
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Requests Logged", len(message_ids))
+            st.metric("Requests Queued", requests_logged)
         with col2:
             st.metric("Total Latency", f"{total_latency:.2f}s")
         with col3:
-            st.metric("Status", "Success ✅")
+            st.metric("Awaiting Delivery", log_stats['pending'])
         
-        with st.expander("📋 View Message IDs"):
-            for idx, msg_id in enumerate(message_ids, 1):
-                st.code(f"Request {idx}: {msg_id}", language="text")
+        with st.expander("📋 View Log Delivery"):
+            st.caption(f"Delivered: {log_stats['delivered']} in {log_stats['batches']} batches · "
+                       f"Failed: {log_stats['errors']} · Dropped: {log_stats['dropped']} · "
+                       f"Sampled out: {log_stats['sampled_out']}")
     
     # Download report
     st.markdown("---")
@@ -968,7 +1041,7 @@ if email_submitted or form_submitted:
 ## Katonic Configuration
 - **Model ID:** {katonic_model_id[:8]}...
 - **Model Name:** {config['model']}
-- **Requests Logged:** {len(message_ids)}
+- **Requests Logged:** {requests_logged}
 - **Total Latency:** {total_latency:.2f} seconds
 - **User:** {user_email}
 - **Project:** {project_name}
@@ -1044,7 +1117,7 @@ if email_submitted or form_submitted:
                 "total_latency_seconds": total_latency
             },
             "katonic_logging": {
-                "message_ids": message_ids,
+                "requests_logged": requests_logged,
                 "user": user_email,
                 "project": project_name
             }
@@ -0,0 +1,48 @@
+"""
+Benchmark domain classification with the memory-mapped domain index
+
+Usage:
+    python benchmarks/bench_domain_index.py [lookups]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.domain_index import DomainIndex, build_domain_index
+
+
+DOMAINS = ['gmail.com', 'uk.mail.yahoo.com', 'mailinator.com', 'acme.co.uk', 'mail.acme.co.uk',
+           'microsoft.com', 'startup.io', 'globex.com', 'outlook.com', 'initech.com.au']
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(7)
+    domains = [rng.choice(DOMAINS) for _ in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'domain_index.bin')
+        start = time.perf_counter()
+        entries = build_domain_index(path)
+        build_seconds = time.perf_counter() - start
+        print(f"built {entries} domains into {os.path.getsize(path)} bytes in {build_seconds * 1000:.1f} ms")
+
+        index = DomainIndex(path)
+        start = time.perf_counter()
+        index.classify('gmail.com')
+        print(f"first lookup (maps the file) {(time.perf_counter() - start) * 1e6:8.1f} us")
+
+        start = time.perf_counter()
+        for domain in domains:
+            index.classify(domain)
+        seconds = time.perf_counter() - start
+        print(f"{count} classify calls  {seconds:8.3f}s  ({seconds / count * 1e6:.2f} us per lookup)")
+
+
+if __name__ == '__main__':
+    main()
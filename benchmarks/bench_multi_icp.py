@@ -0,0 +1,65 @@
+"""
+Benchmark scoring N researched leads against M team target configs: one
+score_lead call per pair versus score_lead_matrix
+
+Usage:
+    python benchmarks/bench_multi_icp.py [leads] [teams]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models import Lead
+from src.scoring import score_lead
+from src.scoring.matrix import score_lead_matrix
+
+
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Manufacturing", "Retail", "Education", "Consulting", "Real Estate"]
+SIZES = ["Startup (1-50)", "SMB (51-500)", "Enterprise (500+)"]
+REGIONS = ["North America", "Europe", "Asia Pacific", "Latin America", "Middle East & Africa"]
+LOCATIONS = ["Toronto, Canada", "Berlin, Germany", "Singapore", "Sao Paulo, Brazil", "Dubai, UAE", "Unknown"]
+
+
+def random_team(rng):
+    return {
+        'industries': rng.sample(INDUSTRIES, rng.randint(1, 3)),
+        'company_sizes': rng.sample(SIZES, rng.randint(1, 2)),
+        'regions': rng.sample(REGIONS, rng.randint(1, 2))
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    team_count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rng = random.Random(7)
+
+    teams = {f'team-{index}': random_team(rng) for index in range(team_count)}
+    leads = [Lead(kind='form', email=rng.choice(['a@gmail.com', 'b@acme.com']),
+                  designation=rng.choice(['CEO', 'Engineering Manager', 'Intern', '']),
+                  content=rng.choice(['We need pricing for 50 seats', 'Hello', 'Tell me more about the product']))
+             for _ in range(count)]
+    contacts = [{} for _ in leads]
+    companies = [{'industry': rng.choice(INDUSTRIES), 'company_size': rng.choice(SIZES),
+                  'location': rng.choice(LOCATIONS)} for _ in leads]
+    print(f"{count} leads x {team_count} teams")
+
+    start = time.perf_counter()
+    looped = [[score_lead(lead, contact, company, config)['total_score'] for config in teams.values()]
+              for lead, contact, company in zip(leads, contacts, companies)]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = score_lead_matrix(leads, contacts, companies, teams)
+    matrix_seconds = time.perf_counter() - start
+
+    assert table['scores'].tolist() == looped
+    print(f"per-pair score_lead   {loop_seconds:8.3f}s")
+    print(f"score_lead_matrix     {matrix_seconds:8.3f}s  ({loop_seconds / matrix_seconds:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
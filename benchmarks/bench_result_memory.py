@@ -0,0 +1,121 @@
+"""
+Benchmark memory held by a batch of qualification results: the loose
+dictionaries used before (parse_crew_result output plus the app's
+result dictionary) versus Lead / ScoreBreakdown / QualificationResult
+
+Usage:
+    python benchmarks/bench_result_memory.py [count]
+"""
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models import Lead, QualificationResult, dump_jsonl, load_jsonl
+
+
+class TaskOutput:
+    def __init__(self, json_dict):
+        self.pydantic = None
+        self.json_dict = json_dict
+        self.raw = ''
+
+
+class CrewOutput:
+    def __init__(self, raw, tasks_output):
+        self.raw = raw
+        self.tasks_output = tasks_output
+
+
+def task_dicts(index):
+    return [
+        {'sender_name': f'Contact {index}', 'company_name': f'Company {index}', 'designation': 'VP Sales',
+         'domain': f'company{index}.com', 'intent': 'Pricing inquiry'},
+        {'industry': 'Technology', 'company_size': 'SMB (51-500)', 'location': 'North America',
+         'domain_type': 'business'},
+        {'total_score': 80, 'email_domain_score': 20, 'company_fit_score': 30, 'role_score': 20,
+         'message_intent_score': 10, 'qualification_status': 'Qualified',
+         'role_justification': 'Senior decision maker'},
+        {'next_action': 'Forward to Sales', 'priority': 'High', 'reasoning': 'Strong fit',
+         'talking_points': ['ROI'], 'concerns': []},
+    ]
+
+
+def final_answer(index):
+    return f"Lead {index} qualifies: forward to sales. " * 20
+
+
+def legacy_results(count):
+    results = []
+    for index in range(count):
+        objects = task_dicts(index)
+        raw = final_answer(index)
+        parsed = {
+            'raw_output': raw,
+            'parsed_json': objects,
+            'score': objects[2]['total_score'],
+            'qualification': objects[2]['qualification_status'],
+            'recommendations': objects[3],
+            'score_breakdown': objects[2]
+        }
+        # The app re-derived its own dictionary from str(result)
+        app = {
+            'score': parsed['score'],
+            'qualification': parsed['qualification'],
+            'score_breakdown': dict(objects[2]),
+            'recommendations': dict(objects[3]),
+            'analysis_summary': ''.join([raw]),
+            'contact_info': {},
+            'company_analysis': {}
+        }
+        lead = {'type': 'email', 'sender_email': f'contact{index}@company{index}.com',
+                'email_subject': 'Pricing', 'email_content': 'Please send pricing', 'id': index}
+        results.append({'id': index, 'lead': lead, 'parsed': parsed, 'app': app, 'error': None})
+    return results
+
+
+def typed_results(count):
+    results = []
+    for index in range(count):
+        outputs = [TaskOutput(data) for data in task_dicts(index)]
+        lead = Lead(kind='email', email=f'contact{index}@company{index}.com', subject='Pricing',
+                    content='Please send pricing', id=index)
+        results.append(QualificationResult.from_crew_output(CrewOutput(final_answer(index), outputs), lead=lead))
+    return results
+
+
+def measure(label, build, count):
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = build(count)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {current / 1024 / 1024:8.1f} MB  {current / count:8.0f} B/lead  {elapsed:6.2f}s")
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"Results: {count}")
+
+    measure("loose dictionaries", legacy_results, count)
+    typed = measure("typed results", typed_results, count)
+
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    dump_jsonl(typed, buffer)
+    written = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded = sum(1 for _ in load_jsonl(io.StringIO(buffer.getvalue())))
+    read = time.perf_counter() - start
+    print(f"JSONL: {len(buffer.getvalue()) / 1024 / 1024:.1f} MB written in {written:.2f}s, "
+          f"{loaded} read back in {read:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
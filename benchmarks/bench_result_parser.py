@@ -0,0 +1,86 @@
+"""
+Benchmark JSON extraction from agent transcripts: the original regex used
+by parse_crew_result versus the single-pass scanner
+
+Usage:
+    python benchmarks/bench_result_parser.py [size_mb]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.json_extractor import JSONObjectScanner, iter_json_objects
+
+
+LEGACY_JSON_PATTERN = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
+
+SCORE = {
+    "total_score": 75,
+    "email_domain_score": 20,
+    "company_fit_score": 30,
+    "role_score": 10,
+    "message_intent_score": 15,
+    "qualification_status": "Qualified",
+    "details": {"industry": {"value": "Technology", "matched": True}}
+}
+
+BLOCK = (
+    "Thought: I now know the final answer. The template uses {sender_email} and {company}.\n"
+    "Action Input: {\"query\": \"lookup {domain}\", \"options\": {\"depth\": {\"max\": 2}}}\n"
+    "```json\n" + json.dumps(SCORE, indent=2) + "\n```\n"
+    "Observation: set notation like {a, {b, {c}}} and unbalanced { braces appear in logs.\n"
+)
+
+
+def legacy_extract(text):
+    """
+    Original parse_crew_result extraction
+    """
+    objects = []
+    for match in re.findall(LEGACY_JSON_PATTERN, text, re.DOTALL):
+        try:
+            objects.append(json.loads(match))
+        except json.JSONDecodeError:
+            continue
+    return objects
+
+
+def timed(label, fn, text):
+    start = time.perf_counter()
+    objects = fn(text)
+    elapsed = time.perf_counter() - start
+    with_score = sum(1 for obj in objects if 'total_score' in obj)
+    print(f"{label:<22} {elapsed:8.3f}s  {len(objects):7d} objects  {with_score:6d} with total_score")
+    return elapsed
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    text = BLOCK * int(size_mb * 1024 * 1024 / len(BLOCK))
+    print(f"Transcript size: {len(text) / 1024 / 1024:.1f} MB")
+
+    timed("legacy regex", legacy_extract, text)
+    timed("single-pass scanner", lambda t: list(iter_json_objects(t)), text)
+
+    def streamed(t):
+        scanner = JSONObjectScanner()
+        raw = []
+        for offset in range(0, len(t), 4096):
+            raw.extend(scanner.feed(t[offset:offset + 4096]))
+        return [json.loads(r) for r in raw if r.startswith('{"') or r.startswith('{\n')]
+
+    timed("streamed 4 KB chunks", streamed, text)
+
+    # Pathological input: one long unterminated brace run
+    hostile = "{" + "{a} " * 20000
+    timed("legacy regex (hostile)", legacy_extract, hostile)
+    timed("scanner (hostile)", lambda t: list(iter_json_objects(t)), hostile)
+
+
+if __name__ == '__main__':
+    main()
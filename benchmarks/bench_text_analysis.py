@@ -0,0 +1,137 @@
+"""
+Benchmark parse_text_analysis: the original multi-regex version from app.py
+versus the single-pass section extractor
+
+Usage:
+    python benchmarks/bench_text_analysis.py [repeat]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.text_analysis import parse_text_analysis
+
+
+ANALYSIS = """LEAD QUALIFICATION ANALYSIS
+===========================
+
+CONTACT INFORMATION:
+- Jane Doe, VP Engineering at Acme Corp (jane@acme.com); the role is senior
+
+COMPANY ANALYSIS:
+- Technology company; the email domain scored 12/20 in last quarter's review
+- Company fit looks strong for the SMB segment, not a cold outreach
+
+SCORING BREAKDOWN:
+- Overall Score: 85/100
+- Email Domain Quality: 20/20
+- Company Fit: 35/40
+- Contact Role: 20/20
+- Message Intent: 10/20
+
+QUALIFICATION LEVEL:
+- Hot - clear buying signals and budget
+
+RECOMMENDATIONS:
+- Next action: Forward to sales within 24 hours
+- Priority: High
+- Reasoning: decision maker with an active evaluation
+
+FINAL ASSESSMENT:
+- Strong lead worth prioritizing.
+"""
+
+EXPECTED = {
+    'score': 85,
+    'qualification': 'Hot',
+    'score_breakdown': {
+        'email_domain_score': 20,
+        'company_fit_score': 35,
+        'role_score': 20,
+        'message_intent_score': 10
+    }
+}
+
+FILLER = "Detailed notes about the company, its email domain and intent. " * 40 + "\n"
+
+
+def legacy_parse_text_analysis(text_response):
+    """Original parse_text_analysis from app.py"""
+    # Initialize default structure
+    result = {
+        'score': 0,
+        'qualification': 'Unknown',
+        'score_breakdown': {},
+        'recommendations': {},
+        'analysis_summary': text_response,
+        'contact_info': {},
+        'company_analysis': {}
+    }
+    
+    # Try to extract score using regex
+    score_match = re.search(r'score.*?(\d+)/100', text_response.lower())
+    if score_match:
+        result['score'] = int(score_match.group(1))
+    
+    # Try to extract qualification
+    qual_match = re.search(r'(hot|warm|cold)', text_response.lower())
+    if qual_match:
+        result['qualification'] = qual_match.group(1).title()
+    
+    # Try to extract score breakdown
+    breakdown_patterns = {
+        'email_domain_score': r'email.*?(\d+)/20',
+        'company_fit_score': r'company.*?fit.*?(\d+)/40',
+        'role_score': r'role.*?(\d+)/20',
+        'message_intent_score': r'message.*?intent.*?(\d+)/20'
+    }
+    
+    for key, pattern in breakdown_patterns.items():
+        match = re.search(pattern, text_response.lower())
+        if match:
+            result['score_breakdown'][key] = int(match.group(1))
+    
+    # Extract recommendations
+    if 'recommend' in text_response.lower():
+        result['recommendations'] = {
+            'next_action': 'Review analysis for specific recommendations',
+            'priority': 'Medium',
+            'reasoning': 'See detailed analysis above'
+        }
+    
+    return result
+
+
+def check(label, fn, text):
+    result = fn(text)
+    fields = {key: result[key] for key in EXPECTED}
+    status = 'correct' if fields == EXPECTED else f'WRONG {fields}'
+    print(f"{label:<14} {status}")
+
+
+def timed(label, fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<14} {elapsed * 1000:9.3f} ms per analysis ({len(text) / 1024:.0f} KB)")
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    check("legacy", legacy_parse_text_analysis, ANALYSIS)
+    check("single-pass", parse_text_analysis, ANALYSIS)
+
+    for filler_lines in (0, 200, 2000):
+        text = FILLER * filler_lines + ANALYSIS
+        timed("legacy", legacy_parse_text_analysis, text, repeat)
+        timed("single-pass", parse_text_analysis, text, repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 CrewAI Agents for Lead Qualification
 """
 
-from .lead_agents import create_lead_qualification_agents
+from .lead_agents import create_lead_qualification_agents, resolve_agent_models
+from .registry import AgentRegistry, default_registry
 
-__all__ = ['create_lead_qualification_agents']
+__all__ = ['create_lead_qualification_agents', 'resolve_agent_models', 'AgentRegistry', 'default_registry']
@@ -4,71 +4,216 @@ Define all CrewAI agents for lead qualification with Katonic LLM integration
 
 from crewai import Agent
 from katonic.llm import generate_completion
-from katonic.llm.log_requests import log_request_to_platform
+import copy
 import time
 
+from src.utils.llm_cache import get_response_cache, make_cache_key
+from src.utils.log_queue import get_log_queue
+from src.utils.singleflight import default_singleflight
+from src.utils.resilience import call_with_resilience
+from src.utils.rate_limiter import estimate_tokens, get_rate_limiter
+from src.utils.concurrency import get_concurrency_limiter
+from src.utils.agent_metrics import get_agent_metrics
+
+
+# Role, goal and backstory of each lead qualification agent
+AGENT_PROFILES = {
+    'email_parser': {
+        'role': 'Email Information Extractor',
+        'goal': 'Extract all relevant contact and company information from email content',
+        'backstory': 'You are an expert at parsing emails and extracting structured data. '
+                     'You can identify names, companies, job titles, and intent from email text. '
+                     'You always return information in a clear, structured format.'
+    },
+    'company_researcher': {
+        'role': 'Company Research Specialist',
+        'goal': 'Research and gather detailed information about companies including industry, size, and location',
+        'backstory': 'You are a business intelligence expert who can infer company details from domains '
+                     'and email information. You understand business classifications, market segments, '
+                     'and can estimate company size from context clues.'
+    },
+    'lead_scorer': {
+        'role': 'Lead Qualification Specialist',
+        'goal': 'Score leads based on email quality, company fit, role seniority, and message intent',
+        'backstory': 'You are an experienced sales qualification expert who can assess lead quality. '
+                     'You understand buyer personas, decision-making hierarchies, and sales readiness signals. '
+                     'You follow strict scoring rubrics and provide detailed justifications.'
+    },
+    'recommendation_agent': {
+        'role': 'Sales Strategy Advisor',
+        'goal': 'Provide actionable recommendations for engaging with leads based on their qualification score',
+        'backstory': 'You are a senior sales strategist who advises on lead engagement tactics. '
+                     'You know when to prioritize, nurture, or disqualify leads. '
+                     'Your recommendations are specific, actionable, and tied to business outcomes.'
+    }
+}
+
+# Model settings that can be chosen per agent
+AGENT_MODEL_FIELDS = ('model_id', 'model_name', 'temperature', 'max_tokens')
+
+
+def resolve_agent_models(model_id, model_name, temperature=0.3, agent_models=None):
+    """
+    Merge per-agent model settings over the default model configuration
+    
+    Args:
+        model_id (str): Default Katonic model ID
+        model_name (str): Default model name for logging
+        temperature (float): Default model temperature
+        agent_models (dict): Agent name -> dict with any of
+            AGENT_MODEL_FIELDS, e.g. {'email_parser': {'model_id': small,
+            'max_tokens': 400}}; agents not listed use the defaults
+    
+    Returns:
+        dict: Agent name -> dict with every AGENT_MODEL_FIELDS key
+    
+    Raises:
+        ValueError: Unknown agent name or setting
+    """
+    agent_models = agent_models or {}
+    unknown = set(agent_models) - set(AGENT_PROFILES)
+    if unknown:
+        raise ValueError(f"Unknown agents {sorted(unknown)}; expected one of {', '.join(AGENT_PROFILES)}")
+    
+    resolved = {}
+    for name in AGENT_PROFILES:
+        overrides = {key: value for key, value in (agent_models.get(name) or {}).items() if value is not None}
+        unknown = set(overrides) - set(AGENT_MODEL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown settings {sorted(unknown)} for {name}")
+        settings = {'model_id': model_id, 'model_name': model_name, 'temperature': temperature,
+                    'max_tokens': None}
+        if 'model_id' in overrides and 'model_name' not in overrides:
+            settings['model_name'] = overrides['model_id']
+        settings.update(overrides)
+        resolved[name] = settings
+    return resolved
+
 
 class KatonicLLMWrapper:
     """
     Custom LLM wrapper for Katonic to integrate with CrewAI agents
     """
     
-    def __init__(self, model_id, user_email, project_name, model_name, temperature=0.3):
+    def __init__(self, model_id, user_email, project_name, model_name, temperature=0.3, cache=None,
+                 log_queue=None, inflight=None, retry_policy=None, hedge=None, max_tokens=None,
+                 agent_name=None, metrics=None):
         self.model_id = model_id
         self.user_email = user_email
         self.project_name = project_name
         self.model_name = model_name
         self.temperature = temperature
+        self.cache = cache or get_response_cache()
+        self.log_queue = log_queue or get_log_queue()
+        self.inflight = inflight or default_singleflight
+        self.retry_policy = retry_policy
+        self.hedge = hedge
+        self.max_tokens = max_tokens
+        self.agent_name = agent_name or 'shared'
+        self.metrics = metrics or get_agent_metrics()
+    
+    def for_agent(self, agent_name):
+        """
+        Return a view of this wrapper that records its calls under agent_name
+        
+        The view shares the model settings, response cache, log queue and
+        in-flight requests with this wrapper; only the per-agent metrics
+        label differs.
+        """
+        view = copy.copy(self)
+        view.agent_name = agent_name
+        return view
     
     def generate_completion(self, prompt):
         """
         Generate completion using Katonic LLM with logging
+        
+        Identical prompts for the same model and temperature are answered
+        from the response cache without calling the gateway, and concurrent
+        identical prompts share a single upstream request.
+        """
+        cache_key = make_cache_key(self.model_id, self.temperature, prompt, self.max_tokens)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.metrics.record(self.agent_name, self.model_id, 0.0, 0, 0, status='cached')
+            return cached
+        
+        return self.inflight.do(cache_key, lambda: self._call_gateway(prompt, cache_key))
+    
+    def forget(self, prompt):
+        """
+        Drop the cached response to a prompt, e.g. one that failed validation
         """
+        self.cache.delete(make_cache_key(self.model_id, self.temperature, prompt, self.max_tokens))
+    
+    def _call_gateway(self, prompt, cache_key):
+        """
+        Call the Katonic gateway, log the request and cache the response
+        
+        Transient gateway errors are retried with backoff, and calls fail
+        fast while the model's circuit breaker is open. Retries and hedged
+        duplicates each take their own rate-limiter tokens.
+        """
+        limiter = get_rate_limiter(self.model_id)
+        prompt_tokens = estimate_tokens(prompt)
+        concurrency = get_concurrency_limiter(self.model_id)
+        
+        # Temperature is part of the cache key, so it must reach the model too
+        data = {"query": prompt, "temperature": self.temperature}
+        if self.max_tokens:
+            data["max_tokens"] = self.max_tokens
+        
+        def attempt():
+            # Every attempt, retry or hedged duplicate, waits for the model's
+            # shared rate limiter and then holds an adaptive concurrency slot
+            limiter.acquire(prompt_tokens)
+            with concurrency.slot():
+                return generate_completion(
+                    model_id=self.model_id,
+                    data=data
+                )
+        
         start_time = time.time()
         try:
-            response = generate_completion(
-                model_id=self.model_id,
-                data={"query": prompt}
+            response = call_with_resilience(
+                self.model_id,
+                attempt,
+                policy=self.retry_policy,
+                hedge=self.hedge
             )
-            
-            latency = time.time() - start_time
-            
-            # Log the request
-            try:
-                log_request_to_platform(
-                    input_query=prompt[:500],  # Limit query length for logging
-                    response=response[:500],   # Limit response length for logging
-                    user_name=self.user_email,
-                    model_name=self.model_name,
-                    product_type="Ace",
-                    product_name="Lead Qualification System",
-                    project_name=self.project_name,
-                    latency=latency,
-                    status="success"
-                )
-            except Exception as log_error:
-                print(f"Logging warning: {log_error}")
-            
-            return response
-            
         except Exception as e:
-            latency = time.time() - start_time
-            # Log error
-            try:
-                log_request_to_platform(
-                    input_query=prompt[:500],
-                    response=f"Error: {str(e)}",
-                    user_name=self.user_email,
-                    model_name=self.model_name,
-                    product_type="Ace",
-                    product_name="Lead Qualification System",
-                    project_name=self.project_name,
-                    latency=latency,
-                    status="failed"
-                )
-            except:
-                pass
+            self._log_request(prompt, f"Error: {str(e)}", time.time() - start_time, "failed")
+            self.metrics.record(self.agent_name, self.model_id, time.time() - start_time,
+                                estimate_tokens(prompt), 0, status='failed')
             raise e
+        
+        latency = time.time() - start_time
+        self.metrics.record(self.agent_name, self.model_id, latency, estimate_tokens(prompt),
+                            estimate_tokens(response if isinstance(response, str) else str(response)))
+        
+        # Limit response length for logging
+        self._log_request(prompt, response[:500], latency, "success")
+        
+        if isinstance(response, str):
+            self.cache.set(cache_key, response)
+        
+        return response
+    
+    def _log_request(self, prompt, response, latency, status):
+        """
+        Queue a request log for background delivery to the Katonic platform
+        """
+        self.log_queue.submit(
+            input_query=prompt[:500],  # Limit query length for logging
+            response=response,
+            user_name=self.user_email,
+            model_name=self.model_name,
+            product_type="Ace",
+            product_name="Lead Qualification System",
+            project_name=self.project_name,
+            latency=latency,
+            status=status
+        )
     
     def __call__(self, messages):
         """
@@ -98,7 +243,8 @@ class KatonicLLMWrapper:
         return formatted_text.strip()
 
 
-def create_lead_qualification_agents(model_id, user_email, project_name, model_name, temperature=0.3):
+def create_lead_qualification_agents(model_id, user_email, project_name, model_name, temperature=0.3,
+                                     llm=None, agent_models=None, llms=None):
     """
     Create all agents needed for lead qualification using Katonic LLM
     
@@ -108,71 +254,37 @@ def create_lead_qualification_agents(model_id, user_email, project_name, model_n
         project_name (str): Project name for logging
         model_name (str): Model name for logging
         temperature (float): Model temperature
+        llm (KatonicLLMWrapper): Existing wrapper to share; agents on the
+            default model call it through a per-agent view (see for_agent)
+        agent_models (dict): Per-agent model settings; see resolve_agent_models
+        llms (dict): Existing wrapper per agent name, e.g. from
+            AgentRegistry.agent_llms; takes precedence over llm and agent_models
     
     Returns:
-        dict: Dictionary of agent instances and LLM wrapper
+        dict: Dictionary of agent instances, the wrapper passed as llm under
+            'llm' and the wrapper of each agent under 'llms'
     """
     
-    # Initialize Katonic LLM wrapper
-    katonic_llm = KatonicLLMWrapper(
-        model_id=model_id,
-        user_email=user_email,
-        project_name=project_name,
-        model_name=model_name,
-        temperature=temperature
-    )
-    
-    email_parser = Agent(
-        role='Email Information Extractor',
-        goal='Extract all relevant contact and company information from email content',
-        backstory='You are an expert at parsing emails and extracting structured data. '
-                  'You can identify names, companies, job titles, and intent from email text. '
-                  'You always return information in a clear, structured format.',
-        llm=katonic_llm,
-        verbose=True,
-        allow_delegation=False
-    )
-    
-    company_researcher = Agent(
-        role='Company Research Specialist',
-        goal='Research and gather detailed information about companies including industry, size, and location',
-        backstory='You are a business intelligence expert who can infer company details from domains '
-                  'and email information. You understand business classifications, market segments, '
-                  'and can estimate company size from context clues.',
-        llm=katonic_llm,
-        verbose=True,
-        allow_delegation=False
-    )
-    
-    lead_scorer = Agent(
-        role='Lead Qualification Specialist',
-        goal='Score leads based on email quality, company fit, role seniority, and message intent',
-        backstory='You are an experienced sales qualification expert who can assess lead quality. '
-                  'You understand buyer personas, decision-making hierarchies, and sales readiness signals. '
-                  'You follow strict scoring rubrics and provide detailed justifications.',
-        llm=katonic_llm,
-        verbose=True,
-        allow_delegation=False
-    )
-    
-    recommendation_agent = Agent(
-        role='Sales Strategy Advisor',
-        goal='Provide actionable recommendations for engaging with leads based on their qualification score',
-        backstory='You are a senior sales strategist who advises on lead engagement tactics. '
-                  'You know when to prioritize, nurture, or disqualify leads. '
-                  'Your recommendations are specific, actionable, and tied to business outcomes.',
-        llm=katonic_llm,
-        verbose=True,
-        allow_delegation=False
-    )
-    
-    return {
-        'email_parser': email_parser,
-        'company_researcher': company_researcher,
-        'lead_scorer': lead_scorer,
-        'recommendation_agent': recommendation_agent,
-        'llm': katonic_llm
+    # One Katonic LLM wrapper per agent, labelled with the agent's name
+    llms = dict(llms or {})
+    default = {'model_id': model_id, 'model_name': model_name, 'temperature': temperature, 'max_tokens': None}
+    for name, settings in resolve_agent_models(model_id, model_name, temperature, agent_models).items():
+        if name in llms:
+            continue
+        if llm is not None and settings == default:
+            llms[name] = llm.for_agent(name)
+        else:
+            llms[name] = KatonicLLMWrapper(user_email=user_email, project_name=project_name,
+                                           agent_name=name, **settings)
+    
+    agents = {
+        name: Agent(**profile, llm=llms[name], verbose=True, allow_delegation=False)
+        for name, profile in AGENT_PROFILES.items()
     }
+    
+    agents['llm'] = llm
+    agents['llms'] = {name: llms[name] for name in AGENT_PROFILES}
+    return agents
 # """
 # Define all CrewAI agents for lead qualification
 # """
@@ -0,0 +1,209 @@
+"""
+Process-wide registry of lead qualification agents
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from src.agents.lead_agents import KatonicLLMWrapper, create_lead_qualification_agents, resolve_agent_models
+
+
+class AgentRegistry:
+    """
+    Thread-safe cache of built objects, pooled per configuration key
+
+    CrewAI agents keep per-run state, so a cached instance is checked out by
+    one crew at a time and returned to the pool afterwards. Concurrent
+    callers with the same key get additional instances, which are kept for
+    reuse up to `max_idle_per_key`. The least recently used keys are evicted
+    once more than `max_keys` configurations are cached.
+    """
+
+    def __init__(self, max_keys=16, max_idle_per_key=4):
+        self.max_keys = max_keys
+        self.max_idle_per_key = max_idle_per_key
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.builds = 0
+        self.reuses = 0
+
+    def _entry(self, key):
+        """
+        Return the pool entry for a key, creating it and evicting old keys
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = {'idle': [], 'shared': {}}
+            self._entries[key] = entry
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return entry
+
+    def shared(self, key, name, factory):
+        """
+        Return an object shared by every checkout of a key, building it once
+
+        Args:
+            key: Configuration key
+            name: Name of the shared object within the key
+            factory: Callable building the object
+
+        Returns:
+            The shared object
+        """
+        with self._lock:
+            shared = self._entry(key)['shared']
+            if name not in shared:
+                shared[name] = factory()
+            return shared[name]
+
+    @contextmanager
+    def checkout(self, key, factory):
+        """
+        Check out an idle instance for a key, building one if none is idle
+
+        Args:
+            key: Configuration key
+            factory: Callable building a new instance
+
+        Yields:
+            The checked out instance
+        """
+        with self._lock:
+            entry = self._entry(key)
+            instance = entry['idle'].pop() if entry['idle'] else None
+            if instance is not None:
+                self.reuses += 1
+
+        if instance is None:
+            instance = factory()
+            with self._lock:
+                self.builds += 1
+
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                entry = self._entries.get(key)
+                # Drop instances whose key was evicted while checked out
+                if entry is not None and len(entry['idle']) < self.max_idle_per_key:
+                    entry['idle'].append(instance)
+
+    @staticmethod
+    def model_key(model_id, user_email, project_name, model_name, temperature=0.3):
+        """
+        Return the configuration key for a model
+        """
+        return (model_id, model_name, temperature, project_name, user_email)
+
+    def shared_llm(self, model_id, user_email, project_name, model_name, temperature=0.3, max_tokens=None,
+                   agent_name=None):
+        """
+        Return the KatonicLLMWrapper shared by every agent of a model configuration
+
+        Args:
+            max_tokens: Answer length limit for the wrapper
+            agent_name: Agent whose calls the wrapper records in the
+                per-agent metrics; each agent then gets its own wrapper
+        """
+        key = self.model_key(model_id, user_email, project_name, model_name, temperature)
+        name = 'llm' if agent_name is None and max_tokens is None else ('llm', agent_name, max_tokens)
+        return self.shared(key, name, lambda: KatonicLLMWrapper(
+            model_id=model_id,
+            user_email=user_email,
+            project_name=project_name,
+            model_name=model_name,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            agent_name=agent_name
+        ))
+
+    @staticmethod
+    def routing_key(agent_models):
+        """
+        Return a hashable key for resolved per-agent model settings
+        """
+        return tuple((name, tuple(sorted(settings.items()))) for name, settings in sorted(agent_models.items()))
+
+    def agent_llms(self, model_id, user_email, project_name, model_name, temperature=0.3, agent_models=None):
+        """
+        Return the shared KatonicLLMWrapper of each agent
+
+        Args:
+            agent_models (dict): Per-agent model settings; see resolve_agent_models
+
+        Returns:
+            dict: Agent name -> KatonicLLMWrapper
+        """
+        resolved = resolve_agent_models(model_id, model_name, temperature, agent_models)
+        return {
+            name: self.shared_llm(user_email=user_email, project_name=project_name, agent_name=name, **settings)
+            for name, settings in resolved.items()
+        }
+
+    @contextmanager
+    def lead_agents(self, model_id, user_email, project_name, model_name, temperature=0.3, agent_models=None):
+        """
+        Check out a set of lead qualification agents for a model configuration
+
+        All agent sets for the same configuration share one KatonicLLMWrapper
+        per agent, labelled with the agent's name in the per-agent metrics.
+
+        Args:
+            model_id (str): Katonic model ID from My Model Library
+            user_email (str): User email for logging
+            project_name (str): Project name for logging
+            model_name (str): Model name for logging
+            temperature (float): Model temperature
+            agent_models (dict): Per-agent model settings; see resolve_agent_models
+
+        Yields:
+            dict: Dictionary of agent instances and LLM wrappers
+        """
+        config = {
+            'model_id': model_id,
+            'user_email': user_email,
+            'project_name': project_name,
+            'model_name': model_name,
+            'temperature': temperature
+        }
+        key = self.model_key(**config) + (
+            self.routing_key(resolve_agent_models(model_id, model_name, temperature, agent_models)),
+        )
+        llms = self.agent_llms(agent_models=agent_models, **config)
+
+        with self.checkout(key, lambda: create_lead_qualification_agents(llms=llms, **config)) as agents:
+            yield agents
+
+    def evict(self, key):
+        """
+        Remove a configuration key and its pooled instances
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every cached configuration
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return cache counters
+
+        Returns:
+            dict: Number of cached keys, builds and reuses
+        """
+        with self._lock:
+            return {
+                'keys': len(self._entries),
+                'builds': self.builds,
+                'reuses': self.reuses
+            }
+
+
+default_registry = AgentRegistry()
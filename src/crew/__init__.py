@@ -3,5 +3,11 @@ CrewAI Crew Management
 """
 
 from .lead_crew import run_email_qualification, run_form_qualification
+from .batch import run_batch_qualification, run_multi_icp_scoring
+from .cascade import run_cascade_qualification, get_cascade_stats
+from .stages import run_packed_qualification
+from .pipeline import run_pipelined_qualification
 
-__all__ = ['run_email_qualification', 'run_form_qualification']
+__all__ = ['run_email_qualification', 'run_form_qualification', 'run_batch_qualification', 'run_multi_icp_scoring',
+           'run_cascade_qualification', 'get_cascade_stats', 'run_packed_qualification',
+           'run_pipelined_qualification']
@@ -0,0 +1,271 @@
+"""
+Batch lead qualification with bounded concurrency
+"""
+
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agents.registry import default_registry
+from src.models.lead import Lead, get_lead_type
+from src.utils.concurrency import get_concurrency_limiter
+from src.crew.lead_crew import run_email_qualification, run_form_qualification, run_lead_research
+from src.crew.cascade import run_cascade_qualification
+from src.crew.stages import DEFAULT_TOKEN_BUDGET, run_packed_qualification
+from src.crew.pipeline import run_pipelined_qualification
+
+
+def qualify_lead(lead, target_config, model_config, registry=None, concurrent=False, scoring='llm',
+                 scoring_weights=None, artifact_store=None, cascade=False, cascade_thresholds=None,
+                 backend='crew'):
+    """
+    Qualify a single lead with agents from the registry
+
+    Args:
+        lead: Lead, or lead dictionary with email or form fields
+        target_config: Target criteria
+        model_config: Dictionary with model_id, user_email, project_name, model_name, temperature
+            and optionally agent_models
+        registry: AgentRegistry to check agents out of
+        concurrent: Use the concurrent task-graph scheduler
+        scoring: 'llm' or 'rules'; see run_email_qualification
+        scoring_weights: Rubric points per line for 'rules' scoring
+        artifact_store: StageArtifactStore for incremental re-scoring
+        cascade: Try local rules and a single fused call before the crew;
+            see run_cascade_qualification
+        cascade_thresholds: Confidence thresholds for the cascade tiers
+        backend: 'crew' or 'fused'; see run_email_qualification
+
+    Returns:
+        QualificationResult: Typed qualification result, with its lead attached
+    """
+    if not isinstance(lead, Lead):
+        lead = Lead.from_dict(lead)
+    
+    if cascade:
+        return run_cascade_qualification(lead, target_config, registry=registry, thresholds=cascade_thresholds,
+                                         scoring=scoring, scoring_weights=scoring_weights,
+                                         artifact_store=artifact_store, **model_config)
+
+    run = run_email_qualification if lead.kind == 'email' else run_form_qualification
+    result = run(target_config=target_config, concurrent=concurrent, registry=registry, scoring=scoring,
+                 scoring_weights=scoring_weights, artifact_store=artifact_store, backend=backend,
+                 **lead.task_fields(), **model_config)
+    return dataclasses.replace(result, lead=lead)
+
+
+def check_batch_mode(pack, pipeline, options):
+    """
+    Raise ValueError for batch options the chosen mode would ignore
+
+    pack and pipeline run their own stage prompts, so the per-lead options
+    (concurrent, artifact_store, cascade, cascade_thresholds and a
+    non-default backend) only apply without them. token_budget needs pack,
+    stage_workers and stage_queue_sizes need pipeline, and pipeline sizes
+    its workers per stage instead of by max_concurrency.
+
+    Args:
+        pack: Packed batch mode requested
+        pipeline: Pipelined batch mode requested
+        options: Option name -> True if the caller set it
+    """
+    if pack and pipeline:
+        raise ValueError("pack and pipeline are alternative batch modes; choose one")
+    per_lead = ('concurrent', 'artifact_store', 'cascade', 'cascade_thresholds', 'backend')
+    unsupported = {
+        'pack': per_lead + ('stage_workers', 'stage_queue_sizes'),
+        'pipeline': per_lead + ('token_budget', 'max_concurrency'),
+        'per-lead': ('token_budget', 'stage_workers', 'stage_queue_sizes')
+    }
+    mode = 'pack' if pack else 'pipeline' if pipeline else 'per-lead'
+    ignored = [name for name in unsupported[mode] if options.get(name)]
+    if ignored:
+        raise ValueError(f"{', '.join(ignored)} cannot be used with {mode} batch qualification")
+
+
+def run_batch_qualification(leads, target_config, model_id, user_email, project_name, model_name,
+                            temperature=0.3, max_concurrency=None, concurrent=False, registry=None,
+                            scoring='llm', scoring_weights=None, artifact_store=None, cascade=False,
+                            cascade_thresholds=None, backend='crew', pack=False, token_budget=None,
+                            pipeline=False, stage_workers=None, stage_queue_sizes=None, agent_models=None):
+    """
+    Qualify many leads at once on a bounded thread pool
+
+    Agents come from the registry, so every crew in the batch shares a single
+    KatonicLLMWrapper and reuses agent sets between leads. A failing
+    lead is reported in its own entry and does not abort the rest of the batch.
+
+    By default each lead is qualified on its own (concurrent, artifact_store,
+    cascade and backend apply per lead). pack and pipeline instead run the
+    whole batch stage by stage and accept only scoring, scoring_weights,
+    agent_models and their own settings; other options raise ValueError
+    (see check_batch_mode).
+
+    Args:
+        leads: Iterable of Lead objects or lead dictionaries. Each may carry
+            an 'id'; otherwise its position in the input is used
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        max_concurrency: Maximum number of leads processed at once. By default
+            the pool is sized to the model's adaptive concurrency ceiling and
+            the controller decides how many LLM calls are actually in flight
+        concurrent: Also run independent tasks within each lead concurrently
+        registry: AgentRegistry to use instead of the process-wide default
+        scoring: 'llm' or 'rules'; 'rules' saves one LLM call per lead
+        scoring_weights: Rubric points per line for 'rules' scoring
+        artifact_store: StageArtifactStore holding each lead's stage outputs.
+            Re-running a batch against new target criteria then reuses the
+            parse and research stages and only re-scores
+        cascade: Answer each lead with the cheapest confident tier (local
+            rules, one fused call, then the crew)
+        cascade_thresholds: Confidence thresholds for the cascade tiers
+        backend: 'crew', or 'fused' for one schema-validated LLM call per lead
+        pack: Run the batch stage by stage, packing as many leads into each
+            LLM request as token_budget allows; see run_packed_qualification
+        token_budget: Prompt plus answer tokens per packed request
+        pipeline: Give each stage its own queue and workers so different
+            leads are parsed, researched, scored and recommended at the same
+            time; leads are read from the iterable as the pipeline drains.
+            See run_pipelined_qualification, which also streams results
+        stage_workers: Worker threads per stage for pipeline
+        stage_queue_sizes: Input queue bound per stage for pipeline
+        agent_models: Per-agent model_id, model_name, temperature and
+            max_tokens, keyed by agent name; see resolve_agent_models
+
+    Returns:
+        list: One dictionary per lead, in input order, with keys
+            'id', 'result' and 'error'
+
+    Raises:
+        ValueError: Options that the chosen batch mode does not support
+    """
+    check_batch_mode(pack, pipeline, {
+        'concurrent': concurrent,
+        'artifact_store': artifact_store is not None,
+        'cascade': cascade,
+        'cascade_thresholds': cascade_thresholds is not None,
+        'backend': backend != 'crew',
+        'token_budget': token_budget is not None,
+        'max_concurrency': max_concurrency is not None,
+        'stage_workers': stage_workers is not None,
+        'stage_queue_sizes': stage_queue_sizes is not None
+    })
+    model_config = {
+        'model_id': model_id,
+        'user_email': user_email,
+        'project_name': project_name,
+        'model_name': model_name,
+        'temperature': temperature,
+        'agent_models': agent_models
+    }
+    registry = registry or default_registry
+
+    if pipeline:
+        # Hand the iterable over as is: the pipeline reads it lazily
+        results = {}
+        for index, entry in run_pipelined_qualification(leads, target_config, registry=registry, scoring=scoring,
+                                                        scoring_weights=scoring_weights, workers=stage_workers,
+                                                        queue_sizes=stage_queue_sizes, **model_config):
+            results[index] = entry
+        return [results[index] for index in sorted(results)]
+
+    leads = list(leads)
+    if pack:
+        return run_packed_qualification(leads, target_config, registry=registry, scoring=scoring,
+                                        scoring_weights=scoring_weights,
+                                        token_budget=token_budget or DEFAULT_TOKEN_BUDGET,
+                                        max_concurrency=max_concurrency, **model_config)
+
+    def process(index, lead):
+        lead_id = lead.id if isinstance(lead, Lead) else lead.get('id')
+        lead_id = index if lead_id is None else lead_id
+        try:
+            result = qualify_lead(lead, target_config, model_config, registry, concurrent=concurrent,
+                                  scoring=scoring, scoring_weights=scoring_weights,
+                                  artifact_store=artifact_store, cascade=cascade,
+                                  cascade_thresholds=cascade_thresholds, backend=backend)
+            return {'id': lead_id, 'result': result, 'error': None}
+        except Exception as e:
+            return {'id': lead_id, 'result': None, 'error': str(e)}
+
+    if max_concurrency is None:
+        max_concurrency = get_concurrency_limiter(model_id).max_limit
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        return list(executor.map(process, range(len(leads)), leads))
+
+
+def run_multi_icp_scoring(leads, target_configs, model_id, user_email, project_name, model_name,
+                          temperature=0.3, max_concurrency=None, concurrent=False, registry=None,
+                          scoring_weights=None, agent_models=None):
+    """
+    Score a lead set against several teams' target criteria
+
+    Extraction and research run once per lead, on the same bounded pool as
+    run_batch_qualification. The rubric is then applied to all lead/team
+    pairs as one matrix operation, with no further LLM calls. Leads whose
+    research failed are scored from their own fields only.
+
+    Args:
+        leads: Iterable of Lead objects or lead dictionaries
+        target_configs: Mapping of team name to target config (as built by
+            the sidebar), or a list of target configs
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        max_concurrency: Maximum number of leads researched at once
+        concurrent: Research speculatively while parsing is still running
+        registry: AgentRegistry to use instead of the process-wide default
+        scoring_weights: Rubric points per line
+        agent_models: Per-agent model settings; see resolve_agent_models
+
+    Returns:
+        dict: The score_lead_matrix result ('teams', 'scores' as an N x M
+            array, 'company_fit', 'best_team', 'best_score') plus 'ids',
+            'errors', 'contacts' and 'companies' per lead
+    """
+    # numpy is only needed for multi-team scoring
+    from src.scoring.matrix import score_lead_matrix, team_configs
+
+    model_config = {
+        'model_id': model_id,
+        'user_email': user_email,
+        'project_name': project_name,
+        'model_name': model_name,
+        'temperature': temperature,
+        'agent_models': agent_models
+    }
+    registry = registry or default_registry
+    leads = [lead if isinstance(lead, Lead) else Lead.from_dict(lead, default_id=index)
+             for index, lead in enumerate(leads)]
+    configs = team_configs(target_configs)[1]
+    if not configs:
+        raise ValueError("At least one target configuration is required")
+
+    def research(lead):
+        try:
+            contact, company = run_lead_research(lead, configs[0], concurrent=concurrent,
+                                                 registry=registry, **model_config)
+            return contact, company, None
+        except Exception as e:
+            return {}, {}, str(e)
+
+    if max_concurrency is None:
+        max_concurrency = get_concurrency_limiter(model_id).max_limit
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        researched = list(executor.map(research, leads))
+
+    contacts = [contact for contact, _, _ in researched]
+    companies = [company for _, company, _ in researched]
+    table = score_lead_matrix(leads, contacts, companies, target_configs, scoring_weights)
+    table['ids'] = [lead.id if lead.id is not None else index for index, lead in enumerate(leads)]
+    table['errors'] = [error for _, _, error in researched]
+    table['contacts'] = contacts
+    table['companies'] = companies
+    return table
@@ -0,0 +1,255 @@
+"""
+Cheap-first qualification cascade: local rules, then one fused LLM call,
+then the full four-agent crew
+"""
+
+import dataclasses
+import threading
+import time
+
+from src.crew.fused import run_fused_qualification
+from src.crew.lead_crew import LEAD_RETRY_BUDGET, run_email_qualification, run_form_qualification
+from src.extraction import extract_email_contact, structure_form
+from src.models import QualificationResult
+from src.scoring.rubric import (
+    SPAM_PATTERN,
+    qualification_status,
+    rubric_points,
+    score_lead,
+    score_lead_signals
+)
+from src.utils.domain_index import get_domain_index
+from src.utils.resilience import retry_budget
+
+
+TIERS = ('local', 'fused', 'crew')
+
+# Minimum confidence for a tier's answer to be kept instead of escalating
+DEFAULT_THRESHOLDS = {'local': 0.9, 'fused': 0.7}
+
+# A designation below this extraction confidence counts as unknown
+ROLE_CONFIDENCE = 0.7
+
+# Upper bound on local confidence for spam-like messages, so the fused
+# tier reads them before they are thrown away
+SPAM_CONFIDENCE = 0.5
+
+# (next_action, priority) for leads decided without an LLM call
+LOCAL_ACTIONS = {
+    'Qualified': ('Forward to Sales', 'High'),
+    'Needs Review': ('Manual Review', 'Medium'),
+    'Unqualified': ('Disqualify', 'Low')
+}
+
+
+class CascadeStats:
+    """
+    Per-tier counters for tuning the cascade thresholds
+
+    For each tier: how many leads reached it, how many it answered, how
+    many calls failed, and the time spent in it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {tier: {'attempts': 0, 'accepted': 0, 'errors': 0, 'seconds': 0.0} for tier in TIERS}
+
+    def record(self, tier, accepted, seconds, error=False):
+        """
+        Record one attempt at a tier
+        """
+        with self._lock:
+            counters = self.counters[tier]
+            counters['attempts'] += 1
+            counters['accepted'] += int(accepted)
+            counters['errors'] += int(error)
+            counters['seconds'] += seconds
+
+    def stats(self):
+        """
+        Return counters with hit rates and mean latencies
+
+        Returns:
+            dict: Per tier: attempts, accepted, errors, hit_rate (accepted /
+                attempts), share (accepted / leads) and mean_latency_ms
+        """
+        with self._lock:
+            counters = {tier: dict(values) for tier, values in self.counters.items()}
+        leads = counters['local']['attempts'] or sum(values['accepted'] for values in counters.values())
+        for values in counters.values():
+            attempts = values['attempts']
+            values['hit_rate'] = values['accepted'] / attempts if attempts else 0.0
+            values['share'] = values['accepted'] / leads if leads else 0.0
+            values['mean_latency_ms'] = 1000 * values.pop('seconds') / attempts if attempts else 0.0
+        return counters
+
+    def reset(self):
+        """
+        Zero every counter
+        """
+        with self._lock:
+            for values in self.counters.values():
+                values.update(attempts=0, accepted=0, errors=0, seconds=0.0)
+
+
+_default_stats = CascadeStats()
+
+
+def get_cascade_stats():
+    """
+    Return the process-wide cascade counters
+    """
+    return _default_stats
+
+
+def run_local_tier(lead, target_config, weights=None):
+    """
+    Qualify a lead with local extraction and the rubric engine only
+
+    Company fit needs research, so locally it is unknown; so is the role
+    when no designation could be extracted confidently. The lead is scored
+    with every unknown line at zero and at full points. If both totals give
+    the same qualification_status the answer is certain; otherwise the
+    confidence falls with the spread between them, and the reported status
+    is the one the known lines reach, matching the returned total_score.
+    Industry and region are never known locally, so a lead is Qualified
+    here only when research could not lower it below the Qualified line;
+    with the default weights such leads go on to the fused tier.
+    Disposable addresses are always Unqualified; spam-like wording only
+    lowers the confidence, so the fused tier makes the call. Mail from a
+    known corporate domain is assumed to come from an enterprise.
+
+    Args:
+        lead: Lead to qualify
+        target_config: Target criteria
+        weights: Rubric points per line
+
+    Returns:
+        tuple: (QualificationResult, confidence between 0 and 1)
+    """
+    points = rubric_points(weights)
+    if lead.kind == 'form':
+        contact = structure_form(lead.name, lead.company, lead.designation, lead.email, lead.content)
+        role_known = True
+    else:
+        contact, confidence = extract_email_contact(lead.email, lead.subject, lead.content)
+        role_known = confidence['designation'] >= ROLE_CONFIDENCE
+    company = {'domain_type': contact['domain_type']}
+    category = get_domain_index().classify(contact['domain'])
+    if category == 'corporate':
+        company['company_size'] = 'Enterprise (500+)'
+    disposable = category == 'disposable'
+    spam = bool(SPAM_PATTERN.search(f'{lead.subject} {lead.content}'))
+
+    signals = score_lead_signals(lead, contact, company, points)
+    known = sum(score for score, _ in signals.values())
+    unknown = points['industry'] + points['region']
+    if 'company_size' not in company:
+        unknown += points['company_size']
+    elif company['company_size'] in target_config['company_sizes']:
+        known += points['company_size']
+    if not role_known:
+        unknown += points['role'] - signals['role'][0]
+
+    maximum = sum(points.values())
+    low = round(100 * known / maximum) if maximum else 0
+    high = round(100 * (known + unknown) / maximum) if maximum else 0
+    if disposable:
+        status, confidence = 'Unqualified', 1.0
+    else:
+        status = qualification_status(low)
+        confidence = 1.0 if status == qualification_status(high) else 1.0 - (high - low) / 100
+    if spam and not disposable:
+        confidence = min(confidence, SPAM_CONFIDENCE)
+
+    score = score_lead(lead, contact, company, target_config, weights)
+    score['company_fit_justification'] = 'Company not researched; only a known size is counted'
+    score['qualification_status'] = status
+    action, priority = LOCAL_ACTIONS[status]
+    recommendation = {
+        'next_action': action,
+        'priority': priority,
+        'reasoning': f"Decided by local rules ({low}-{high} points possible before research): " + '; '.join(
+            reason for _, reason in signals.values()
+        )
+    }
+    raw = f"Qualified locally: {score['total_score']}/100, {status}. {recommendation['reasoning']}"
+    return QualificationResult.from_stage_data(contact, company, score, recommendation, raw=raw,
+                                               lead=lead), confidence
+
+
+def run_cascade_qualification(lead, target_config, model_id, user_email, project_name, model_name,
+                              temperature=0.3, llm=None, registry=None, thresholds=None,
+                              scoring='llm', scoring_weights=None, artifact_store=None, stats=None,
+                              agent_models=None):
+    """
+    Qualify a lead with the cheapest tier that is confident enough
+
+    1. local: extraction and rubric scoring, no LLM call
+    2. fused: one LLM call covering all four stages
+    3. crew: the full four-agent crew
+
+    A tier's answer is kept when its confidence reaches the tier's
+    threshold; the crew always answers. A fused call that fails escalates
+    to the crew.
+
+    Args:
+        lead: Lead to qualify
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        llm: Existing KatonicLLMWrapper to share across leads
+        registry: AgentRegistry to check agents out of
+        thresholds: Confidence thresholds for 'local' and 'fused'; missing
+            keys use DEFAULT_THRESHOLDS
+        scoring: Scoring mode for the crew tier ('llm' or 'rules')
+        scoring_weights: Rubric points per line
+        artifact_store: StageArtifactStore for the crew tier
+        stats: CascadeStats to record into; defaults to the process-wide counters
+        agent_models: Per-agent model settings for the crew tier; see
+            resolve_agent_models
+
+    Returns:
+        QualificationResult: Result from the tier that answered
+    """
+    limits = dict(DEFAULT_THRESHOLDS)
+    limits.update(thresholds or {})
+    stats = stats or get_cascade_stats()
+
+    start = time.perf_counter()
+    result, confidence = run_local_tier(lead, target_config, scoring_weights)
+    accepted = confidence >= limits['local']
+    stats.record('local', accepted, time.perf_counter() - start)
+    if accepted:
+        return result
+
+    start = time.perf_counter()
+    try:
+        with retry_budget(LEAD_RETRY_BUDGET):
+            result, confidence = run_fused_qualification(lead, target_config, model_id, user_email,
+                                                         project_name, model_name, temperature,
+                                                         llm=llm, registry=registry)
+    except Exception as e:
+        print(f"Warning: fused qualification failed, escalating to the crew: {e}")
+        stats.record('fused', False, time.perf_counter() - start, error=True)
+    else:
+        accepted = confidence >= limits['fused']
+        stats.record('fused', accepted, time.perf_counter() - start)
+        if accepted:
+            return result
+
+    start = time.perf_counter()
+    run = run_email_qualification if lead.kind == 'email' else run_form_qualification
+    try:
+        result = run(**lead.task_fields(), target_config=target_config, model_id=model_id,
+                     user_email=user_email, project_name=project_name, model_name=model_name,
+                     temperature=temperature, llm=llm, registry=registry, scoring=scoring,
+                     scoring_weights=scoring_weights, artifact_store=artifact_store, agent_models=agent_models)
+    except Exception:
+        stats.record('crew', False, time.perf_counter() - start, error=True)
+        raise
+    stats.record('crew', True, time.perf_counter() - start)
+    return result if result.lead is not None else dataclasses.replace(result, lead=lead)
@@ -0,0 +1,208 @@
+"""
+Single-call lead qualification: one LLM request covers all four stages,
+answered against a strict JSON schema
+"""
+
+import json
+
+from pydantic import ValidationError
+
+from src.agents.registry import default_registry
+from src.models import QualificationResult
+from src.tasks.lead_tasks import RUBRIC_SUMMARY, fill_placeholders, target_config_inputs
+from src.tasks.schemas import FusedQualification
+from src.utils.domain_index import get_domain_index
+from src.utils.json_extractor import iter_json_objects
+
+
+# Corrective re-prompts allowed when an answer fails schema validation
+FUSED_REPAIR_ATTEMPTS = 1
+
+# Schema keys that only document; dropped to keep the prompt short
+SCHEMA_NOISE_KEYS = frozenset(['title', 'description', 'default'])
+
+
+FUSED_DESCRIPTION = """
+        Qualify this {lead_kind} lead in one pass: extract the contact, infer the company,
+        score the lead and recommend the next step.
+
+        Lead:
+        {lead_fields}
+
+        The email domain "{email_domain}" is classified as {domain_type}.
+
+        Target Criteria:
+        - Target Industries: {target_industries}
+        - Target Company Sizes: {target_company_sizes}
+        - Target Regions: {target_regions}
+
+        {rubric}
+
+        Company industry is one of: Technology, Healthcare, Finance, Manufacturing, Retail, Education,
+        Consulting, Real Estate, Other. Company size is one of: Startup (1-50), SMB (51-500), Enterprise (500+).
+        confidence is how sure you are of the qualification_status, from 0 to 1.
+
+        Return only one JSON object matching this JSON schema:
+        {json_schema}
+        """
+
+FUSED_REPAIR_DESCRIPTION = """
+        You were asked to qualify this {lead_kind} lead:
+        {lead_fields}
+
+        Your previous answer did not match the JSON schema:
+        {errors}
+
+        Previous answer:
+        {answer}
+
+        Return only the corrected JSON object, matching this JSON schema:
+        {json_schema}
+        """
+
+
+def compact_schema(schema):
+    """
+    Drop titles, descriptions and defaults from a JSON schema
+    """
+    if isinstance(schema, dict):
+        return {key: compact_schema(value) for key, value in schema.items() if key not in SCHEMA_NOISE_KEYS}
+    if isinstance(schema, list):
+        return [compact_schema(value) for value in schema]
+    return schema
+
+
+FUSED_JSON_SCHEMA = json.dumps(compact_schema(FusedQualification.model_json_schema()), separators=(',', ':'))
+
+
+def fused_prompt_values(lead, target_config):
+    """
+    Build the placeholder values shared by the fused and repair prompts
+    """
+    domain = lead.email.rsplit('@', 1)[-1].strip().lower()
+    values = target_config_inputs(target_config)
+    values.update({
+        'lead_kind': lead.kind,
+        'lead_fields': json.dumps(lead.task_fields(), indent=2),
+        'email_domain': domain,
+        'rubric': RUBRIC_SUMMARY,
+        'domain_type': get_domain_index().domain_type(domain),
+        'json_schema': FUSED_JSON_SCHEMA
+    })
+    return values
+
+
+def fused_prompt(lead, target_config):
+    """
+    Build the single prompt that covers parsing, research, scoring and recommendation
+
+    Args:
+        lead: Lead to qualify
+        target_config: Target criteria
+
+    Returns:
+        str: Prompt text
+    """
+    return fill_placeholders(FUSED_DESCRIPTION, fused_prompt_values(lead, target_config))
+
+
+def repair_prompt(lead, target_config, response, error):
+    """
+    Build the corrective prompt for an answer that failed validation
+
+    The repair call does not see the first prompt, so the lead and the
+    schema are repeated.
+
+    Args:
+        lead: Lead being qualified
+        target_config: Target criteria
+        response: The invalid answer
+        error: ValueError raised by parse_fused_response
+
+    Returns:
+        str: Prompt text
+    """
+    if isinstance(error, ValidationError):
+        errors = json.dumps(error.errors(include_url=False), default=str)[:2000]
+    else:
+        errors = str(error)
+    values = fused_prompt_values(lead, target_config)
+    values.update({'errors': errors, 'answer': response})
+    return fill_placeholders(FUSED_REPAIR_DESCRIPTION, values)
+
+
+def parse_fused_response(response, lead=None):
+    """
+    Validate a fused answer into a QualificationResult
+
+    The last JSON object in the answer must match FusedQualification;
+    each validated section becomes one stage of the result.
+
+    Args:
+        response: Raw LLM answer
+        lead: Lead that was qualified
+
+    Returns:
+        tuple: (QualificationResult, confidence between 0 and 1)
+
+    Raises:
+        ValueError: The answer holds no JSON object or does not match the
+            schema (pydantic's ValidationError is a ValueError)
+    """
+    data = None
+    for obj in iter_json_objects(response or ''):
+        data = obj
+    if data is None:
+        raise ValueError("Fused answer contains no JSON object")
+
+    answer = FusedQualification.model_validate(data)
+    result = QualificationResult.from_stage_data(
+        answer.contact.model_dump(exclude_none=True),
+        answer.company.model_dump(exclude_none=True),
+        answer.score.model_dump(exclude_none=True),
+        answer.recommendation.model_dump(exclude_none=True),
+        raw=response,
+        lead=lead
+    )
+    return result, answer.confidence
+
+
+def run_fused_qualification(lead, target_config, model_id, user_email, project_name, model_name,
+                            temperature=0.3, llm=None, registry=None):
+    """
+    Qualify a lead with one LLM call instead of four agent tasks
+
+    An answer that fails validation is dropped from the response cache, so
+    the same prompt is not answered from it again, and sent back once with
+    the validation errors for correction.
+
+    Args:
+        lead: Lead to qualify
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        llm: Existing KatonicLLMWrapper to call
+        registry: AgentRegistry whose shared wrapper to call
+
+    Returns:
+        tuple: (QualificationResult, confidence between 0 and 1)
+
+    Raises:
+        ValueError: No valid answer after FUSED_REPAIR_ATTEMPTS corrections
+    """
+    if llm is None:
+        llm = (registry or default_registry).shared_llm(model_id, user_email, project_name, model_name,
+                                                        temperature)
+    prompt = fused_prompt(lead, target_config)
+    for attempt in range(FUSED_REPAIR_ATTEMPTS + 1):
+        response = llm.generate_completion(prompt)
+        try:
+            return parse_fused_response(response, lead)
+        except ValueError as e:
+            llm.forget(prompt)
+            if attempt == FUSED_REPAIR_ATTEMPTS:
+                raise
+            prompt = repair_prompt(lead, target_config, response, e)
@@ -2,63 +2,668 @@
 CrewAI Crew orchestration for lead qualification with Katonic integration
 """
 
+import asyncio
+import dataclasses
+import json
+from contextlib import contextmanager
+
 from crewai import Crew, Process
-from src.agents.lead_agents import create_lead_qualification_agents
-from src.tasks.lead_tasks import create_email_tasks, create_form_tasks
+from src.agents.lead_agents import create_lead_qualification_agents, resolve_agent_models
+from src.agents.registry import default_registry
+from src.tasks.lead_tasks import (
+    create_email_tasks,
+    create_form_tasks,
+    create_email_task_templates,
+    create_form_task_templates,
+    email_task_inputs,
+    form_task_inputs
+)
+from src.crew.fused import run_fused_qualification
+from src.crew.scheduler import execute_task, run_task_graph
+from src.extraction import EMAIL_CONFIDENCE_THRESHOLD, extract_email_contact, structure_form
+from src.models.lead import Lead
+from src.models.results import QualificationResult, ScoreBreakdown, task_output_data
+from src.scoring.rubric import score_lead
+from src.utils.resilience import retry_budget
+from src.utils.artifact_store import UPSTREAM_STAGES, DOWNSTREAM_STAGES, get_artifact_store, make_context_key
 
 
-def run_email_qualification(sender_email, email_subject, email_content, target_config, 
-                          model_id, user_email, project_name, model_name, temperature=0.3):
+# Gateway retries one lead may spend across all of its LLM calls
+LEAD_RETRY_BUDGET = 6
+
+# 'llm' asks the lead_scorer agent; 'rules' applies the rubric locally
+SCORING_MODES = ('llm', 'rules')
+
+# 'crew' runs the four agent tasks; 'fused' asks for everything in one schema-checked call
+BACKENDS = ('crew', 'fused')
+
+# Agent that answers each stage
+STAGE_AGENTS = {
+    'contact': 'email_parser',
+    'company': 'company_researcher',
+    'score': 'lead_scorer',
+    'recommendation': 'recommendation_agent'
+}
+
+RULE_SCORE_CONTEXT = "Lead score computed with the 100-point scoring rubric:\n{score}"
+
+
+@contextmanager
+def checkout_agents(model_id, user_email, project_name, model_name, temperature=0.3,
+                    llm=None, registry=None, agent_models=None):
     """
-    Run email-based lead qualification with CrewAI using Katonic LLM
+    Check out cached agents from the registry, or build fresh agents around
+    an explicitly provided LLM wrapper
     
     Args:
-        sender_email: Email address
-        email_subject: Email subject
-        email_content: Email content
-        target_config: Target criteria
         model_id: Katonic model ID from My Model Library
         user_email: User email for logging
         project_name: Project name for logging
         model_name: Model name for logging
         temperature: Model temperature
+        llm: Existing KatonicLLMWrapper; bypasses the registry
+        registry: AgentRegistry to use instead of the process-wide default
+        agent_models: Per-agent model settings; see resolve_agent_models
         
-    Returns:
-        CrewAI result object
+    Yields:
+        dict: Dictionary of agent instances and LLM wrapper
     """
+    if llm is not None:
+        yield create_lead_qualification_agents(
+            model_id=model_id,
+            user_email=user_email,
+            project_name=project_name,
+            model_name=model_name,
+            temperature=temperature,
+            llm=llm,
+            agent_models=agent_models
+        )
+        return
     
-    # Create agents with Katonic integration
-    agents = create_lead_qualification_agents(
+    with (registry or default_registry).lead_agents(
         model_id=model_id,
         user_email=user_email,
         project_name=project_name,
         model_name=model_name,
-        temperature=temperature
-    )
-    
-    # Create tasks
-    tasks = create_email_tasks(
-        agents,
-        sender_email,
-        email_subject,
-        email_content,
-        target_config
-    )
+        temperature=temperature,
+        agent_models=agent_models
+    ) as agents:
+        yield agents
+
+
+def target_config_key(target_config):
+    """
+    Return a hashable key for a target criteria configuration
+    """
+    return tuple(tuple(target_config[field]) for field in ('industries', 'company_sizes', 'regions'))
+
+
+def compile_crew(agents, tasks):
+    """
+    Create a sequential crew over the four qualification agents
     
-    # Create and run crew
-    crew = Crew(
+    Args:
+        agents: Dictionary of agent instances
+        tasks: List of Task instances
+        
+    Returns:
+        Crew: Crew instance
+    """
+    return Crew(
         agents=[agents['email_parser'], agents['company_researcher'], agents['lead_scorer'], agents['recommendation_agent']],
         tasks=tasks,
         process=Process.sequential,
         verbose=True
     )
+
+
+@contextmanager
+def checkout_compiled_crew(kind, target_config, model_id, user_email, project_name, model_name,
+                           temperature=0.3, registry=None, agent_models=None, known_contact=False):
+    """
+    Check out a reusable crew compiled for one target configuration
+    
+    The crew's tasks keep lead fields as placeholders, so each lead only
+    costs a Crew.kickoff(inputs=...) call instead of building new agents,
+    tasks and a crew.
+    
+    Args:
+        kind: 'email' or 'form'
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        registry: AgentRegistry to use instead of the process-wide default
+        agent_models: Per-agent model settings; see resolve_agent_models
+        known_contact: Compile the research, scoring and recommendation
+            tasks only, for leads whose contact is passed as the
+            {known_contact} input
+        
+    Yields:
+        Crew: Compiled crew instance
+    """
+    registry = registry or default_registry
+    config = {
+        'model_id': model_id,
+        'user_email': user_email,
+        'project_name': project_name,
+        'model_name': model_name,
+        'temperature': temperature
+    }
+    routing = resolve_agent_models(model_id, model_name, temperature, agent_models)
+    key = registry.model_key(**config) + (kind, known_contact, target_config_key(target_config),
+                                          registry.routing_key(routing))
+    llms = registry.agent_llms(agent_models=agent_models, **config)
+    create_templates = create_email_task_templates if kind == 'email' else create_form_task_templates
+    
+    def build():
+        agents = create_lead_qualification_agents(llms=llms, **config)
+        return compile_crew(agents, create_templates(agents, target_config, known_contact=known_contact))
+    
+    with registry.checkout(key, build) as crew:
+        yield crew
+
+
+def run_compiled_qualification(kind, leads_inputs, target_config, model_id, user_email, project_name,
+                               model_name, temperature=0.3, registry=None, use_async=False, agent_models=None):
+    """
+    Run many leads of the same kind through one compiled crew
+    
+    Args:
+        kind: 'email' or 'form'
+        leads_inputs: List of input dictionaries from email_task_inputs or form_task_inputs
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        registry: AgentRegistry to use instead of the process-wide default
+        use_async: Use CrewAI's kickoff_for_each_async to overlap the leads
+        agent_models: Per-agent model settings; see resolve_agent_models
+        
+    Returns:
+        list: QualificationResult objects, in input order
+    """
+    with checkout_compiled_crew(kind, target_config, model_id, user_email, project_name, model_name,
+                                temperature, registry=registry, agent_models=agent_models) as crew:
+        if use_async:
+            outputs = asyncio.run(crew.kickoff_for_each_async(inputs=leads_inputs))
+        else:
+            outputs = [crew.kickoff(inputs=inputs) for inputs in leads_inputs]
+        return [QualificationResult.from_crew_output(output) for output in outputs]
+
+
+def run_compiled_stages(lead, target_config, model_id, user_email, project_name, model_name, temperature=0.3,
+                        registry=None, agent_models=None, contact=None):
+    """
+    Run one lead through a cached compiled crew and return its stage artifacts
+    
+    Args:
+        lead: Lead to qualify
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        registry: AgentRegistry to use instead of the process-wide default
+        agent_models: Per-agent model settings; see resolve_agent_models
+        contact: Known parse-stage artifact (data, raw); the crew then
+            starts at research
+        
+    Returns:
+        dict: Stage -> (data, raw) for all four stages
+    """
+    if lead.kind == 'email':
+        inputs = email_task_inputs(lead.email, lead.subject, lead.content)
+    else:
+        inputs = form_task_inputs(lead.name, lead.company, lead.designation, lead.email, lead.content)
+    stages = UPSTREAM_STAGES + DOWNSTREAM_STAGES
+    artifacts = {}
+    if contact is not None:
+        inputs['known_contact'] = contact[1]
+        artifacts['contact'] = contact
+        stages = stages[1:]
+    
+    with checkout_compiled_crew(lead.kind, target_config, model_id, user_email, project_name, model_name,
+                                temperature, registry=registry, agent_models=agent_models,
+                                known_contact=contact is not None) as crew:
+        crew_output = crew.kickoff(inputs=inputs)
+    
+    for stage, output in zip(stages, crew_output.tasks_output):
+        artifacts[stage] = (task_output_data(output), output.raw)
+    return artifacts
+
+
+def kickoff_tasks(agents, tasks, concurrent=False):
+    """
+    Run a qualification task list either as a sequential crew or through
+    the concurrent task-graph scheduler
+    
+    Args:
+        agents: Dictionary of agent instances
+        tasks: List of Task instances
+        concurrent: Run independent tasks at the same time
+        
+    Returns:
+        QualificationResult: Result built from the per-task outputs
+    """
+    if concurrent:
+        return QualificationResult.from_crew_output(run_task_graph(tasks))
+    
+    return QualificationResult.from_crew_output(compile_crew(agents, tasks).kickoff())
+
+
+def create_lead_tasks(agents, lead, target_config, speculative_research=False):
+    """
+    Create the email or form task list for a Lead
+    
+    Args:
+        agents: Dictionary of agent instances
+        lead: Lead to qualify
+        target_config: Target criteria
+        speculative_research: Research without waiting for the parse task
+        
+    Returns:
+        list: List of Task instances
+    """
+    if lead.kind == 'email':
+        return create_email_tasks(agents, lead.email, lead.subject, lead.content, target_config,
+                                  speculative_research=speculative_research)
+    return create_form_tasks(agents, lead.name, lead.company, lead.designation, lead.email,
+                             lead.content, target_config, speculative_research=speculative_research)
+
+
+def local_contact(lead, confidence_threshold=EMAIL_CONFIDENCE_THRESHOLD):
+    """
+    Build the parse-stage artifact locally when the lead allows it
+    
+    Form fields are already validated, so the structure task only echoes
+    them back; src.extraction.structure_form derives the rest. Emails are
+    read from the sender header and signature, and kept only when the
+    extractor is confident enough.
+    
+    Args:
+        lead: Lead being qualified
+        confidence_threshold: Minimum overall confidence for an email
+        
+    Returns:
+        tuple: (contact fields, raw text for downstream context), or None
+            if the parse stage needs the LLM
+    """
+    if lead.kind == 'form':
+        contact = structure_form(lead.name, lead.company, lead.designation, lead.email, lead.content)
+    else:
+        contact, confidence = extract_email_contact(lead.email, lead.subject, lead.content)
+        if confidence['overall'] < confidence_threshold:
+            return None
+    return contact, json.dumps(contact, indent=2)
+
+
+def run_upstream_stages(tasks, artifacts):
+    """
+    Fill in the parse ('contact') and research ('company') artifacts that
+    are missing
+    
+    When both are missing they run through the task-graph scheduler, so
+    speculative research overlaps parsing. A known contact is passed to
+    the research task as its context.
+    
+    Args:
+        tasks: Task list from create_email_tasks or create_form_tasks
+        artifacts: Dictionary of stage -> (data, raw) or None; updated in place
+        
+    Returns:
+        set: Stages computed by this call
+    """
+    fresh = set()
+    if artifacts.get('contact') is None and artifacts.get('company') is None:
+        upstream = run_task_graph(tasks[:2]).tasks_output
+        artifacts['contact'] = (task_output_data(upstream[0]), upstream[0].raw)
+        artifacts['company'] = (task_output_data(upstream[1]), upstream[1].raw)
+        fresh.update(UPSTREAM_STAGES)
+    elif artifacts.get('contact') is None:
+        output = execute_task(tasks[0], [])
+        artifacts['contact'] = (task_output_data(output), output.raw)
+        fresh.add('contact')
+    elif artifacts.get('company') is None:
+        output = execute_task(tasks[1], [artifacts['contact'][1]])
+        artifacts['company'] = (task_output_data(output), output.raw)
+        fresh.add('company')
+    return fresh
+
+
+def run_stages(tasks, lead, target_config, scoring='llm', weights=None, known=None):
+    """
+    Run whichever of the four qualification stages are not already known
+    
+    Stages run in order, each given the raw outputs of the earlier stages
+    as context. Recomputing a stage invalidates the known stages after it.
+    
+    Args:
+        tasks: Task list from create_email_tasks or create_form_tasks
+        lead: Lead being qualified
+        target_config: Target criteria
+        scoring: 'llm' runs the scoring task; 'rules' applies the rubric locally
+        weights: Rubric points per line for 'rules' scoring
+        known: Dictionary of stage -> (data, raw) for stages already available
+        
+    Returns:
+        tuple: (dictionary of all four stages -> (data, raw), set of stages
+            computed by this call)
+    """
+    artifacts = dict.fromkeys(UPSTREAM_STAGES + DOWNSTREAM_STAGES)
+    artifacts.update(known or {})
+    
+    fresh = run_upstream_stages(tasks, artifacts)
+    if fresh:
+        # Downstream artifacts were built from the old research
+        artifacts['score'] = artifacts['recommendation'] = None
+    context = [artifacts['contact'][1], artifacts['company'][1]]
+    
+    if artifacts['score'] is None:
+        if scoring == 'rules':
+            score = score_lead(lead, artifacts['contact'][0], artifacts['company'][0], target_config, weights)
+            artifacts['score'] = (score, RULE_SCORE_CONTEXT.format(score=json.dumps(score, indent=2)))
+        else:
+            output = execute_task(tasks[2], context)
+            artifacts['score'] = (task_output_data(output), output.raw)
+        fresh.add('score')
+        artifacts['recommendation'] = None
+    
+    if artifacts['recommendation'] is None:
+        output = execute_task(tasks[3], context + [artifacts['score'][1]])
+        artifacts['recommendation'] = (task_output_data(output), output.raw)
+        fresh.add('recommendation')
+    
+    return artifacts, fresh
+
+
+def result_from_artifacts(artifacts, lead):
+    """
+    Build a QualificationResult from the four stage artifacts
+    """
+    return QualificationResult.from_stage_data(
+        artifacts['contact'][0],
+        artifacts['company'][0],
+        artifacts['score'][0],
+        artifacts['recommendation'][0],
+        raw=artifacts['recommendation'][1],
+        lead=lead
+    )
+
+
+def run_lead_research(lead, target_config, model_id, user_email, project_name, model_name,
+                      temperature=0.3, concurrent=False, llm=None, registry=None, local_structuring=True,
+                      agent_models=None):
+    """
+    Extract and research one lead without scoring it, so the result can be
+    scored against any number of target configurations
+    
+    Args:
+        lead: Lead to research
+        target_config: Any target criteria; only used to build the task list
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        concurrent: Research speculatively while parsing is still running
+        llm: Existing KatonicLLMWrapper to share across leads
+        registry: AgentRegistry to check agents out of
+        local_structuring: Extract the contact locally when possible; see local_contact
+        agent_models: Per-agent model settings; see resolve_agent_models
+        
+    Returns:
+        tuple: (contact fields, company fields)
+    """
+    artifacts = {'contact': local_contact(lead) if local_structuring else None}
+    with retry_budget(LEAD_RETRY_BUDGET):
+        with checkout_agents(model_id, user_email, project_name, model_name, temperature,
+                             llm=llm, registry=registry, agent_models=agent_models) as agents:
+            tasks = create_lead_tasks(agents, lead, target_config, speculative_research=concurrent)
+            run_upstream_stages(tasks, artifacts)
+            return artifacts['contact'][0], artifacts['company'][0]
+
+
+def run_rule_scored_tasks(tasks, lead, target_config, weights=None, known=None):
+    """
+    Run the qualification tasks with the lead_scorer stage replaced by the
+    local rubric engine, saving one LLM call per lead
     
-    result = crew.kickoff()
+    The parse and research tasks run through the task-graph scheduler, so
+    speculative research still overlaps parsing. The recommendation task
+    then receives the computed score in its context.
+    
+    Args:
+        tasks: Task list from create_email_tasks or create_form_tasks
+        lead: Lead being qualified
+        target_config: Target criteria
+        weights: Rubric points per line; see src.scoring.DEFAULT_WEIGHTS
+        known: Stage artifacts already available, e.g. a local contact
+        
+    Returns:
+        QualificationResult: Result with the locally computed score
+    """
+    artifacts, _ = run_stages(tasks, lead, target_config, scoring='rules', weights=weights, known=known)
+    return result_from_artifacts(artifacts, lead)
+
+
+def check_scoring_mode(scoring, backend='crew'):
+    """
+    Raise ValueError for an unknown scoring mode or backend
+    """
+    if scoring not in SCORING_MODES:
+        raise ValueError(f"Unknown scoring mode {scoring!r}; expected one of {', '.join(SCORING_MODES)}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+
+
+def run_fused_backend(lead, target_config, model_id, user_email, project_name, model_name,
+                      temperature=0.3, llm=None, registry=None, scoring='llm', scoring_weights=None):
+    """
+    Qualify a lead with the fused backend: one LLM call validated against
+    FusedQualification instead of four agent tasks
+    
+    Args:
+        lead: Lead to qualify
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        llm: Existing KatonicLLMWrapper to share across leads
+        registry: AgentRegistry whose shared wrapper to call
+        scoring: 'llm' keeps the model's score; 'rules' re-scores the
+            fused contact and company with the local rubric
+        scoring_weights: Rubric points per line for 'rules' scoring
+        
+    Returns:
+        QualificationResult: Result from the validated answer
+    """
+    with retry_budget(LEAD_RETRY_BUDGET):
+        result, _ = run_fused_qualification(lead, target_config, model_id, user_email, project_name,
+                                            model_name, temperature, llm=llm, registry=registry)
+    if scoring == 'rules':
+        score = score_lead(lead, result.contact, result.company, target_config, scoring_weights)
+        result = dataclasses.replace(result, score=ScoreBreakdown.from_dict(score))
     return result
 
 
+def run_staged_qualification(lead, target_config, model_id, user_email, project_name, model_name,
+                             temperature=0.3, concurrent=False, llm=None, registry=None, scoring='llm',
+                             scoring_weights=None, artifact_store=None, local_structuring=True, agent_models=None):
+    """
+    Qualify a lead stage by stage, reusing stored stage artifacts
+    
+    Parse and research artifacts are keyed by the lead fingerprint and the
+    model, so they are reused whatever the target criteria. Score and
+    recommendation artifacts are also keyed by the target config and
+    scoring settings, so changing the criteria re-runs only those two
+    stages. A lead whose every stage is stored costs no LLM calls.
+    
+    Args:
+        lead: Lead to qualify
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        concurrent: Research speculatively while parsing is still running
+        llm: Existing KatonicLLMWrapper to share across leads
+        registry: AgentRegistry to check agents out of
+        scoring: 'llm' or 'rules'
+        scoring_weights: Rubric points per line for 'rules' scoring
+        artifact_store: StageArtifactStore; defaults to the process-wide store
+        local_structuring: Extract the contact locally when possible; see local_contact
+        agent_models: Per-agent model settings; see resolve_agent_models
+        
+    Returns:
+        QualificationResult: Result assembled from stored and fresh stages
+    """
+    check_scoring_mode(scoring)
+    store = artifact_store or get_artifact_store()
+    fingerprint = lead.fingerprint()
+    routing = resolve_agent_models(model_id, model_name, temperature, agent_models)
+    keys, models = {}, []
+    for stage in UPSTREAM_STAGES + DOWNSTREAM_STAGES:
+        # A stage is keyed by the models of its agent and of every agent feeding it
+        settings = routing[STAGE_AGENTS[stage]]
+        model = (settings['model_id'], settings['model_name'], settings['temperature'])
+        if settings['max_tokens'] is not None:
+            model += (settings['max_tokens'],)
+        if model not in models:
+            models.append(model)
+        parts = [part for model in models for part in model]
+        if stage in DOWNSTREAM_STAGES:
+            parts += [target_config_key(target_config), scoring, scoring_weights]
+        keys[stage] = make_context_key(*parts)
+    
+    artifacts = {stage: store.get(fingerprint, stage, key) for stage, key in keys.items()}
+    if artifacts['contact'] is None and local_structuring:
+        artifacts['contact'] = local_contact(lead)
+    if all(artifacts.values()):
+        return result_from_artifacts(artifacts, lead)
+    
+    if artifacts['company'] is None and not concurrent and llm is None and scoring == 'llm':
+        # Nothing past the contact is stored: run the cached compiled crew
+        fresh = [stage for stage, artifact in artifacts.items() if artifact is None]
+        with retry_budget(LEAD_RETRY_BUDGET):
+            artifacts = run_compiled_stages(lead, target_config, model_id, user_email, project_name, model_name,
+                                            temperature, registry=registry, agent_models=agent_models,
+                                            contact=artifacts['contact'])
+        for stage in fresh:
+            store.put(fingerprint, stage, keys[stage], *artifacts[stage])
+        return result_from_artifacts(artifacts, lead)
+    
+    with retry_budget(LEAD_RETRY_BUDGET):
+        with checkout_agents(model_id, user_email, project_name, model_name, temperature,
+                             llm=llm, registry=registry, agent_models=agent_models) as agents:
+            tasks = create_lead_tasks(agents, lead, target_config, speculative_research=concurrent)
+            artifacts, fresh = run_stages(tasks, lead, target_config, scoring, scoring_weights, known=artifacts)
+    
+    for stage in fresh:
+        store.put(fingerprint, stage, keys[stage], *artifacts[stage])
+    return result_from_artifacts(artifacts, lead)
+
+
+def run_email_qualification(sender_email, email_subject, email_content, target_config, 
+                          model_id, user_email, project_name, model_name, temperature=0.3,
+                          concurrent=False, llm=None, registry=None, scoring='llm', scoring_weights=None,
+                          artifact_store=None, local_structuring=True, backend='crew', agent_models=None):
+    """
+    Run email-based lead qualification with CrewAI using Katonic LLM
+    
+    Args:
+        sender_email: Email address
+        email_subject: Email subject
+        email_content: Email content
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        concurrent: Run independent tasks concurrently and start company
+            research speculatively while parsing is still running
+        llm: Existing KatonicLLMWrapper to share across leads
+        registry: AgentRegistry to check agents out of
+        scoring: 'llm' to score with the lead_scorer agent, or 'rules' to
+            apply the rubric locally and skip that LLM call
+        scoring_weights: Rubric points per line for 'rules' scoring
+        artifact_store: StageArtifactStore to reuse and record stage outputs
+            in; see run_staged_qualification
+        local_structuring: Read the sender and signature locally with
+            src.extraction.extract_email_contact, and only run the
+            email_parser agent when that extraction is not confident
+        backend: 'crew' for the four agent tasks, or 'fused' for one
+            schema-validated LLM call (concurrent, artifact_store and
+            local_structuring then do not apply)
+        agent_models: Per-agent model_id, model_name, temperature and
+            max_tokens, keyed by agent name; see resolve_agent_models. The
+            fused backend uses the default model
+        
+    Returns:
+        QualificationResult: Result built from the per-task outputs
+    """
+    check_scoring_mode(scoring, backend)
+    lead = Lead(kind='email', email=sender_email, subject=email_subject, content=email_content)
+    if backend == 'fused':
+        return run_fused_backend(lead, target_config, model_id, user_email, project_name, model_name,
+                                 temperature, llm=llm, registry=registry, scoring=scoring,
+                                 scoring_weights=scoring_weights)
+    if artifact_store is not None:
+        return run_staged_qualification(lead, target_config, model_id, user_email, project_name, model_name,
+                                        temperature, concurrent=concurrent, llm=llm, registry=registry,
+                                        scoring=scoring, scoring_weights=scoring_weights,
+                                        artifact_store=artifact_store, local_structuring=local_structuring,
+                                        agent_models=agent_models)
+    contact = local_contact(lead) if local_structuring else None
+    
+    # Share one retry budget across all of this lead's LLM calls
+    with retry_budget(LEAD_RETRY_BUDGET):
+        if not concurrent and llm is None and scoring == 'llm':
+            # Bind this lead's fields into a cached compiled crew
+            artifacts = run_compiled_stages(lead, target_config, model_id, user_email, project_name, model_name,
+                                            temperature, registry=registry, agent_models=agent_models,
+                                            contact=contact)
+            return result_from_artifacts(artifacts, lead)
+        
+        # Check out cached agents with Katonic integration
+        with checkout_agents(model_id, user_email, project_name, model_name, temperature,
+                             llm=llm, registry=registry, agent_models=agent_models) as agents:
+            # Create tasks
+            tasks = create_email_tasks(
+                agents,
+                sender_email,
+                email_subject,
+                email_content,
+                target_config,
+                speculative_research=concurrent
+            )
+            
+            if contact is not None:
+                # The parse task is replaced by its local result
+                artifacts, _ = run_stages(tasks, lead, target_config, scoring, scoring_weights,
+                                          known={'contact': contact})
+                return result_from_artifacts(artifacts, lead)
+            
+            if scoring == 'rules':
+                return run_rule_scored_tasks(tasks, lead, target_config, scoring_weights)
+            
+            # Run the crew
+            return kickoff_tasks(agents, tasks, concurrent=concurrent)
+
+
 def run_form_qualification(name, company, designation, email, query, target_config,
-                         model_id, user_email, project_name, model_name, temperature=0.3):
+                         model_id, user_email, project_name, model_name, temperature=0.3,
+                         concurrent=False, llm=None, registry=None, scoring='llm', scoring_weights=None,
+                         artifact_store=None, local_structuring=True, backend='crew', agent_models=None):
     """
     Run form-based lead qualification with CrewAI using Katonic LLM
     
@@ -74,46 +679,84 @@ def run_form_qualification(name, company, designation, email, query, target_conf
         project_name: Project name for logging
         model_name: Model name for logging
         temperature: Model temperature
+        concurrent: Run independent tasks concurrently and start company
+            research speculatively while parsing is still running
+        llm: Existing KatonicLLMWrapper to share across leads
+        registry: AgentRegistry to check agents out of
+        scoring: 'llm' to score with the lead_scorer agent, or 'rules' to
+            apply the rubric locally and skip that LLM call
+        scoring_weights: Rubric points per line for 'rules' scoring
+        artifact_store: StageArtifactStore to reuse and record stage outputs
+            in; see run_staged_qualification
+        local_structuring: Structure the form fields locally with
+            src.extraction.structure_form instead of the data_structurer
+            agent, saving one LLM call
+        backend: 'crew' for the four agent tasks, or 'fused' for one
+            schema-validated LLM call (concurrent, artifact_store and
+            local_structuring then do not apply)
+        agent_models: Per-agent model_id, model_name, temperature and
+            max_tokens, keyed by agent name; see resolve_agent_models. The
+            fused backend uses the default model
         
     Returns:
-        CrewAI result object
+        QualificationResult: Result built from the per-task outputs
     """
+    check_scoring_mode(scoring, backend)
+    lead = Lead(kind='form', email=email, name=name, company=company, designation=designation or '',
+                content=query)
+    if backend == 'fused':
+        return run_fused_backend(lead, target_config, model_id, user_email, project_name, model_name,
+                                 temperature, llm=llm, registry=registry, scoring=scoring,
+                                 scoring_weights=scoring_weights)
+    if artifact_store is not None:
+        return run_staged_qualification(lead, target_config, model_id, user_email, project_name, model_name,
+                                        temperature, concurrent=concurrent, llm=llm, registry=registry,
+                                        scoring=scoring, scoring_weights=scoring_weights,
+                                        artifact_store=artifact_store, local_structuring=local_structuring,
+                                        agent_models=agent_models)
+    contact = local_contact(lead) if local_structuring else None
     
-    # Create agents with Katonic integration
-    agents = create_lead_qualification_agents(
-        model_id=model_id,
-        user_email=user_email,
-        project_name=project_name,
-        model_name=model_name,
-        temperature=temperature
-    )
-    
-    # Create tasks
-    tasks = create_form_tasks(
-        agents,
-        name,
-        company,
-        designation,
-        email,
-        query,
-        target_config
-    )
-    
-    # Create and run crew
-    crew = Crew(
-        agents=[agents['email_parser'], agents['company_researcher'], agents['lead_scorer'], agents['recommendation_agent']],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True
-    )
-    
-    result = crew.kickoff()
-    return result
+    # Share one retry budget across all of this lead's LLM calls
+    with retry_budget(LEAD_RETRY_BUDGET):
+        if not concurrent and llm is None and scoring == 'llm':
+            # Bind this lead's fields into a cached compiled crew
+            artifacts = run_compiled_stages(lead, target_config, model_id, user_email, project_name, model_name,
+                                            temperature, registry=registry, agent_models=agent_models,
+                                            contact=contact)
+            return result_from_artifacts(artifacts, lead)
+        
+        # Check out cached agents with Katonic integration
+        with checkout_agents(model_id, user_email, project_name, model_name, temperature,
+                             llm=llm, registry=registry, agent_models=agent_models) as agents:
+            # Create tasks
+            tasks = create_form_tasks(
+                agents,
+                name,
+                company,
+                designation,
+                email,
+                query,
+                target_config,
+                speculative_research=concurrent
+            )
+            
+            if contact is not None:
+                # The structure task is replaced by its local result
+                artifacts, _ = run_stages(tasks, lead, target_config, scoring, scoring_weights,
+                                          known={'contact': contact})
+                return result_from_artifacts(artifacts, lead)
+            
+            if scoring == 'rules':
+                return run_rule_scored_tasks(tasks, lead, target_config, scoring_weights)
+            
+            # Run the crew
+            return kickoff_tasks(agents, tasks, concurrent=concurrent)
 
 
 # Simple wrapper for the Streamlit app
 def run_email_qualification_simple(sender_email, email_subject, email_content, target_config, 
-                                 model_id, user_email, project_name, model_name):
+                                 model_id, user_email, project_name, model_name, registry=None,
+                                 scoring='llm', artifact_store=None, backend='crew', agent_models=None):
     """
     Simplified version for Streamlit app
     """
@@ -127,14 +770,20 @@ def run_email_qualification_simple(sender_email, email_subject, email_content, t
             user_email=user_email,
             project_name=project_name,
             model_name=model_name,
-            temperature=0.3
+            temperature=0.3,
+            registry=registry,
+            scoring=scoring,
+            artifact_store=artifact_store,
+            backend=backend,
+            agent_models=agent_models
         )
     except Exception as e:
         raise e
 
 
 def run_form_qualification_simple(name, company, designation, email, query, target_config,
-                                model_id, user_email, project_name, model_name):
+                                model_id, user_email, project_name, model_name, registry=None,
+                                scoring='llm', artifact_store=None, backend='crew', agent_models=None):
     """
     Simplified version for Streamlit app
     """
@@ -150,7 +799,12 @@ def run_form_qualification_simple(name, company, designation, email, query, targ
             user_email=user_email,
             project_name=project_name,
             model_name=model_name,
-            temperature=0.3
+            temperature=0.3,
+            registry=registry,
+            scoring=scoring,
+            artifact_store=artifact_store,
+            backend=backend,
+            agent_models=agent_models
         )
     except Exception as e:
         raise e
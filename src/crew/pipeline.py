@@ -0,0 +1,224 @@
+"""
+Stage-pipelined batch qualification: one bounded queue and worker pool per agent
+"""
+
+import json
+import queue
+import threading
+
+from src.agents.registry import default_registry
+from src.crew.lead_crew import check_scoring_mode, local_contact
+from src.crew.stages import STAGE_AGENTS, STAGES, run_pack, stage_header, stage_payload
+from src.models import Lead, QualificationResult
+from src.scoring.rubric import score_lead
+
+
+# Workers per stage; research and scoring answer slower than parsing
+DEFAULT_STAGE_WORKERS = {'contact': 2, 'company': 4, 'score': 4, 'recommendation': 2}
+
+# Leads waiting in front of each stage. Full queues block the stage before
+# them, so at most sum(queue sizes) + workers leads are held in memory
+DEFAULT_STAGE_QUEUE_SIZE = 32
+
+# Seconds between checks for a cancelled pipeline while blocked on a queue
+POLL_SECONDS = 0.2
+
+_DONE = object()
+
+
+def stage_settings(values, default):
+    """
+    Resolve per-stage settings keyed by stage name or agent name
+
+    Args:
+        values: None, a number for every stage, or a dict keyed by stage
+            ('contact') or agent ('email_parser') name
+        default: Value, or dict of values per stage, for missing keys
+
+    Returns:
+        dict: Stage name -> positive int
+    """
+    settings = {}
+    for stage in STAGES:
+        fallback = default[stage] if isinstance(default, dict) else default
+        if isinstance(values, dict):
+            value = values.get(stage, values.get(STAGE_AGENTS[stage], fallback))
+        else:
+            value = fallback if values is None else values
+        settings[stage] = max(1, int(value))
+    return settings
+
+
+def _put(target, item, stop):
+    """
+    Block until the item is queued, or return False if the pipeline was stopped
+    """
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(source, stop):
+    """
+    Block until an item arrives, or return _DONE if the pipeline was stopped
+    """
+    while not stop.is_set():
+        try:
+            return source.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def run_pipelined_qualification(leads, target_config, model_id, user_email, project_name, model_name,
+                                temperature=0.3, llm=None, registry=None, scoring='llm', scoring_weights=None,
+                                local_structuring=True, workers=None, queue_sizes=None, agent_models=None):
+    """
+    Qualify a stream of leads with the four agents working as a pipeline
+
+    Each stage (contact/email_parser, company/company_researcher,
+    score/lead_scorer, recommendation/recommendation_agent) has its own
+    bounded input queue and worker threads, so lead N+1 can be parsed
+    while lead N is scored. Leads are read from the iterable only as the
+    first queue drains, which keeps memory flat on very large inputs.
+    Stages answered locally (form and confident email contacts, rules
+    scoring) pass straight through their workers without an LLM call.
+
+    Args:
+        leads: Iterable of Lead objects or lead dictionaries; read lazily
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        llm: Existing KatonicLLMWrapper to call for every stage, through a
+            per-agent view (see KatonicLLMWrapper.for_agent)
+        registry: AgentRegistry whose shared wrappers to call
+        scoring: 'llm', or 'rules' to score locally with the rubric
+        scoring_weights: Rubric points per line for 'rules' scoring
+        local_structuring: Skip the contact stage for leads that
+            src.extraction can structure locally
+        workers: Worker threads per stage; a number for every stage or a
+            dict keyed by stage or agent name (see DEFAULT_STAGE_WORKERS)
+        queue_sizes: Input queue bound per stage, in the same forms
+            (default DEFAULT_STAGE_QUEUE_SIZE)
+        agent_models: Per-agent model settings; each stage is sent to the
+            model of its agent (see resolve_agent_models)
+
+    Yields:
+        tuple: (position of the lead in the input, dictionary with keys
+            'id', 'result' and 'error'), in completion order
+    """
+    check_scoring_mode(scoring)
+    if llm is None:
+        llms = (registry or default_registry).agent_llms(model_id, user_email, project_name, model_name,
+                                                         temperature, agent_models)
+    else:
+        llms = {name: llm.for_agent(name) for name in STAGE_AGENTS.values()}
+    workers = stage_settings(workers, DEFAULT_STAGE_WORKERS)
+    sizes = stage_settings(queue_sizes, DEFAULT_STAGE_QUEUE_SIZE)
+    headers = {stage: stage_header(stage, target_config) for stage in STAGES}
+    queues = {stage: queue.Queue(maxsize=sizes[stage]) for stage in STAGES}
+    results = queue.Queue(maxsize=sizes[STAGES[-1]])
+    stop = threading.Event()
+    remaining = dict(workers)
+    remaining_lock = threading.Lock()
+
+    def finish(index, lead, error=None, artifacts=None):
+        lead_id = index if lead is None or lead.id is None else lead.id
+        if error is not None:
+            return _put(results, (index, {'id': lead_id, 'result': None, 'error': error}), stop)
+        result = QualificationResult.from_stage_data(
+            artifacts['contact'],
+            artifacts['company'],
+            artifacts['score'],
+            artifacts['recommendation'],
+            raw=json.dumps(artifacts['recommendation'], indent=2),
+            lead=lead
+        )
+        return _put(results, (index, {'id': lead_id, 'result': result, 'error': None}), stop)
+
+    def feed():
+        try:
+            for index, lead in enumerate(leads):
+                try:
+                    if not isinstance(lead, Lead):
+                        lead = Lead.from_dict(lead, default_id=index)
+                except Exception as e:
+                    if not finish(index, None, str(e)):
+                        return
+                    continue
+                artifacts = {}
+                if local_structuring:
+                    known = local_contact(lead)
+                    if known is not None:
+                        artifacts['contact'] = known[0]
+                if not _put(queues[STAGES[0]], (index, lead, artifacts), stop):
+                    return
+        finally:
+            for _ in range(workers[STAGES[0]]):
+                _put(queues[STAGES[0]], _DONE, stop)
+
+    def work(position, stage):
+        following = queues[STAGES[position + 1]] if position + 1 < len(STAGES) else None
+        while True:
+            item = _get(queues[stage], stop)
+            if item is _DONE:
+                break
+            index, lead, artifacts = item
+            try:
+                if stage in artifacts:
+                    pass
+                elif stage == 'score' and scoring == 'rules':
+                    artifacts['score'] = score_lead(lead, artifacts['contact'], artifacts['company'],
+                                                    target_config, scoring_weights)
+                else:
+                    payload = stage_payload(stage, lead, artifacts)
+                    output = run_pack(stage, headers[stage], [(index, payload)], llms[STAGE_AGENTS[stage]])[index]
+                    if isinstance(output, Exception):
+                        raise output
+                    artifacts[stage] = output
+            except Exception as e:
+                finish(index, lead, f"{stage} stage failed: {e}")
+                continue
+            if following is None:
+                finish(index, lead, artifacts=artifacts)
+            else:
+                _put(following, (index, lead, artifacts), stop)
+
+        # The last worker out of a stage closes the next one
+        with remaining_lock:
+            remaining[stage] -= 1
+            last = remaining[stage] == 0
+        if last:
+            if following is None:
+                _put(results, _DONE, stop)
+            else:
+                for _ in range(workers[STAGES[position + 1]]):
+                    _put(following, _DONE, stop)
+
+    threads = [threading.Thread(target=feed, name='pipeline-feed', daemon=True)]
+    for position, stage in enumerate(STAGES):
+        threads.extend(
+            threading.Thread(target=work, args=(position, stage), name=f'pipeline-{stage}-{number}', daemon=True)
+            for number in range(workers[stage])
+        )
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # Unblock every thread if the caller stops iterating early
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,94 @@
+"""
+Concurrent task-graph scheduler for the lead qualification crew
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from crewai.crews.crew_output import CrewOutput
+
+
+CONTEXT_SEPARATOR = "\n\n----------\n\n"
+
+
+def get_task_dependencies(task, tasks):
+    """
+    Return the tasks from `tasks` that `task` declares in its context
+
+    Args:
+        task: CrewAI Task instance
+        tasks: List of Task instances making up the graph
+
+    Returns:
+        list: Upstream Task instances
+    """
+    context = getattr(task, 'context', None)
+    if not isinstance(context, list):
+        return []
+    return [upstream for upstream in context if any(upstream is t for t in tasks)]
+
+
+def execute_task(task, upstream_outputs):
+    """
+    Execute a single task with the raw outputs of its upstream tasks as context
+
+    Args:
+        task: CrewAI Task instance
+        upstream_outputs: List of TaskOutput objects or plain context
+            strings, in context order
+
+    Returns:
+        TaskOutput: Output of the executed task
+    """
+    context = CONTEXT_SEPARATOR.join(getattr(output, 'raw', output) for output in upstream_outputs)
+    return task.execute_sync(agent=task.agent, context=context or None)
+
+
+def run_task_graph(tasks, max_workers=4):
+    """
+    Run tasks concurrently, starting each one as soon as the tasks in its
+    `context=[...]` have finished
+
+    Tasks without unfinished dependencies run at the same time, so the
+    critical path is the longest dependency chain rather than the sum of
+    all tasks.
+
+    Args:
+        tasks: List of Task instances, in declaration order
+        max_workers: Maximum number of tasks executing at once
+
+    Returns:
+        CrewOutput: Result with one TaskOutput per task, in declaration order
+    """
+    dependencies = {id(task): get_task_dependencies(task, tasks) for task in tasks}
+    outputs = {}
+    pending = list(tasks)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for task in list(pending):
+                if all(id(upstream) in outputs for upstream in dependencies[id(task)]):
+                    upstream_outputs = [outputs[id(upstream)] for upstream in dependencies[id(task)]]
+                    # Carry context variables (e.g. retry budgets) into the worker
+                    ctx = contextvars.copy_context()
+                    future = executor.submit(ctx.run, execute_task, task, upstream_outputs)
+                    running[future] = task
+                    pending.remove(task)
+
+            if not running:
+                raise ValueError("Task graph contains a dependency cycle")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                outputs[id(task)] = future.result()
+
+    ordered = [outputs[id(task)] for task in tasks]
+    final = ordered[-1]
+    return CrewOutput(
+        raw=final.raw,
+        pydantic=final.pydantic,
+        json_dict=final.json_dict,
+        tasks_output=ordered
+    )
@@ -0,0 +1,323 @@
+"""
+Stage-by-stage batch qualification with several leads packed into each LLM request
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agents.lead_agents import AGENT_PROFILES
+from src.agents.registry import default_registry
+from src.crew.lead_crew import LEAD_RETRY_BUDGET, STAGE_AGENTS, check_scoring_mode, local_contact
+from src.models import Lead, QualificationResult
+from src.scoring.rubric import score_lead
+from src.tasks.lead_tasks import RUBRIC_SUMMARY, fill_placeholders, target_config_inputs
+from src.tasks.schemas import CompanyResearch, LeadScore, ParsedLead, Recommendation
+from src.utils.concurrency import get_concurrency_limiter
+from src.utils.json_extractor import iter_json_objects
+from src.utils.rate_limiter import estimate_tokens
+from src.utils.resilience import retry_budget
+
+
+STAGES = ('contact', 'company', 'score', 'recommendation')
+
+STAGE_MODELS = {
+    'contact': ParsedLead,
+    'company': CompanyResearch,
+    'score': LeadScore,
+    'recommendation': Recommendation
+}
+
+STAGE_INSTRUCTIONS = {
+    'contact': 'For each lead, extract sender_name, company_name, designation, email, domain, '
+               'domain_type ("business" or "personal") and intent (the main purpose of the message).',
+    'company': 'For each lead, infer industry (one of: Technology, Healthcare, Finance, Manufacturing, Retail, '
+               'Education, Consulting, Real Estate, Other), company_size (one of: Startup (1-50), '
+               'SMB (51-500), Enterprise (500+)), location, domain_type and insights.',
+    'score': 'For each lead, apply the rubric and return total_score, email_domain_score, company_fit_score, '
+             'role_score, message_intent_score, a *_justification for each component and '
+             'qualification_status.\n\n'
+             'Target Criteria:\n'
+             '- Target Industries: {target_industries}\n'
+             '- Target Company Sizes: {target_company_sizes}\n'
+             '- Target Regions: {target_regions}\n\n'
+             '{rubric}',
+    'recommendation': 'For each lead, return next_action (Forward to Sales / Manual Review / Disqualify), '
+                      'priority (High / Medium / Low), reasoning, talking_points and concerns.'
+}
+
+PACKED_DESCRIPTION = """
+        You are the {role}. {goal}. {backstory}
+
+        {instructions}
+
+        Leads, each tagged with an id:
+        {leads}
+
+        Return only one JSON object with one entry per lead id:
+        {"results": [{"id": "L1", ...stage fields...}]}
+        """
+
+# Rough answer size per lead and stage, reserved out of the token budget
+STAGE_OUTPUT_TOKENS = {'contact': 120, 'company': 120, 'score': 260, 'recommendation': 220}
+
+# Prompt plus expected answer tokens allowed in one packed request
+DEFAULT_TOKEN_BUDGET = 6000
+# Upper bound on leads per request, whatever the budget
+MAX_PACK = 16
+
+# Longest message excerpt sent to the scoring stage
+MESSAGE_EXCERPT_CHARS = 600
+
+
+def stage_payload(stage, lead, artifacts):
+    """
+    Return the per-lead input of a stage: the lead's fields plus the
+    outputs of the stages before it
+    """
+    if stage == 'contact':
+        return dict(lead.task_fields(), kind=lead.kind)
+    if stage == 'company':
+        return {'contact': artifacts['contact']}
+    payload = {'contact': artifacts['contact'], 'company': artifacts['company']}
+    if stage == 'score':
+        payload['message'] = f'{lead.subject} {lead.content}'.strip()[:MESSAGE_EXCERPT_CHARS]
+    else:
+        payload['score'] = artifacts['score']
+    return payload
+
+
+def stage_header(stage, target_config):
+    """
+    Fill the persona and instructions shared by every lead in a packed request
+    """
+    values = target_config_inputs(target_config)
+    values['rubric'] = RUBRIC_SUMMARY
+    values['instructions'] = fill_placeholders(STAGE_INSTRUCTIONS[stage], values)
+    values.update(AGENT_PROFILES[STAGE_AGENTS[stage]])
+    return values
+
+
+def packed_prompt(header, items):
+    """
+    Build one request for several leads
+
+    Args:
+        header: Values from stage_header
+        items: List of (tag, payload) pairs
+
+    Returns:
+        str: Prompt text
+    """
+    blocks = '\n'.join(
+        f'<lead id="{tag}">\n{json.dumps(payload, ensure_ascii=False)}\n</lead>' for tag, payload in items
+    )
+    return fill_placeholders(PACKED_DESCRIPTION, dict(header, leads=blocks))
+
+
+def pack_items(items, stage, header, token_budget=DEFAULT_TOKEN_BUDGET, max_pack=MAX_PACK):
+    """
+    Split a stage's work into packs that fit the token budget
+
+    The persona, instructions and rubric are paid once per pack; each lead
+    adds its payload and its expected answer. Packs are filled greedily in
+    input order, so K shrinks for long emails and grows for short forms.
+
+    Args:
+        items: List of (key, payload) pairs
+        stage: Stage name
+        header: Values from stage_header
+        token_budget: Prompt plus answer tokens per request
+        max_pack: Maximum leads per request
+
+    Returns:
+        list: Lists of (key, payload) pairs
+    """
+    fixed = estimate_tokens(packed_prompt(header, []))
+    packs, current, used = [], [], fixed
+    for key, payload in items:
+        cost = estimate_tokens(json.dumps(payload, ensure_ascii=False)) + STAGE_OUTPUT_TOKENS[stage]
+        if current and (used + cost > token_budget or len(current) >= max_pack):
+            packs.append(current)
+            current, used = [], fixed
+        current.append((key, payload))
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def parse_packed_response(stage, response, tags):
+    """
+    Demultiplex a packed answer into one validated stage output per lead
+
+    Args:
+        stage: Stage name
+        response: Raw LLM answer
+        tags: Lead tags sent in the request
+
+    Returns:
+        dict: tag -> stage fields, for the leads whose sub-answer parsed
+    """
+    answer = {}
+    for obj in iter_json_objects(response or ''):
+        answer = obj
+    entries = answer.get('results')
+    if not isinstance(entries, list):
+        # Also accept {"L1": {...}, "L2": {...}}
+        entries = [dict(value, id=key) for key, value in answer.items() if isinstance(value, dict)]
+
+    model = STAGE_MODELS[stage]
+    wanted = set(tags)
+    parsed = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or str(entry.get('id')) not in wanted:
+            continue
+        fields = {key: value for key, value in entry.items() if key != 'id'}
+        if not any(name in fields for name in model.__annotations__):
+            continue
+        try:
+            parsed[str(entry['id'])] = model(**fields).model_dump(exclude_none=True)
+        except ValueError:
+            continue
+    return parsed
+
+
+def run_pack(stage, header, pack, llm):
+    """
+    Send one packed request and retry the leads it did not answer one by one
+
+    Args:
+        stage: Stage name
+        header: Values from stage_header
+        pack: List of (key, payload) pairs
+        llm: KatonicLLMWrapper
+
+    Returns:
+        dict: key -> stage fields, or key -> Exception for leads that
+            failed on their own as well
+    """
+    tags = {f'L{position}': key for position, (key, _) in enumerate(pack, start=1)}
+    items = [(tag, payload) for tag, (_, payload) in zip(tags, pack)]
+    outputs = {}
+    try:
+        with retry_budget(LEAD_RETRY_BUDGET):
+            parsed = parse_packed_response(stage, llm.generate_completion(packed_prompt(header, items)), tags)
+    except Exception as e:
+        if len(pack) == 1:
+            return {pack[0][0]: e}
+        parsed = {}
+    for tag, data in parsed.items():
+        outputs[tags[tag]] = data
+
+    if len(pack) > 1:
+        for key, payload in pack:
+            if key not in outputs:
+                outputs.update(run_pack(stage, header, [(key, payload)], llm))
+    for key, _ in pack:
+        outputs.setdefault(key, ValueError(f"No parsable {stage} answer"))
+    return outputs
+
+
+def run_packed_qualification(leads, target_config, model_id, user_email, project_name, model_name,
+                             temperature=0.3, llm=None, registry=None, scoring='llm', scoring_weights=None,
+                             local_structuring=True, token_budget=DEFAULT_TOKEN_BUDGET, max_pack=MAX_PACK,
+                             max_concurrency=None, agent_models=None):
+    """
+    Qualify a batch stage by stage, packing several leads into each request
+
+    Every lead finishes a stage before the next stage starts. Within a
+    stage, leads are packed up to the token budget and tagged L1..LK; the
+    answer is split back by tag and each sub-answer validated against the
+    stage's model. A lead whose sub-answer is missing or invalid is retried
+    on its own; if that fails too, the lead is reported with an error, as
+    is a lead dictionary that is not a valid lead.
+
+    Args:
+        leads: Iterable of Lead objects or lead dictionaries
+        target_config: Target criteria
+        model_id: Katonic model ID from My Model Library
+        user_email: User email for logging
+        project_name: Project name for logging
+        model_name: Model name for logging
+        temperature: Model temperature
+        llm: Existing KatonicLLMWrapper to call for every stage, through a
+            per-agent view (see KatonicLLMWrapper.for_agent)
+        registry: AgentRegistry whose shared wrappers to call
+        scoring: 'llm', or 'rules' to score locally with the rubric
+        scoring_weights: Rubric points per line for 'rules' scoring
+        local_structuring: Skip the contact stage for leads that
+            src.extraction can structure locally
+        token_budget: Prompt plus answer tokens per request
+        max_pack: Maximum leads per request
+        max_concurrency: Maximum packed requests in flight
+        agent_models: Per-agent model settings; each stage is sent to the
+            model of its agent (see resolve_agent_models)
+
+    Returns:
+        list: One dictionary per lead, in input order, with keys
+            'id', 'result' and 'error'
+    """
+    check_scoring_mode(scoring)
+    if llm is None:
+        llms = (registry or default_registry).agent_llms(model_id, user_email, project_name, model_name,
+                                                         temperature, agent_models)
+    else:
+        llms = {name: llm.for_agent(name) for name in STAGE_AGENTS.values()}
+    leads = list(leads)
+    artifacts = [{} for _ in leads]
+    errors = [None] * len(leads)
+    for index, lead in enumerate(leads):
+        try:
+            if not isinstance(lead, Lead):
+                leads[index] = Lead.from_dict(lead, default_id=index)
+        except Exception as e:
+            leads[index], errors[index] = None, str(e)
+    if max_concurrency is None:
+        max_concurrency = get_concurrency_limiter(model_id).max_limit
+
+    if local_structuring:
+        for index, lead in enumerate(leads):
+            if lead is None:
+                continue
+            known = local_contact(lead)
+            if known is not None:
+                artifacts[index]['contact'] = known[0]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        for stage in STAGES:
+            pending = [index for index in range(len(leads)) if errors[index] is None and stage not in artifacts[index]]
+            if stage == 'score' and scoring == 'rules':
+                for index in pending:
+                    artifacts[index]['score'] = score_lead(leads[index], artifacts[index]['contact'],
+                                                           artifacts[index]['company'], target_config,
+                                                           scoring_weights)
+                continue
+
+            header = stage_header(stage, target_config)
+            items = [(index, stage_payload(stage, leads[index], artifacts[index])) for index in pending]
+            packs = pack_items(items, stage, header, token_budget, max_pack)
+            stage_llm = llms[STAGE_AGENTS[stage]]
+            for outputs in executor.map(lambda pack: run_pack(stage, header, pack, stage_llm), packs):
+                for index, output in outputs.items():
+                    if isinstance(output, Exception):
+                        errors[index] = f"{stage} stage failed: {output}"
+                    else:
+                        artifacts[index][stage] = output
+
+    results = []
+    for index, lead in enumerate(leads):
+        lead_id = index if lead is None or lead.id is None else lead.id
+        if errors[index] is not None:
+            results.append({'id': lead_id, 'result': None, 'error': errors[index]})
+            continue
+        stages = artifacts[index]
+        result = QualificationResult.from_stage_data(
+            stages['contact'],
+            stages['company'],
+            stages['score'],
+            stages['recommendation'],
+            raw=json.dumps(stages['recommendation'], indent=2),
+            lead=lead
+        )
+        results.append({'id': lead_id, 'result': result, 'error': None})
+    return results
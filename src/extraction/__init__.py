@@ -0,0 +1,8 @@
+"""
+Local (non-LLM) lead extraction
+"""
+
+from .form import structure_form
+from .signature import EMAIL_CONFIDENCE_THRESHOLD, extract_email_contact, title_seniority
+
+__all__ = ['structure_form', 'extract_email_contact', 'title_seniority', 'EMAIL_CONFIDENCE_THRESHOLD']
@@ -0,0 +1,94 @@
+"""
+Deterministic structuring of form submissions
+"""
+
+import re
+
+from src.scoring.rubric import SPAM_PATTERN, clean_value
+from src.utils.domain_index import get_domain_index
+
+
+# (intent label, pattern) in match priority order; the first match wins
+INTENT_BUCKETS = (
+    ('Pricing / purchase inquiry', re.compile(
+        r'\b(pricing|price|prices|quote|quotation|cost|costs|purchase|buy|budget|licen[cs]\w*|seats|rfp|'
+        r'proposal|contract|subscription)\b', re.IGNORECASE)),
+    ('Demo / trial request', re.compile(
+        r'\b(demo|demonstration|trial|pilot|walkthrough|poc|proof of concept)\b', re.IGNORECASE)),
+    ('Implementation / integration inquiry', re.compile(
+        r'\b(implement\w*|integrat\w*|deploy\w*|migrat\w*|onboard\w*|rollout|roll out|api)\b', re.IGNORECASE)),
+    ('Partnership inquiry', re.compile(
+        r'\b(partner\w*|reseller|resell|collaborat\w*|alliance|affiliate)\b', re.IGNORECASE)),
+    ('Support request', re.compile(
+        r'\b(support|issue|problem|bug|error|not working|broken|outage|refund)\b', re.IGNORECASE)),
+    ('Job application', re.compile(
+        r'\b(job|jobs|career|careers|hiring|vacancy|resume|cv|internship)\b', re.IGNORECASE)),
+)
+
+# Queries shorter than this with no bucket keyword are too vague to classify
+MIN_INQUIRY_WORDS = 4
+
+
+def email_domain(email):
+    """
+    Return the lower-cased domain of an email address
+    """
+    return email.rsplit('@', 1)[-1].strip().lower() if email and '@' in email else ''
+
+
+def classify_domain(domain):
+    """
+    Classify an email domain as 'personal' (free or disposable mail) or 'business'
+    """
+    return get_domain_index().domain_type(domain)
+
+
+def classify_intent(query):
+    """
+    Bucket a free-text query into a coarse intent label
+
+    Args:
+        query: Message from the form
+
+    Returns:
+        str: Intent label
+    """
+    text = query or ''
+    if SPAM_PATTERN.search(text):
+        return 'Spam / unsolicited offer'
+    for label, pattern in INTENT_BUCKETS:
+        if pattern.search(text):
+            return label
+    if len(text.split()) >= MIN_INQUIRY_WORDS:
+        return 'General inquiry'
+    return 'Unclear'
+
+
+def structure_form(name, company, designation, email, query):
+    """
+    Build the structure task's JSON for a form submission without an LLM call
+
+    The form fields are already validated, so they are copied as-is; only
+    the domain, its type and the intent are derived.
+
+    Args:
+        name: Contact name
+        company: Company name
+        designation: Job title
+        email: Email address
+        query: Message/query
+
+    Returns:
+        dict: sender_name, company_name, designation, email, domain,
+            domain_type and intent, as produced by the structure task
+    """
+    domain = email_domain(email)
+    return {
+        'sender_name': (name or '').strip(),
+        'company_name': (company or '').strip(),
+        'designation': clean_value(designation) or 'Not provided',
+        'email': (email or '').strip(),
+        'domain': domain,
+        'domain_type': classify_domain(domain),
+        'intent': classify_intent(query)
+    }
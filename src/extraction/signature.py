@@ -0,0 +1,246 @@
+"""
+Deterministic contact extraction from an email's sender header and signature
+"""
+
+import re
+
+from src.extraction.form import classify_domain, classify_intent, email_domain
+from src.scoring.seniority import normalize_title, title_seniority
+from src.utils.domain_index import PERSONAL_CATEGORIES, get_domain_index
+
+
+# Below this overall confidence the email_parser agent is asked instead
+EMAIL_CONFIDENCE_THRESHOLD = 0.75
+
+# Weight of each field in the overall confidence
+CONFIDENCE_WEIGHTS = {'sender_name': 0.35, 'company_name': 0.35, 'designation': 0.3}
+
+DISPLAY_NAME_PATTERN = re.compile(r'^\s*"?([^"<>]*?)"?\s*<\s*([^<>\s]+@[^<>\s]+)\s*>\s*$')
+SIGN_OFF_PATTERN = re.compile(
+    r'^\s*(best|best regards|kind regards|warm regards|warmest regards|regards|thanks|thank you|'
+    r'many thanks|thanks again|cheers|sincerely|yours sincerely|yours truly|respectfully|br)\b[\s,!.]*$',
+    re.IGNORECASE
+)
+# Where quoted replies and forwarded messages begin
+QUOTE_PATTERN = re.compile(r'^\s*(>|-{2,}\s*original message|on .+ wrote:$|from:\s)', re.IGNORECASE)
+CONTACT_LINE_PATTERN = re.compile(r'(@|https?://|www\.|\+?\d[\d\s().-]{6,}|\b(tel|phone|mobile|fax)\b)',
+                                  re.IGNORECASE)
+NAME_LINE_PATTERN = re.compile(r"^[A-Z][a-zA-Z'.-]+(?:\s+[A-Z][a-zA-Z'.-]*){1,3}$")
+TITLE_SEPARATOR_PATTERN = re.compile(r'\s*(?:,|\||–|—|\s-\s|\bat\b|\s@\s)\s*')
+# 'I am the Head of IT at BigCo': the company follows at/for/with; 'of' is
+# tried only when none does, since titles themselves contain it
+SELF_INTRODUCTION_PATTERNS = tuple(
+    re.compile(
+        r"\b(?i:i am|i'm|as)\s+(?:the\s+|an?\s+)?([A-Za-z&./ -]{2,40}?)\s+(?:" + joiners + r")\s+"
+        r"([A-Z][A-Za-z0-9&.'-]*(?:\s+[A-Z][A-Za-z0-9&.'-]*){0,3})"
+    )
+    for joiners in ('at|for|with', 'of')
+)
+DEPARTMENT_PATTERN = re.compile(
+    r'^(engineering|eng|operations|ops|sales|marketing|mktg|it|hr|human resources|finance|product|'
+    r'procurement|purchasing|legal|security|data|analytics|research|r&d|customer success|support)$',
+    re.IGNORECASE
+)
+
+
+def find_self_introduction(content):
+    """
+    Find a self-introduction such as "I'm the VP of Sales at Acme"
+
+    Args:
+        content: Email body
+
+    Returns:
+        tuple: (title, company), or None if no introduction names a role
+    """
+    for pattern in SELF_INTRODUCTION_PATTERNS:
+        for match in pattern.finditer(content or ''):
+            if title_seniority(match.group(1)):
+                return match.group(1), match.group(2)
+    return None
+
+
+def parse_sender(sender_email):
+    """
+    Split a sender header such as '"Jane Doe" <jane@acme.com>' into name and address
+
+    Returns:
+        tuple: (display name, email address); the name is empty if absent
+    """
+    match = DISPLAY_NAME_PATTERN.match(sender_email or '')
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return '', (sender_email or '').strip()
+
+
+def name_from_address(address):
+    """
+    Guess a name from a first.last style local part, or '' if it is not one
+    """
+    local = address.split('@', 1)[0]
+    parts = [part for part in re.split(r'[._-]', local) if part]
+    if len(parts) in (2, 3) and all(part.isalpha() and len(part) > 1 for part in parts):
+        return ' '.join(part.capitalize() for part in parts)
+    return ''
+
+
+def company_from_domain(domain):
+    """
+    Guess a company name from a business email domain, e.g. 'acme-corp.com' -> 'Acme Corp'
+    """
+    index = get_domain_index()
+    if not domain or index.classify(domain) in PERSONAL_CATEGORIES:
+        return ''
+    # 'mail.acme.co.uk' -> 'acme'
+    stem = index.registrable_domain(domain).split('.')[0]
+    return ' '.join(part.capitalize() for part in re.split(r'[-_]', stem) if part)
+
+
+def squash(text):
+    """
+    Lower-case and drop non-alphanumerics, for comparing names across formats
+    """
+    return re.sub(r'[^a-z0-9]', '', (text or '').lower())
+
+
+def signature_block(content):
+    """
+    Return the lines of the email's signature block
+
+    The block follows the last sign-off ('Best regards,', 'Thanks', ...) or
+    a '-- ' delimiter in the message body, before any quoted reply.
+
+    Args:
+        content: Email body
+
+    Returns:
+        list: Non-empty signature lines (at most six), empty if none was found
+    """
+    lines = []
+    for line in (content or '').splitlines():
+        if QUOTE_PATTERN.match(line):
+            break
+        lines.append(line.strip())
+
+    start = None
+    for index, line in enumerate(lines):
+        if SIGN_OFF_PATTERN.match(line) or line == '--':
+            start = index + 1
+    if start is None:
+        return []
+    return [line for line in lines[start:] if line][:6]
+
+
+def split_title_line(line):
+    """
+    Split a signature line such as 'VP Eng, Acme Corp' into (title, company)
+
+    Returns:
+        tuple: (title, company); title is '' if no part of the line is a role
+    """
+    parts = [part for part in TITLE_SEPARATOR_PATTERN.split(line) if part]
+    for index, part in enumerate(parts):
+        if len(part.split()) <= 6 and title_seniority(part):
+            rest = [other for position, other in enumerate(parts) if position != index]
+            # 'Sr. Mgr, Operations' names a department, not a company
+            departments = [other for other in rest if DEPARTMENT_PATTERN.match(other)]
+            companies = [other for other in rest if not DEPARTMENT_PATTERN.match(other)]
+            title = ', '.join([part] + departments)
+            return title, (companies[0] if companies else '')
+    return '', ''
+
+
+def read_signature(lines):
+    """
+    Pick the name, title and company out of signature lines
+
+    Returns:
+        dict: 'name', 'title' and 'company' (each '' if not found)
+    """
+    found = {'name': '', 'title': '', 'company': ''}
+    for line in lines:
+        if CONTACT_LINE_PATTERN.search(line):
+            continue
+        title, company = split_title_line(line)
+        if title and not found['title']:
+            found['title'] = title
+            if company and not found['company']:
+                found['company'] = company
+        elif not found['name'] and NAME_LINE_PATTERN.match(line) and not title_seniority(line):
+            found['name'] = line
+        elif found['name'] and not found['company'] and len(line.split()) <= 5:
+            found['company'] = line
+    return found
+
+
+def extract_email_contact(sender_email, email_subject, email_content):
+    """
+    Build the email_parser task's JSON from the sender header and signature
+
+    Each field gets a confidence between 0 and 1: values confirmed by two
+    sources (e.g. the signature name matches the address) score highest,
+    values guessed from the address alone lowest. The overall confidence is
+    their weighted mean; below EMAIL_CONFIDENCE_THRESHOLD the LLM parser
+    should be used instead.
+
+    Args:
+        sender_email: Sender address, optionally with a display name
+        email_subject: Email subject
+        email_content: Email body
+
+    Returns:
+        tuple: (contact dict with the ParsedLead fields plus 'seniority',
+            confidence dict per field plus 'overall')
+    """
+    display_name, address = parse_sender(sender_email)
+    domain = email_domain(address)
+    domain_type = classify_domain(domain)
+    block = signature_block(email_content)
+    signature = read_signature(block)
+    address_name = name_from_address(address)
+    domain_company = company_from_domain(domain)
+
+    # Name: display name, then signature, then first.last address
+    if display_name and ' ' in display_name:
+        name, name_confidence = display_name, 0.95
+    elif signature['name']:
+        matches_address = squash(signature['name']) == squash(address_name)
+        name, name_confidence = signature['name'], 0.9 if matches_address else 0.75
+    elif address_name:
+        name, name_confidence = address_name, 0.6
+    else:
+        name, name_confidence = display_name, 0.4 if display_name else 0.0
+
+    # Title: signature line, then a self-introduction in the body
+    title, title_confidence = signature['title'], 0.9
+    introduction = None if title else find_self_introduction(email_content)
+    if introduction:
+        title, title_confidence = introduction[0], 0.7
+    if not title:
+        # A signature without a title usually means there is none to find
+        title_confidence = 0.5 if block else 0.2
+
+    # Company: signature, then self-introduction, then the business domain
+    company = signature['company'] or (introduction[1] if introduction else '')
+    if company:
+        agrees = domain_company and squash(domain_company) in squash(company)
+        company_confidence = 0.95 if agrees else 0.7
+    elif domain_company:
+        company, company_confidence = domain_company, 0.6
+    else:
+        company_confidence = 0.3
+
+    contact = {
+        'sender_name': name,
+        'company_name': company,
+        'designation': normalize_title(title) if title else 'Not provided',
+        'seniority': title_seniority(title) or 'Unknown',
+        'email': address,
+        'domain': domain,
+        'domain_type': domain_type,
+        'intent': classify_intent(f'{email_subject or ""} {email_content or ""}')
+    }
+    confidence = {'sender_name': name_confidence, 'company_name': company_confidence,
+                  'designation': title_confidence}
+    confidence['overall'] = round(sum(confidence[field] * weight for field, weight in CONFIDENCE_WEIGHTS.items()), 3)
+    return contact, confidence
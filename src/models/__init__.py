@@ -0,0 +1,8 @@
+"""
+Result models for Lead Qualification
+"""
+
+from .lead import Lead
+from .results import ScoreBreakdown, QualificationResult, dump_jsonl, load_jsonl
+
+__all__ = ['Lead', 'ScoreBreakdown', 'QualificationResult', 'dump_jsonl', 'load_jsonl']
@@ -0,0 +1,121 @@
+"""
+Compact lead record shared by the crew layer and batch runs
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+
+
+def get_lead_type(lead):
+    """
+    Determine whether a lead is an email or a form submission
+
+    Args:
+        lead: Lead dictionary, optionally with an explicit 'type' key
+
+    Returns:
+        str: 'email' or 'form'
+    """
+    if lead.get('type') in ('email', 'form'):
+        return lead['type']
+    if 'sender_email' in lead:
+        return 'email'
+    if 'query' in lead:
+        return 'form'
+    raise ValueError("Lead must be an email (sender_email, email_subject, email_content) "
+                     "or a form (name, company, designation, email, query)")
+
+
+@dataclass(frozen=True, slots=True)
+class Lead:
+    """
+    One inbound lead, either an email or a form submission
+
+    Email leads use `subject` and use `content` for the email body; form
+    leads use `name`, `company`, `designation` and `content` for the query.
+    """
+    kind: str
+    email: str
+    name: str = ''
+    company: str = ''
+    designation: str = ''
+    subject: str = ''
+    content: str = ''
+    id: object = None
+
+    @classmethod
+    def from_dict(cls, lead, default_id=None):
+        """
+        Build a lead from a batch-style dictionary
+
+        Args:
+            lead: Dictionary with email fields (sender_email, email_subject,
+                email_content) or form fields (name, company, designation,
+                email, query), and optionally 'type' and 'id'
+            default_id: Identifier to use when the dictionary has no 'id'
+
+        Returns:
+            Lead: Lead record
+        """
+        lead_id = lead.get('id', default_id)
+        if get_lead_type(lead) == 'email':
+            return cls(
+                kind='email',
+                email=lead.get('sender_email', ''),
+                subject=lead.get('email_subject', ''),
+                content=lead.get('email_content', ''),
+                id=lead_id
+            )
+        return cls(
+            kind='form',
+            email=lead.get('email', ''),
+            name=lead.get('name', ''),
+            company=lead.get('company', ''),
+            designation=lead.get('designation', ''),
+            content=lead.get('query', ''),
+            id=lead_id
+        )
+
+    def task_fields(self):
+        """
+        Return the keyword arguments for run_email_qualification or
+        run_form_qualification
+
+        Returns:
+            dict: Lead fields under the names the crew layer expects
+        """
+        if self.kind == 'email':
+            return {
+                'sender_email': self.email,
+                'email_subject': self.subject,
+                'email_content': self.content
+            }
+        return {
+            'name': self.name,
+            'company': self.company,
+            'designation': self.designation,
+            'email': self.email,
+            'query': self.content
+        }
+
+    def fingerprint(self):
+        """
+        Return a content hash of the lead's fields, ignoring its id, so the
+        same submission maps to the same stage artifacts across runs
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        material = json.dumps([self.kind, self.task_fields()], sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def to_dict(self):
+        """
+        Return the lead as a batch-style dictionary, the inverse of from_dict
+        """
+        record = {'type': self.kind}
+        record.update(self.task_fields())
+        if self.id is not None:
+            record['id'] = self.id
+        return record
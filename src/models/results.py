@@ -0,0 +1,331 @@
+"""
+Typed qualification results built from CrewAI task outputs
+"""
+
+import json
+import sys
+from dataclasses import dataclass, field
+
+from src.models.lead import Lead
+from src.utils.json_extractor import iter_json_objects
+
+
+# Component scores shown in the score breakdown, in rubric order
+BREAKDOWN_FIELDS = ('email_domain_score', 'company_fit_score', 'role_score', 'message_intent_score')
+
+# Short labels that repeat across every result; interned so a batch holds one copy
+INTERNED_FIELDS = ('qualification_status', 'priority', 'next_action', 'industry', 'company_size',
+                   'domain_type', 'location')
+
+
+def task_output_data(task_output):
+    """
+    Return the structured data of one task output
+
+    The validated pydantic model is preferred, then CrewAI's json_dict. If
+    CrewAI could not convert the answer, the task's own raw output (not
+    the whole transcript) is scanned for its last JSON object.
+
+    Args:
+        task_output: CrewAI TaskOutput
+
+    Returns:
+        dict: Task fields, empty if the output holds no structured data
+    """
+    if task_output is None:
+        return {}
+    if getattr(task_output, 'pydantic', None) is not None:
+        return task_output.pydantic.model_dump(exclude_none=True)
+    if getattr(task_output, 'json_dict', None):
+        return dict(task_output.json_dict)
+
+    data = {}
+    for obj in iter_json_objects(getattr(task_output, 'raw', '') or ''):
+        data = obj
+    return data
+
+
+def intern_labels(data):
+    """
+    Intern the short, highly repetitive string values of a task dictionary
+    """
+    for key in INTERNED_FIELDS:
+        if isinstance(data.get(key), str):
+            data[key] = sys.intern(data[key])
+    return data
+
+
+def as_score(value):
+    """
+    Convert a score value to int, or None if it is missing or not numeric
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreBreakdown:
+    """
+    Rubric scores reported by the lead scorer
+
+    Attributes:
+        total_score: Total out of 100
+        email_domain_score: Out of 20
+        company_fit_score: Out of 40
+        role_score: Out of 20
+        message_intent_score: Out of 20
+        qualification_status: Qualified / Needs Review / Unqualified
+        justifications: (score field, explanation) pairs
+    """
+    total_score: int = 0
+    email_domain_score: int = None
+    company_fit_score: int = None
+    role_score: int = None
+    message_intent_score: int = None
+    qualification_status: str = None
+    justifications: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a breakdown from the scoring task's fields
+
+        The total is summed from the components if the scorer omitted it.
+
+        Args:
+            data: Scoring task dictionary
+
+        Returns:
+            ScoreBreakdown: Score breakdown
+        """
+        components = {name: as_score(data.get(name)) for name in BREAKDOWN_FIELDS}
+        total = as_score(data.get('total_score'))
+        if total is None:
+            total = sum(value or 0 for value in components.values())
+        status = data.get('qualification_status')
+        justifications = tuple(
+            (name[:-len('_justification')] + '_score', str(text))
+            for name, text in data.items()
+            if name.endswith('_justification') and text
+        )
+        return cls(
+            total_score=total,
+            qualification_status=sys.intern(status) if isinstance(status, str) else None,
+            justifications=justifications,
+            **components
+        )
+
+    def components(self):
+        """
+        Return the component scores that the scorer reported
+        """
+        return {name: getattr(self, name) for name in BREAKDOWN_FIELDS if getattr(self, name) is not None}
+
+    def to_dict(self):
+        """
+        Return the scoring task fields, omitting those that were not reported
+        """
+        data = {'total_score': self.total_score}
+        data.update(self.components())
+        for name, text in self.justifications:
+            data[name[:-len('_score')] + '_justification'] = text
+        if self.qualification_status is not None:
+            data['qualification_status'] = self.qualification_status
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class QualificationResult:
+    """
+    Outcome of one lead qualification run
+
+    The crew's final answer is held once in `raw`; to_dict and to_record
+    reference it rather than copying it into several fields.
+
+    Attributes:
+        score: ScoreBreakdown from the scoring task
+        contact: Fields from the parse/structure task
+        company: Fields from the research task
+        recommendation: Fields from the recommendation task
+        raw: Final answer text of the crew
+        lead: The Lead that was qualified, when known
+    """
+    score: ScoreBreakdown = ScoreBreakdown()
+    contact: dict = field(default_factory=dict, compare=False)
+    company: dict = field(default_factory=dict, compare=False)
+    recommendation: dict = field(default_factory=dict, compare=False)
+    raw: str = ''
+    lead: Lead = None
+
+    @classmethod
+    def from_crew_output(cls, crew_output, lead=None):
+        """
+        Build a result from a crew run over the four qualification tasks
+
+        Args:
+            crew_output: CrewOutput whose tasks_output is in task order
+                (parse, research, score, recommendation)
+            lead: The Lead that was qualified
+
+        Returns:
+            QualificationResult: Typed result
+        """
+        outputs = list(getattr(crew_output, 'tasks_output', None) or [])
+        outputs += [None] * (4 - len(outputs))
+        return cls.from_stage_data(
+            task_output_data(outputs[0]),
+            task_output_data(outputs[1]),
+            task_output_data(outputs[2]),
+            task_output_data(outputs[3]),
+            raw=getattr(crew_output, 'raw', None) or str(crew_output),
+            lead=lead
+        )
+
+    @classmethod
+    def from_stage_data(cls, contact, company, score, recommendation, raw='', lead=None):
+        """
+        Build a result from the structured data of each stage, whichever
+        way each stage was produced
+
+        Args:
+            contact: Parse/structure stage fields
+            company: Research stage fields
+            score: Scoring stage fields
+            recommendation: Recommendation stage fields
+            raw: Final answer text
+            lead: The Lead that was qualified
+
+        Returns:
+            QualificationResult: Typed result
+        """
+        return cls(
+            contact=intern_labels(contact),
+            company=intern_labels(company),
+            score=ScoreBreakdown.from_dict(score),
+            recommendation=intern_labels(recommendation),
+            raw=raw,
+            lead=lead
+        )
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Rebuild a result from to_record() output
+
+        Args:
+            record: Dictionary produced by to_record or read from JSONL
+
+        Returns:
+            QualificationResult: Typed result
+        """
+        lead = record.get('lead')
+        return cls(
+            score=ScoreBreakdown.from_dict(record.get('score', {})),
+            contact=record.get('contact', {}),
+            company=record.get('company', {}),
+            recommendation=record.get('recommendation', {}),
+            raw=record.get('raw', ''),
+            lead=Lead.from_dict(lead) if lead else None
+        )
+
+    @property
+    def total_score(self):
+        """
+        Total rubric score
+        """
+        return self.score.total_score
+
+    @property
+    def qualification(self):
+        """
+        Qualification status reported by the scorer
+        """
+        return self.score.qualification_status or 'Unknown'
+
+    def to_dict(self):
+        """
+        Return the result in the dictionary shape used by the Streamlit app
+
+        Returns:
+            dict: score, qualification, score_breakdown, recommendations,
+                analysis_summary, contact_info and company_analysis
+        """
+        return {
+            'score': self.total_score,
+            'qualification': self.qualification,
+            'score_breakdown': self.score.components(),
+            'recommendations': dict(self.recommendation),
+            'analysis_summary': self.raw,
+            'contact_info': dict(self.contact),
+            'company_analysis': dict(self.company)
+        }
+
+    def to_record(self, include_raw=True):
+        """
+        Return a JSON-serializable record with every field stored once
+
+        Args:
+            include_raw: Include the final answer text
+
+        Returns:
+            dict: Record for to_json / dump_jsonl
+        """
+        record = {'score': self.score.to_dict()}
+        if self.lead is not None:
+            record['lead'] = self.lead.to_dict()
+        for name in ('contact', 'company', 'recommendation'):
+            value = getattr(self, name)
+            if value:
+                record[name] = value
+        if include_raw and self.raw:
+            record['raw'] = self.raw
+        return record
+
+    def to_json(self, include_raw=True):
+        """
+        Serialize the result as one compact line of JSON
+        """
+        return json.dumps(self.to_record(include_raw), separators=(',', ':'), ensure_ascii=False)
+
+    def __str__(self):
+        return self.raw
+
+
+def dump_jsonl(results, fp, include_raw=True):
+    """
+    Write results to a text file, one JSON record per line
+
+    Results are serialized one at a time, so a large batch never needs a
+    second in-memory copy.
+
+    Args:
+        results: Iterable of QualificationResult
+        fp: Writable text file
+        include_raw: Include each result's final answer text
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    for result in results:
+        fp.write(result.to_json(include_raw))
+        fp.write('\n')
+        count += 1
+    return count
+
+
+def load_jsonl(fp):
+    """
+    Read results written by dump_jsonl
+
+    Args:
+        fp: Readable text file
+
+    Yields:
+        QualificationResult: One result per non-empty line
+    """
+    for line in fp:
+        if line.strip():
+            yield QualificationResult.from_record(json.loads(line))
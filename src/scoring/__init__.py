@@ -0,0 +1,9 @@
+"""
+Local lead scoring
+
+The multi-team matrix scorer needs numpy; import it from src.scoring.matrix.
+"""
+
+from .rubric import DEFAULT_WEIGHTS, score_lead
+
+__all__ = ['DEFAULT_WEIGHTS', 'score_lead']
@@ -0,0 +1,143 @@
+"""
+Score many leads against many target configurations at once
+"""
+
+import numpy as np
+
+from src.scoring.rubric import (
+    classify_company_size,
+    match_industry,
+    match_region,
+    rubric_points,
+    score_lead_signals
+)
+
+
+def team_configs(target_configs):
+    """
+    Split target configurations into team names and configs
+
+    Args:
+        target_configs: Mapping of team name to target config, or a list of
+            target configs (teams are then named by position)
+
+    Returns:
+        tuple: (list of names, list of configs)
+    """
+    if isinstance(target_configs, dict):
+        return list(target_configs.keys()), list(target_configs.values())
+    return list(range(len(target_configs))), list(target_configs)
+
+
+def match_matrix(values, vocabulary, matches):
+    """
+    Build an N x V boolean matrix of which vocabulary entries each value matches
+
+    Each distinct value is matched once, so repeated industries or
+    locations across leads cost a dictionary lookup.
+
+    Args:
+        values: One researched value per lead
+        vocabulary: Target entries (industries, sizes or regions)
+        matches: Function (value, entry) -> bool
+
+    Returns:
+        numpy.ndarray: Boolean matrix
+    """
+    table = np.zeros((len(values), len(vocabulary)), dtype=bool)
+    rows = {}
+    for index, value in enumerate(values):
+        key = value if isinstance(value, str) or value is None else str(value)
+        if key not in rows:
+            rows[key] = [bool(matches(value, entry)) for entry in vocabulary]
+        table[index] = rows[key]
+    return table
+
+
+def target_matrix(configs, field, vocabulary):
+    """
+    Build a V x M matrix with a 1 where a team targets a vocabulary entry
+    """
+    index = {entry: position for position, entry in enumerate(vocabulary)}
+    table = np.zeros((len(vocabulary), len(configs)), dtype=np.float32)
+    for column, config in enumerate(configs):
+        for entry in config[field]:
+            table[index[entry], column] = 1.0
+    return table
+
+
+def vocabulary_for(configs, field):
+    """
+    Return the distinct entries of one target field across all teams, in first-seen order
+    """
+    return list(dict.fromkeys(entry for config in configs for entry in config[field]))
+
+
+def fit_matrix(values, configs, field, matches):
+    """
+    Return an N x M 0/1 matrix: does lead n match any of team m's entries
+    """
+    vocabulary = vocabulary_for(configs, field)
+    if not vocabulary:
+        return np.zeros((len(values), len(configs)), dtype=np.float32)
+    hits = match_matrix(values, vocabulary, matches).astype(np.float32)
+    return np.minimum(hits @ target_matrix(configs, field, vocabulary), 1.0)
+
+
+def score_lead_matrix(leads, contacts, companies, target_configs, weights=None):
+    """
+    Score N leads against M target configurations with the rubric
+
+    The email domain, role and intent lines do not depend on the target,
+    so they are scored once per lead. Industry, size and region matches
+    become N x V lead-to-entry and V x M entry-to-team matrices, and their
+    product gives the company fit for every lead/team pair in one step.
+
+    Args:
+        leads: List of Lead objects
+        contacts: Parse-stage fields per lead
+        companies: Research-stage fields per lead
+        target_configs: Mapping of team name to target config, or a list of configs
+        weights: Points per rubric line; see DEFAULT_WEIGHTS
+
+    Returns:
+        dict: 'teams' (M names), 'scores' (N x M int array of 0-100 totals),
+            'company_fit' (N x M int array of fit points), 'best_team'
+            (best-fit team name per lead) and 'best_score' (its total)
+    """
+    names, configs = team_configs(target_configs)
+    if not configs:
+        raise ValueError("At least one target configuration is required")
+    points = rubric_points(weights)
+
+    signals = [score_lead_signals(lead, contact or {}, company or {}, points)
+               for lead, contact, company in zip(leads, contacts, companies)]
+    base = np.array([sum(score for score, _ in signal.values()) for signal in signals],
+                    dtype=np.float32).reshape(-1, 1)
+
+    industries = [(company or {}).get('industry') for company in companies]
+    sizes = [classify_company_size((company or {}).get('company_size')) for company in companies]
+    locations = [(company or {}).get('location') for company in companies]
+
+    fit = (
+        points['industry'] * fit_matrix(industries, configs, 'industries',
+                                        lambda value, entry: match_industry(value, [entry]))
+        + points['company_size'] * fit_matrix(sizes, configs, 'company_sizes',
+                                              lambda value, entry: value == entry)
+        + points['region'] * fit_matrix(locations, configs, 'regions',
+                                        lambda value, entry: match_region(value, [entry]))
+    )
+
+    maximum = sum(points.values())
+    scores = np.rint(100.0 * (base + fit) / maximum) if maximum else np.zeros_like(fit)
+    scores = scores.astype(np.int32)
+
+    # argmax picks the first team on ties, i.e. the order teams were given in
+    best = scores.argmax(axis=1)
+    return {
+        'teams': names,
+        'scores': scores,
+        'company_fit': fit.astype(np.int32),
+        'best_team': [names[column] for column in best],
+        'best_score': scores[np.arange(len(best)), best]
+    }
@@ -0,0 +1,310 @@
+"""
+Deterministic implementation of the 100-point lead scoring rubric
+"""
+
+import re
+
+from src.scoring.seniority import SENIORITY_POINTS, title_seniority
+from src.utils.domain_index import PERSONAL_CATEGORIES, get_domain_index
+
+
+# Points per rubric line. Company fit is industry + company size + region.
+DEFAULT_WEIGHTS = {
+    'email_domain': 20,
+    'industry': 20,
+    'company_size': 10,
+    'region': 10,
+    'role': 20,
+    'message_intent': 20
+}
+
+# Score bands used for qualification_status (same as the app's priority bands)
+QUALIFIED_THRESHOLD = 80
+REVIEW_THRESHOLD = 50
+
+# Values the parser uses when a field is unknown
+EMPTY_VALUES = frozenset(['', 'unknown', 'not provided', 'not mentioned', 'n/a', 'na', 'none', 'null'])
+
+SPAM_PATTERN = re.compile(
+    r'\b(unsubscribe|lottery|winner|crypto|bitcoin|seo services|backlinks?|guest post|click here|'
+    r'casino|loan offer|work from home)\b',
+    re.IGNORECASE
+)
+SPECIFIC_INTENT_PATTERN = re.compile(
+    r'\b(pricing|price|quote|quotation|demo|trial|pilot|purchase|buy|budget|timeline|'
+    r'implement\w*|integrat\w*|evaluat\w*|proposal|contract|licen[cs]\w*|rollout|roll out|'
+    r'migrat\w*|deploy\w*|seats|onboard\w*|rfp)\b',
+    re.IGNORECASE
+)
+
+SIZE_LABELS = ('Startup (1-50)', 'SMB (51-500)', 'Enterprise (500+)')
+SIZE_KEYWORDS = (
+    ('Startup (1-50)', ('startup', 'start-up', 'small business', 'early stage')),
+    ('SMB (51-500)', ('smb', 'mid-size', 'midsize', 'mid-market', 'medium')),
+    ('Enterprise (500+)', ('enterprise', 'large', 'multinational', 'fortune')),
+)
+HEADCOUNT_PATTERN = re.compile(r'(\d[\d,]*)\+?\s*(?:employees|staff|people|headcount)', re.IGNORECASE)
+
+# Location keywords per sidebar region; region names themselves also match
+REGION_KEYWORDS = {
+    'North America': ('usa', 'u.s.', 'united states', 'north america', 'canada', 'new york', 'california',
+                      'san francisco', 'texas', 'boston', 'seattle', 'chicago', 'toronto', 'vancouver'),
+    'Europe': ('uk', 'united kingdom', 'england', 'london', 'germany', 'berlin', 'france', 'paris',
+               'spain', 'italy', 'netherlands', 'amsterdam', 'ireland', 'dublin', 'sweden', 'switzerland',
+               'poland', 'belgium', 'denmark', 'norway', 'finland', 'austria', 'portugal', 'eu'),
+    'Asia Pacific': ('apac', 'india', 'bangalore', 'mumbai', 'china', 'japan', 'tokyo', 'singapore',
+                     'australia', 'sydney', 'new zealand', 'korea', 'indonesia', 'malaysia',
+                     'philippines', 'vietnam', 'thailand', 'hong kong', 'asia'),
+    'Latin America': ('latam', 'brazil', 'mexico', 'argentina', 'chile', 'colombia', 'peru',
+                      'south america', 'sao paulo'),
+    'Middle East & Africa': ('mea', 'emea', 'uae', 'dubai', 'abu dhabi', 'saudi', 'qatar', 'israel',
+                             'egypt', 'africa', 'nigeria', 'kenya', 'south africa', 'middle east'),
+}
+
+
+def clean_value(value):
+    """
+    Return a stripped string, or '' if the value means "unknown"
+    """
+    if value is None:
+        return ''
+    text = str(value).strip()
+    return '' if text.lower() in EMPTY_VALUES else text
+
+
+def contains_word(text, word):
+    """
+    Case-insensitive whole-word search
+    """
+    return re.search(r'(?<![a-z])' + re.escape(word) + r'(?![a-z])', text.lower()) is not None
+
+
+def classify_company_size(value):
+    """
+    Map a researched company size to one of the sidebar size labels
+
+    Args:
+        value: Free-text size such as "SMB (51-500)" or "about 2,000 employees"
+
+    Returns:
+        str: Size label, or None if it cannot be determined
+    """
+    text = clean_value(value)
+    if not text:
+        return None
+    lowered = text.lower()
+    for label in SIZE_LABELS:
+        if lowered.startswith(label.split(' ')[0].lower()):
+            return label
+    for label, keywords in SIZE_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return label
+    headcount = HEADCOUNT_PATTERN.search(text)
+    if headcount:
+        headcount = int(headcount.group(1).replace(',', ''))
+        if headcount <= 50:
+            return SIZE_LABELS[0]
+        if headcount <= 500:
+            return SIZE_LABELS[1]
+        return SIZE_LABELS[2]
+    return None
+
+
+def match_region(location, regions):
+    """
+    Return the first target region that a researched location falls in
+
+    Args:
+        location: Free-text location
+        regions: Target region names
+
+    Returns:
+        str: Matching region, or None
+    """
+    text = clean_value(location)
+    if not text:
+        return None
+    for region in regions:
+        if region.lower() in text.lower():
+            return region
+        if any(contains_word(text, keyword) for keyword in REGION_KEYWORDS.get(region, ())):
+            return region
+    return None
+
+
+def match_industry(industry, industries):
+    """
+    Return the first target industry named by a researched industry
+    """
+    text = clean_value(industry).lower()
+    if not text:
+        return None
+    for target in industries:
+        if target.lower() in text or text in target.lower():
+            return target
+    return None
+
+
+def score_email_domain(email, contact, company, points):
+    """
+    Business domain: full points; generic domain with a named company: half;
+    disposable domain or generic domain alone: 0
+    """
+    domain = clean_value(contact.get('domain')) or email.rsplit('@', 1)[-1]
+    domain = domain.lower().lstrip('@')
+    category = get_domain_index().classify(domain)
+    if category == 'disposable':
+        return 0, f'Disposable email domain ({domain})'
+    domain_types = (clean_value(contact.get('domain_type')).lower(), clean_value(company.get('domain_type')).lower())
+    personal = category in PERSONAL_CATEGORIES or 'personal' in domain_types
+
+    if not personal and domain:
+        return points, f'Business email domain ({domain})'
+    if clean_value(contact.get('company_name')):
+        return points // 2, f'Generic email domain ({domain}) but company mentioned'
+    return 0, f'Generic email domain ({domain}) with no company'
+
+
+def score_role(designation, points, seniority=None):
+    """
+    Senior decision maker: full points; manager/senior contributor: half;
+    otherwise 0 (see src.scoring.seniority)
+
+    Args:
+        designation: Job title
+        points: Points for the role line
+        seniority: Seniority bucket already extracted for the title, if any
+    """
+    if not designation:
+        return 0, 'No clear role'
+    if seniority not in SENIORITY_POINTS:
+        seniority = title_seniority(designation)
+    if seniority == 'Junior':
+        return 0, f'Junior role ({designation})'
+    share = SENIORITY_POINTS.get(seniority, 0.0)
+    if share >= 1:
+        return points, f'Senior decision maker ({designation})'
+    if share > 0:
+        return int(points * share), f'Mid-level role ({designation})'
+    return 0, f'Role without decision authority ({designation})'
+
+
+def score_message_intent(intent, message, points):
+    """
+    Specific need: full points; general inquiry: half; vague or spam-like: 0
+    """
+    text = f'{intent} {message}'.strip()
+    if not text or SPAM_PATTERN.search(text):
+        return 0, 'Vague or spam-like message'
+    if SPECIFIC_INTENT_PATTERN.search(text):
+        return points, 'Specific interest with a clear need'
+    if len(message.split()) >= 8 or intent:
+        return points // 2, 'General inquiry'
+    return 0, 'Vague message'
+
+
+def rubric_points(weights=None):
+    """
+    Return the points per rubric line, filling missing keys from DEFAULT_WEIGHTS
+    """
+    points = dict(DEFAULT_WEIGHTS)
+    points.update(weights or {})
+    return points
+
+
+def score_lead_signals(lead, contact, company, points):
+    """
+    Score the rubric lines that do not depend on the target configuration
+
+    Args:
+        lead: Lead being scored
+        contact: Fields from the parse/structure task
+        company: Fields from the research task
+        points: Points per rubric line from rubric_points
+
+    Returns:
+        dict: (score, justification) for 'email_domain', 'role' and 'message_intent'
+    """
+    designation = clean_value(contact.get('designation')) or clean_value(lead.designation)
+    message = f'{lead.subject} {lead.content}'.strip()
+    return {
+        'email_domain': score_email_domain(lead.email, contact, company, points['email_domain']),
+        'role': score_role(designation, points['role'], contact.get('seniority')),
+        'message_intent': score_message_intent(clean_value(contact.get('intent')), message,
+                                               points['message_intent'])
+    }
+
+
+def qualification_status(total):
+    """
+    Map a 0-100 total to Qualified / Needs Review / Unqualified
+    """
+    if total >= QUALIFIED_THRESHOLD:
+        return 'Qualified'
+    if total >= REVIEW_THRESHOLD:
+        return 'Needs Review'
+    return 'Unqualified'
+
+
+def score_lead(lead, contact, company, target_config, weights=None):
+    """
+    Apply the 100-point rubric to a lead's parsed and researched fields
+
+    Args:
+        lead: Lead being scored (supplies the email, designation and message)
+        contact: Fields from the parse/structure task
+        company: Fields from the research task
+        target_config: Target criteria with 'industries', 'company_sizes' and 'regions'
+        weights: Points per rubric line; missing keys use DEFAULT_WEIGHTS
+
+    Returns:
+        dict: Fields in the scoring task's output format (total_score,
+            component scores, justifications and qualification_status)
+    """
+    points = rubric_points(weights)
+    contact = contact or {}
+    company = company or {}
+    signals = score_lead_signals(lead, contact, company, points)
+    email_score, email_reason = signals['email_domain']
+    role_score, role_reason = signals['role']
+    intent_score, intent_reason = signals['message_intent']
+
+    fit_score = 0
+    fit_reasons = []
+    industry = match_industry(company.get('industry'), target_config['industries'])
+    if industry:
+        fit_score += points['industry']
+        fit_reasons.append(f'industry matches {industry}')
+    else:
+        fit_reasons.append(f"industry {clean_value(company.get('industry')) or 'unknown'} not targeted")
+    size = classify_company_size(company.get('company_size'))
+    if size and size in target_config['company_sizes']:
+        fit_score += points['company_size']
+        fit_reasons.append(f'size matches {size}')
+    else:
+        fit_reasons.append(f"size {size or 'unknown'} not targeted")
+    region = match_region(company.get('location'), target_config['regions'])
+    if region:
+        fit_score += points['region']
+        fit_reasons.append(f'location in {region}')
+    else:
+        fit_reasons.append(f"location {clean_value(company.get('location')) or 'unknown'} not targeted")
+
+    fit_reason = '; '.join(fit_reasons)
+
+    maximum = sum(points.values())
+    raw_total = email_score + fit_score + role_score + intent_score
+    total = round(100 * raw_total / maximum) if maximum else 0
+
+    return {
+        'total_score': total,
+        'email_domain_score': email_score,
+        'email_domain_justification': email_reason,
+        'company_fit_score': fit_score,
+        'company_fit_justification': fit_reason[:1].upper() + fit_reason[1:],
+        'role_score': role_score,
+        'role_justification': role_reason,
+        'message_intent_score': intent_score,
+        'message_intent_justification': intent_reason,
+        'qualification_status': qualification_status(total)
+    }
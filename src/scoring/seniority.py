@@ -0,0 +1,75 @@
+"""
+Job-title seniority lexicon shared by extraction and scoring
+"""
+
+import re
+
+
+# Abbreviations expanded before a title is bucketed and shown
+TITLE_ABBREVIATIONS = {
+    'vp': 'VP', 'svp': 'SVP', 'evp': 'EVP', 'avp': 'AVP', 'sr': 'Senior', 'jr': 'Junior',
+    'mgr': 'Manager', 'dir': 'Director', 'eng': 'Engineering', 'engg': 'Engineering',
+    'mktg': 'Marketing', 'ops': 'Operations', 'bd': 'Business Development', 'biz': 'Business',
+    'dev': 'Development', 'it': 'IT', 'hr': 'HR', 'qa': 'QA', 'r&d': 'R&D', 'gm': 'General Manager',
+    'ceo': 'CEO', 'cto': 'CTO', 'cfo': 'CFO', 'coo': 'COO', 'cmo': 'CMO', 'cio': 'CIO',
+    'ciso': 'CISO', 'cpo': 'CPO', 'cro': 'CRO', 'of': 'of', 'and': 'and'
+}
+
+# (seniority bucket, pattern) checked in order against the expanded title
+SENIORITY_LEVELS = (
+    ('Junior', re.compile(r'\b(intern|internship|trainee|student|junior|graduate)\b', re.IGNORECASE)),
+    ('VP', re.compile(r'\b(vp|svp|evp|avp|vice president)\b', re.IGNORECASE)),
+    ('C-level', re.compile(r'\b(ceo|cto|cfo|coo|cmo|cio|ciso|cpo|cro|chief|founder|co-founder|cofounder|'
+                           r'president|owner|managing partner)\b', re.IGNORECASE)),
+    ('Director', re.compile(r'\b(director|head of|head|general manager|partner)\b', re.IGNORECASE)),
+    ('Manager', re.compile(r'\b(manager|lead|leader|supervisor)\b', re.IGNORECASE)),
+    ('Senior contributor', re.compile(r'\b(senior|principal|architect|specialist|consultant)\b',
+                                      re.IGNORECASE)),
+    ('Individual contributor', re.compile(
+        r'\b(engineer|developer|analyst|scientist|designer|associate|coordinator|administrator|'
+        r'representative|accountant|officer|executive)\b', re.IGNORECASE)),
+)
+
+# Share of the rubric's role points earned by each bucket
+SENIORITY_POINTS = {
+    'C-level': 1.0,
+    'VP': 1.0,
+    'Director': 1.0,
+    'Manager': 0.5,
+    'Senior contributor': 0.5,
+    'Individual contributor': 0.0,
+    'Junior': 0.0
+}
+
+
+def normalize_title(title):
+    """
+    Expand abbreviations in a job title, e.g. 'VP Eng' -> 'VP Engineering'
+    """
+    words = []
+    for word in re.split(r'\s+', title.strip(' .,;:|')):
+        key = word.lower().rstrip('.,')
+        if key in TITLE_ABBREVIATIONS:
+            words.append(TITLE_ABBREVIATIONS[key] + (',' if word.endswith(',') else ''))
+        elif word.isupper() or not word.islower():
+            words.append(word)
+        else:
+            words.append(word.capitalize())
+    return ' '.join(word for word in words if word)
+
+
+def title_seniority(title):
+    """
+    Bucket a job title into a seniority level
+
+    Args:
+        title: Job title, abbreviated or not
+
+    Returns:
+        str: Seniority bucket, or None if the title is not recognised
+    """
+    expanded = normalize_title(title or '')
+    for level, pattern in SENIORITY_LEVELS:
+        if pattern.search(expanded):
+            return level
+    return None
@@ -2,6 +2,20 @@
 CrewAI Tasks for Lead Qualification
 """
 
-from .lead_tasks import create_email_tasks, create_form_tasks
+from .lead_tasks import (
+    create_email_tasks,
+    create_form_tasks,
+    create_email_task_templates,
+    create_form_task_templates,
+    email_task_inputs,
+    form_task_inputs
+)
 
-__all__ = ['create_email_tasks', 'create_form_tasks']
+__all__ = [
+    'create_email_tasks',
+    'create_form_tasks',
+    'create_email_task_templates',
+    'create_form_task_templates',
+    'email_task_inputs',
+    'form_task_inputs'
+]
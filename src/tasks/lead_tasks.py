@@ -2,97 +2,81 @@
 Define all CrewAI tasks for lead qualification workflows
 """
 
+import re
+
 from crewai import Task
 
+from src.tasks.schemas import ParsedLead, CompanyResearch, LeadScore, Recommendation
+from src.utils.domain_index import get_domain_index
 
-def create_email_tasks(agents, sender_email, email_subject, email_content, target_config):
-    """
-    Create tasks for email-based lead qualification
-    
-    Args:
-        agents: Dictionary of agent instances
-        sender_email: Email address
-        email_subject: Email subject line
-        email_content: Full email content
-        target_config: Target criteria configuration
-        
-    Returns:
-        list: List of Task instances
-    """
-    
-    parse_task = Task(
-        description=f"""
+
+# Task descriptions use {name} placeholders. JSON examples keep single braces,
+# which CrewAI's input interpolation and fill_placeholders both leave untouched.
+PLACEHOLDER_PATTERN = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+EMAIL_PARSE_DESCRIPTION = """
         Extract the following information from this email:
         - Sender Email: {sender_email}
         - Subject: {email_subject}
         - Content: {email_content}
-        
+
         Extract and return in JSON format:
-        {{
+        {
             "sender_name": "Full name if found",
             "company_name": "Company name if mentioned or inferred",
             "designation": "Job title if mentioned",
             "domain": "Email domain",
             "intent": "Main purpose of the email"
-        }}
-        """,
-        agent=agents['email_parser'],
-        expected_output='JSON object with sender_name, company_name, designation, domain, and intent'
-    )
-    
-    research_task = Task(
-        description=f"""
-        Based on the parsed email information, research and infer company details.
-        
+        }
+        """
+
+EMAIL_RESEARCH_DESCRIPTION = """
+        Based on {research_source}, research and infer company details.
+
         Return in JSON format:
-        {{
+        {
             "industry": "One of: Technology, Healthcare, Finance, Manufacturing, Retail, Education, Consulting, Real Estate, Other",
             "company_size": "One of: Startup (1-50), SMB (51-500), Enterprise (500+)",
             "location": "Geographic region",
             "domain_type": "business or personal"
-        }}
-        
-        If the email domain is generic (gmail, yahoo, hotmail, outlook), set domain_type to "personal"
-        and note that company information may be limited.
-        """,
-        agent=agents['company_researcher'],
-        expected_output='JSON with industry, company_size, location, and domain_type',
-        context=[parse_task]
-    )
-    
-    score_task = Task(
-        description=f"""
+        }
+
+        The sender's domain "{sender_domain}" is classified as {domain_type}; use that as domain_type.
+        If it is personal, note that company information may be limited.
+        """
+
+EMAIL_SCORE_DESCRIPTION = """
         Score this lead using the following rubric (100 points total):
-        
+
         Target Criteria:
-        - Target Industries: {', '.join(target_config['industries'])}
-        - Target Company Sizes: {', '.join(target_config['company_sizes'])}
-        - Target Regions: {', '.join(target_config['regions'])}
-        
+        - Target Industries: {target_industries}
+        - Target Company Sizes: {target_company_sizes}
+        - Target Regions: {target_regions}
+
         Scoring Rubric:
-        
+
         1. Email Domain Score (20 points):
            - Business email domain: 20 points
            - Generic email but company mentioned: 10 points
            - Generic email only: 0 points
-        
+
         2. Company Fit Score (40 points):
            - Industry matches target: 20 points
            - Company size matches target: 10 points
            - Location matches target region: 10 points
-        
+
         3. Contact Role Score (20 points):
            - C-level, VP, Director: 20 points
            - Manager, Lead, Specialist: 10 points
            - No clear role or junior: 0 points
-        
+
         4. Message Intent Score (20 points):
            - Specific interest with clear need: 20 points
            - General inquiry: 10 points
            - Vague or spam-like: 0 points
-        
+
         Return in JSON format:
-        {{
+        {
             "total_score": 0-100,
             "email_domain_score": 0-20,
             "email_domain_justification": "explanation",
@@ -103,111 +87,401 @@ def create_email_tasks(agents, sender_email, email_subject, email_content, targe
             "message_intent_score": 0-20,
             "message_intent_justification": "explanation",
             "qualification_status": "Qualified/Needs Review/Unqualified"
-        }}
-        """,
-        agent=agents['lead_scorer'],
-        expected_output='JSON with total_score, breakdown, and qualification_status',
-        context=[parse_task, research_task]
-    )
-    
-    recommendation_task = Task(
-        description=f"""
+        }
+        """
+
+EMAIL_RECOMMENDATION_DESCRIPTION = """
         Based on the lead score and analysis, provide recommendations.
-        
+
         Return in JSON format:
-        {{
+        {
             "next_action": "Forward to Sales / Manual Review / Disqualify",
             "priority": "High / Medium / Low",
             "reasoning": "Detailed explanation",
             "talking_points": ["point 1", "point 2"],
             "concerns": ["concern 1", "concern 2"]
-        }}
-        """,
+        }
+        """
+
+FORM_STRUCTURE_DESCRIPTION = """
+        Structure the following form submission data:
+        - Name: {name}
+        - Company: {company}
+        - Designation: {designation}
+        - Email: {email}
+        - Query: {query}
+
+        Extract and return in JSON format:
+        {
+            "sender_name": "{name}",
+            "company_name": "{company}",
+            "designation": "{designation}",
+            "email": "{email}",
+            "domain": "{email_domain}",
+            "domain_type": "{domain_type}",
+            "intent": "classified intent from query"
+        }
+        """
+
+FORM_RESEARCH_DESCRIPTION = """
+        Based on company name "{company}" and email domain "{email_domain}", infer company details.
+
+        Return in JSON format with industry, company_size, location, and any additional insights.
+        """
+
+FORM_SCORE_DESCRIPTION = """
+        Score this lead using the 100-point rubric.
+
+        Target Criteria:
+        - Target Industries: {target_industries}
+        - Target Company Sizes: {target_company_sizes}
+        - Target Regions: {target_regions}
+
+        Return complete scoring breakdown in JSON format.
+        """
+
+FORM_RECOMMENDATION_DESCRIPTION = """
+        Provide actionable recommendations based on the qualification score.
+
+        Return in JSON format with next_action, priority, reasoning, and specific recommendations.
+        """
+
+
+KNOWN_CONTACT_CONTEXT = """
+        Contact information already extracted for this lead:
+        {known_contact}
+        """
+
+
+# The 100-point rubric in a few lines, for prompts that cover several stages or leads
+RUBRIC_SUMMARY = """Scoring Rubric (100 points total):
+        1. Email Domain (20): business domain 20; generic with company mentioned 10; generic only 0
+        2. Company Fit (40): industry matches 20; company size matches 10; location in a target region 10
+        3. Contact Role (20): C-level, VP, Director 20; Manager, Lead, Specialist 10; none or junior 0
+        4. Message Intent (20): specific interest with clear need 20; general inquiry 10; vague or spam 0
+        qualification_status: Qualified (80+), Needs Review (50-79), Unqualified (below 50)"""
+
+
+def fill_placeholders(template, values):
+    """
+    Replace {name} placeholders that have a value, leaving JSON braces and
+    unknown placeholders untouched
+
+    Args:
+        template: Template string
+        values: Dictionary of placeholder values
+
+    Returns:
+        str: Filled template
+    """
+    def replace(match):
+        name = match.group(1)
+        return str(values[name]) if name in values else match.group(0)
+
+    return PLACEHOLDER_PATTERN.sub(replace, template)
+
+
+def target_config_inputs(target_config):
+    """
+    Build placeholder values for the target criteria
+
+    Args:
+        target_config: Target criteria configuration
+
+    Returns:
+        dict: Placeholder values
+    """
+    return {
+        'target_industries': ', '.join(target_config['industries']),
+        'target_company_sizes': ', '.join(target_config['company_sizes']),
+        'target_regions': ', '.join(target_config['regions'])
+    }
+
+
+def email_task_inputs(sender_email, email_subject, email_content):
+    """
+    Build the per-lead inputs for the email task templates
+
+    Args:
+        sender_email: Email address
+        email_subject: Email subject line
+        email_content: Full email content
+
+    Returns:
+        dict: Inputs for Crew.kickoff(inputs=...)
+    """
+    sender_domain = sender_email.split('@')[-1].strip().lower()
+    return {
+        'sender_email': sender_email,
+        'email_subject': email_subject,
+        'email_content': email_content,
+        'sender_domain': sender_domain,
+        'domain_type': get_domain_index().domain_type(sender_domain)
+    }
+
+
+def form_task_inputs(name, company, designation, email, query):
+    """
+    Build the per-lead inputs for the form task templates
+
+    Args:
+        name: Contact name
+        company: Company name
+        designation: Job title
+        email: Email address
+        query: Message/query
+
+    Returns:
+        dict: Inputs for Crew.kickoff(inputs=...)
+    """
+    return {
+        'name': name,
+        'company': company,
+        'designation': designation or 'Not provided',
+        'email': email,
+        'email_domain': email.split('@')[-1],
+        'domain_type': get_domain_index().domain_type(email.split('@')[-1].strip().lower()),
+        'query': query
+    }
+
+
+def build_email_tasks(agents, values, speculative_research=False):
+    """
+    Build the email task graph, filling whichever placeholders have values
+
+    Args:
+        agents: Dictionary of agent instances
+        values: Placeholder values
+        speculative_research: Run research without waiting for the parse task
+
+    Returns:
+        list: List of Task instances
+    """
+    parse_task = Task(
+        description=fill_placeholders(EMAIL_PARSE_DESCRIPTION, values),
+        agent=agents['email_parser'],
+        expected_output='JSON object with sender_name, company_name, designation, domain, and intent',
+        output_pydantic=ParsedLead
+    )
+
+    research_task = Task(
+        description=fill_placeholders(EMAIL_RESEARCH_DESCRIPTION, values),
+        agent=agents['company_researcher'],
+        expected_output='JSON with industry, company_size, location, and domain_type',
+        output_pydantic=CompanyResearch,
+        context=[] if speculative_research else [parse_task]
+    )
+
+    score_task = Task(
+        description=fill_placeholders(EMAIL_SCORE_DESCRIPTION, values),
+        agent=agents['lead_scorer'],
+        expected_output='JSON with total_score, breakdown, and qualification_status',
+        output_pydantic=LeadScore,
+        context=[parse_task, research_task]
+    )
+
+    recommendation_task = Task(
+        description=fill_placeholders(EMAIL_RECOMMENDATION_DESCRIPTION, values),
         agent=agents['recommendation_agent'],
         expected_output='JSON with next_action, priority, reasoning, talking_points, and concerns',
+        output_pydantic=Recommendation,
         context=[parse_task, research_task, score_task]
     )
-    
+
     return [parse_task, research_task, score_task, recommendation_task]
 
 
-def create_form_tasks(agents, name, company, designation, email, query, target_config):
+def build_form_tasks(agents, values, speculative_research=False):
     """
-    Create tasks for form-based lead qualification
-    
+    Build the form task graph, filling whichever placeholders have values
+
     Args:
         agents: Dictionary of agent instances
-        name: Contact name
-        company: Company name
-        designation: Job title
-        email: Email address
-        query: Message/query
-        target_config: Target criteria configuration
-        
+        values: Placeholder values
+        speculative_research: Run research without waiting for the structure task
+
     Returns:
         list: List of Task instances
     """
-    
     structure_task = Task(
-        description=f"""
-        Structure the following form submission data:
-        - Name: {name}
-        - Company: {company}
-        - Designation: {designation or 'Not provided'}
-        - Email: {email}
-        - Query: {query}
-        
-        Extract and return in JSON format:
-        {{
-            "sender_name": "{name}",
-            "company_name": "{company}",
-            "designation": "{designation or 'Not provided'}",
-            "email": "{email}",
-            "domain": "extracted domain",
-            "domain_type": "business or personal",
-            "intent": "classified intent from query"
-        }}
-        """,
+        description=fill_placeholders(FORM_STRUCTURE_DESCRIPTION, values),
         agent=agents['email_parser'],
-        expected_output='JSON with structured form data and analysis'
+        expected_output='JSON with structured form data and analysis',
+        output_pydantic=ParsedLead
     )
-    
+
     research_task = Task(
-        description=f"""
-        Based on company name "{company}" and email domain, infer company details.
-        
-        Return in JSON format with industry, company_size, location, and any additional insights.
-        """,
+        description=fill_placeholders(FORM_RESEARCH_DESCRIPTION, values),
         agent=agents['company_researcher'],
         expected_output='JSON with company intelligence',
-        context=[structure_task]
+        output_pydantic=CompanyResearch,
+        context=[] if speculative_research else [structure_task]
     )
-    
+
     score_task = Task(
-        description=f"""
-        Score this lead using the 100-point rubric.
-        
-        Target Criteria:
-        - Target Industries: {', '.join(target_config['industries'])}
-        - Target Company Sizes: {', '.join(target_config['company_sizes'])}
-        - Target Regions: {', '.join(target_config['regions'])}
-        
-        Return complete scoring breakdown in JSON format.
-        """,
+        description=fill_placeholders(FORM_SCORE_DESCRIPTION, values),
         agent=agents['lead_scorer'],
         expected_output='JSON with complete scoring breakdown',
+        output_pydantic=LeadScore,
         context=[structure_task, research_task]
     )
-    
+
     recommendation_task = Task(
-        description=f"""
-        Provide actionable recommendations based on the qualification score.
-        
-        Return in JSON format with next_action, priority, reasoning, and specific recommendations.
-        """,
+        description=fill_placeholders(FORM_RECOMMENDATION_DESCRIPTION, values),
         agent=agents['recommendation_agent'],
         expected_output='JSON with recommendations',
+        output_pydantic=Recommendation,
         context=[structure_task, research_task, score_task]
     )
-    
+
     return [structure_task, research_task, score_task, recommendation_task]
+
+
+def build_known_contact_tasks(agents, kind, values):
+    """
+    Build the research, scoring and recommendation tasks for a lead whose
+    contact was extracted without the LLM
+
+    The contact is part of each task's description instead of the output
+    of a parse task.
+
+    Args:
+        agents: Dictionary of agent instances
+        kind: 'email' or 'form'
+        values: Placeholder values
+
+    Returns:
+        list: List of Task instances
+    """
+    if kind == 'email':
+        values = dict(values, research_source='the extracted contact information')
+        descriptions = (EMAIL_RESEARCH_DESCRIPTION, EMAIL_SCORE_DESCRIPTION, EMAIL_RECOMMENDATION_DESCRIPTION)
+    else:
+        descriptions = (FORM_RESEARCH_DESCRIPTION, FORM_SCORE_DESCRIPTION, FORM_RECOMMENDATION_DESCRIPTION)
+    research, score, recommendation = (
+        fill_placeholders(description + KNOWN_CONTACT_CONTEXT, values) for description in descriptions
+    )
+
+    research_task = Task(
+        description=research,
+        agent=agents['company_researcher'],
+        expected_output='JSON with industry, company_size, location, and domain_type',
+        output_pydantic=CompanyResearch
+    )
+
+    score_task = Task(
+        description=score,
+        agent=agents['lead_scorer'],
+        expected_output='JSON with total_score, breakdown, and qualification_status',
+        output_pydantic=LeadScore,
+        context=[research_task]
+    )
+
+    recommendation_task = Task(
+        description=recommendation,
+        agent=agents['recommendation_agent'],
+        expected_output='JSON with next_action, priority, reasoning, talking_points, and concerns',
+        output_pydantic=Recommendation,
+        context=[research_task, score_task]
+    )
+
+    return [research_task, score_task, recommendation_task]
+
+
+def create_email_tasks(agents, sender_email, email_subject, email_content, target_config,
+                       speculative_research=False):
+    """
+    Create tasks for email-based lead qualification
+
+    Args:
+        agents: Dictionary of agent instances
+        sender_email: Email address
+        email_subject: Email subject line
+        email_content: Full email content
+        target_config: Target criteria configuration
+        speculative_research: Research from the sender's domain without
+            waiting for the parse task, so both can run concurrently
+
+    Returns:
+        list: List of Task instances
+    """
+    values = target_config_inputs(target_config)
+    values.update(email_task_inputs(sender_email, email_subject, email_content))
+
+    sender_domain = sender_email.split('@')[-1]
+    if speculative_research:
+        values['research_source'] = f'the sender\'s email domain "{sender_domain}" and subject "{email_subject}"'
+    else:
+        values['research_source'] = 'the parsed email information'
+
+    return build_email_tasks(agents, values, speculative_research=speculative_research)
+
+
+def create_form_tasks(agents, name, company, designation, email, query, target_config,
+                      speculative_research=False):
+    """
+    Create tasks for form-based lead qualification
+
+    Args:
+        agents: Dictionary of agent instances
+        name: Contact name
+        company: Company name
+        designation: Job title
+        email: Email address
+        query: Message/query
+        target_config: Target criteria configuration
+        speculative_research: Research from the submitted company name and
+            email domain without waiting for the structure task
+
+    Returns:
+        list: List of Task instances
+    """
+    values = target_config_inputs(target_config)
+    values.update(form_task_inputs(name, company, designation, email, query))
+
+    return build_form_tasks(agents, values, speculative_research=speculative_research)
+
+
+def create_email_task_templates(agents, target_config, known_contact=False):
+    """
+    Create reusable email tasks for one target configuration
+
+    Lead fields stay as {sender_email}-style placeholders that CrewAI fills
+    from Crew.kickoff(inputs=email_task_inputs(...)).
+
+    Args:
+        agents: Dictionary of agent instances
+        target_config: Target criteria configuration
+        known_contact: Leave out the parse task; the extracted contact is
+            passed as the {known_contact} input instead
+
+    Returns:
+        list: List of Task instances
+    """
+    values = target_config_inputs(target_config)
+    if known_contact:
+        return build_known_contact_tasks(agents, 'email', values)
+    values['research_source'] = 'the parsed email information'
+
+    return build_email_tasks(agents, values)
+
+
+def create_form_task_templates(agents, target_config, known_contact=False):
+    """
+    Create reusable form tasks for one target configuration
+
+    Lead fields stay as {name}-style placeholders that CrewAI fills from
+    Crew.kickoff(inputs=form_task_inputs(...)).
+
+    Args:
+        agents: Dictionary of agent instances
+        target_config: Target criteria configuration
+        known_contact: Leave out the structure task; the structured contact
+            is passed as the {known_contact} input instead
+
+    Returns:
+        list: List of Task instances
+    """
+    if known_contact:
+        return build_known_contact_tasks(agents, 'form', target_config_inputs(target_config))
+    return build_form_tasks(agents, target_config_inputs(target_config))
@@ -0,0 +1,109 @@
+"""
+Structured output models for the lead qualification tasks
+
+CrewAI validates each task's final answer against these models and keeps
+the result on the task output, so results can be read field by field
+instead of re-parsed from the crew transcript. Every field is optional:
+a partial answer still validates, and unknown keys are kept.
+"""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ParsedLead(BaseModel):
+    """
+    Contact details extracted by the email parser / form structurer
+    """
+    model_config = ConfigDict(extra='allow')
+
+    sender_name: Optional[str] = None
+    company_name: Optional[str] = None
+    designation: Optional[str] = None
+    email: Optional[str] = None
+    domain: Optional[str] = None
+    domain_type: Optional[str] = None
+    intent: Optional[str] = None
+
+
+class CompanyResearch(BaseModel):
+    """
+    Company intelligence from the company researcher
+    """
+    model_config = ConfigDict(extra='allow')
+
+    industry: Optional[str] = None
+    company_size: Optional[str] = None
+    location: Optional[str] = None
+    domain_type: Optional[str] = None
+    insights: Optional[str] = None
+
+
+class LeadScore(BaseModel):
+    """
+    Rubric scores and justifications from the lead scorer
+    """
+    model_config = ConfigDict(extra='allow')
+
+    total_score: Optional[int] = None
+    email_domain_score: Optional[int] = None
+    email_domain_justification: Optional[str] = None
+    company_fit_score: Optional[int] = None
+    company_fit_justification: Optional[str] = None
+    role_score: Optional[int] = None
+    role_justification: Optional[str] = None
+    message_intent_score: Optional[int] = None
+    message_intent_justification: Optional[str] = None
+    qualification_status: Optional[str] = None
+
+
+class Recommendation(BaseModel):
+    """
+    Next steps from the recommendation agent
+    """
+    model_config = ConfigDict(extra='allow')
+
+    next_action: Optional[str] = None
+    priority: Optional[str] = None
+    reasoning: Optional[str] = None
+    talking_points: List[str] = []
+    concerns: List[str] = []
+
+
+class FusedScore(LeadScore):
+    """
+    Lead score in the fused answer, with every rubric line required and bounded
+    """
+    total_score: int = Field(ge=0, le=100)
+    email_domain_score: int = Field(ge=0, le=20)
+    company_fit_score: int = Field(ge=0, le=40)
+    role_score: int = Field(ge=0, le=20)
+    message_intent_score: int = Field(ge=0, le=20)
+    qualification_status: Literal['Qualified', 'Needs Review', 'Unqualified']
+
+
+class FusedRecommendation(Recommendation):
+    """
+    Recommendation in the fused answer, with the action and priority required
+    """
+    next_action: Literal['Forward to Sales', 'Manual Review', 'Disqualify']
+    priority: Literal['High', 'Medium', 'Low']
+
+
+class FusedQualification(BaseModel):
+    """
+    Whole qualification in one answer: the four stage outputs plus the
+    model's confidence in the qualification_status
+
+    Unlike the per-task models this one is strict: every section is
+    required and unknown top-level keys are rejected, so its JSON schema
+    can be given to the model verbatim.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    contact: ParsedLead
+    company: CompanyResearch
+    score: FusedScore
+    recommendation: FusedRecommendation
+    confidence: float = Field(ge=0.0, le=1.0)
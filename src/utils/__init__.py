@@ -3,6 +3,16 @@ Utility functions
 """
 
 from .result_parser import parse_crew_result
-from .validators import validate_email, validate_form_data
+from .validators import validate_email, validate_form_data, is_disposable_email
+from .llm_cache import ResponseCache, get_response_cache
+from .log_queue import LogQueue, get_log_queue
+from .json_extractor import JSONObjectScanner, iter_json_objects
+from .artifact_store import StageArtifactStore, get_artifact_store
+from .domain_index import DomainIndex, get_domain_index, email_domain_category
+from .agent_metrics import AgentMetrics, get_agent_metrics
+from .cache_paths import cache_dir
 
-__all__ = ['parse_crew_result', 'validate_email', 'validate_form_data']
+__all__ = ['parse_crew_result', 'validate_email', 'validate_form_data', 'ResponseCache', 'get_response_cache',
+           'LogQueue', 'get_log_queue', 'JSONObjectScanner', 'iter_json_objects',
+           'StageArtifactStore', 'get_artifact_store', 'is_disposable_email', 'DomainIndex',
+           'get_domain_index', 'email_domain_category', 'AgentMetrics', 'get_agent_metrics', 'cache_dir']
@@ -0,0 +1,99 @@
+"""
+Per-agent LLM call counters for comparing model routing choices
+"""
+
+import threading
+
+
+class AgentMetrics:
+    """
+    Calls, latency and token counts per agent
+
+    KatonicLLMWrapper records every completion under the agent it serves:
+    gateway calls with their latency, cache hits, and failures. Tokens are
+    estimated from text length, so costs are approximate.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+
+    def record(self, agent, model_id, seconds, prompt_tokens, completion_tokens, status='success'):
+        """
+        Record one completion
+
+        Args:
+            agent: Agent name, e.g. 'lead_scorer'
+            model_id: Katonic model ID that answered
+            seconds: Time spent waiting for the answer
+            prompt_tokens: Estimated prompt tokens
+            completion_tokens: Estimated answer tokens
+            status: 'success', 'cached' or 'failed'
+        """
+        with self._lock:
+            counters = self.counters.setdefault(agent, {})
+            values = counters.setdefault(model_id, {
+                'calls': 0, 'cached': 0, 'errors': 0, 'seconds': 0.0, 'prompt_tokens': 0, 'completion_tokens': 0
+            })
+            if status == 'cached':
+                values['cached'] += 1
+                return
+            values['calls'] += 1
+            values['errors'] += int(status == 'failed')
+            values['seconds'] += seconds
+            values['prompt_tokens'] += prompt_tokens
+            values['completion_tokens'] += completion_tokens
+
+    def stats(self, prices=None):
+        """
+        Return per-agent totals with mean latency and cost
+
+        Args:
+            prices: Mapping of model ID to (prompt, completion) price per
+                1,000 tokens; models without a price get a cost of None
+
+        Returns:
+            dict: Per agent: model_ids, calls, cached, errors,
+                mean_latency_ms, prompt_tokens, completion_tokens and cost
+        """
+        prices = prices or {}
+        with self._lock:
+            counters = {agent: {model_id: dict(values) for model_id, values in models.items()}
+                        for agent, models in self.counters.items()}
+
+        report = {}
+        for agent, models in counters.items():
+            totals = {'model_ids': sorted(models), 'calls': 0, 'cached': 0, 'errors': 0, 'prompt_tokens': 0,
+                      'completion_tokens': 0}
+            seconds, cost, priced = 0.0, 0.0, True
+            for model_id, values in models.items():
+                for field in ('calls', 'cached', 'errors', 'prompt_tokens', 'completion_tokens'):
+                    totals[field] += values[field]
+                seconds += values['seconds']
+                if model_id in prices:
+                    prompt_price, completion_price = prices[model_id]
+                    cost += (values['prompt_tokens'] * prompt_price
+                             + values['completion_tokens'] * completion_price) / 1000
+                elif values['calls']:
+                    priced = False
+            totals['mean_latency_ms'] = 1000 * seconds / totals['calls'] if totals['calls'] else 0.0
+            totals['cost'] = cost if priced else None
+            report[agent] = totals
+        return report
+
+    def reset(self):
+        """
+        Drop every counter
+        """
+        with self._lock:
+            self.counters.clear()
+
+
+_default_metrics = AgentMetrics()
+
+
+def get_agent_metrics():
+    """
+    Return the process-wide per-agent counters
+    """
+    return _default_metrics
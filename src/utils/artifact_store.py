@@ -0,0 +1,201 @@
+"""
+Persistent per-stage artifacts for incremental lead re-scoring
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+
+from src.utils.cache_paths import default_cache_path
+
+
+# Stages whose output depends only on the lead and the model
+UPSTREAM_STAGES = ('contact', 'company')
+# Stages whose output also depends on the target criteria and scoring mode
+DOWNSTREAM_STAGES = ('score', 'recommendation')
+
+# Bump when task prompts change so stale artifacts are not reused
+ARTIFACT_VERSION = 1
+
+
+def make_context_key(*parts):
+    """
+    Build a stable key from the settings a stage's output depends on
+
+    Args:
+        parts: JSON-serializable values (model ID, target config, ...)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    material = json.dumps([ARTIFACT_VERSION] + list(parts), sort_keys=True, default=str)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class StageArtifactStore:
+    """
+    Store the output of each qualification stage per lead fingerprint
+
+    An artifact is the stage's structured data plus its raw answer text,
+    keyed by (lead fingerprint, stage, context key). Upstream stages use a
+    context key built from the model only, so they survive changes to the
+    target criteria; downstream stages include the criteria, so a new
+    target config misses and only those stages run again. Artifacts for
+    earlier configs are kept, so switching back costs nothing.
+
+    Without a path the store is kept in memory only; with one, artifacts
+    are read from SQLite on demand so a large pipeline is not held in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._connection = None
+        self.counters = {'hits': 0, 'misses': 0, 'writes': 0}
+
+    def _db(self):
+        """
+        Open the SQLite table on first use
+        """
+        if self._connection is None and self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "fingerprint TEXT NOT NULL, stage TEXT NOT NULL, context_key TEXT NOT NULL, "
+                "data TEXT NOT NULL, raw TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (fingerprint, stage, context_key))"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get(self, fingerprint, stage, context_key):
+        """
+        Look up a stage artifact
+
+        Args:
+            fingerprint: Lead fingerprint
+            stage: 'contact', 'company', 'score' or 'recommendation'
+            context_key: Key from make_context_key
+
+        Returns:
+            tuple: (data dict, raw text), or None on a miss
+        """
+        key = (fingerprint, stage, context_key)
+        with self._lock:
+            db = self._db()
+            if db is None:
+                artifact = self._memory.get(key)
+            else:
+                row = db.execute(
+                    "SELECT data, raw FROM artifacts WHERE fingerprint = ? AND stage = ? AND context_key = ?",
+                    key
+                ).fetchone()
+                artifact = (json.loads(row[0]), row[1]) if row is not None else None
+
+            if artifact is None:
+                self.counters['misses'] += 1
+                return None
+            self.counters['hits'] += 1
+            return dict(artifact[0]), artifact[1]
+
+    def put(self, fingerprint, stage, context_key, data, raw=''):
+        """
+        Store a stage artifact
+
+        Args:
+            fingerprint: Lead fingerprint
+            stage: Stage name
+            context_key: Key from make_context_key
+            data: Structured stage output
+            raw: Raw answer text of the stage
+        """
+        key = (fingerprint, stage, context_key)
+        with self._lock:
+            self.counters['writes'] += 1
+            db = self._db()
+            if db is None:
+                self._memory[key] = (dict(data), raw or '')
+            else:
+                db.execute(
+                    "INSERT OR REPLACE INTO artifacts (fingerprint, stage, context_key, data, raw, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    key + (json.dumps(data, default=str), raw or '', time.time())
+                )
+                db.commit()
+
+    def invalidate(self, stages=DOWNSTREAM_STAGES, fingerprint=None):
+        """
+        Drop artifacts so the given stages run again
+
+        Args:
+            stages: Stage names to drop
+            fingerprint: Only drop this lead's artifacts
+
+        Returns:
+            int: Number of artifacts removed from memory and disk
+        """
+        stages = tuple(stages)
+        removed = 0
+        with self._lock:
+            for key in list(self._memory):
+                if key[1] in stages and (fingerprint is None or key[0] == fingerprint):
+                    del self._memory[key]
+                    removed += 1
+
+            db = self._db()
+            if db is not None and stages:
+                query = f"DELETE FROM artifacts WHERE stage IN ({', '.join('?' * len(stages))})"
+                params = list(stages)
+                if fingerprint is not None:
+                    query += " AND fingerprint = ?"
+                    params.append(fingerprint)
+                removed += max(db.execute(query, params).rowcount, 0)
+                db.commit()
+        return removed
+
+    def stats(self):
+        """
+        Return hit/miss/write counters
+
+        Returns:
+            dict: Counter values
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+        return stats
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """
+    Return the process-wide stage artifact store
+
+    Artifacts live at STAGE_ARTIFACT_PATH, by default in the user cache
+    directory (see cache_dir); set it to an empty string to keep them in
+    memory only.
+
+    Returns:
+        StageArtifactStore: Shared store
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = StageArtifactStore(
+                path=os.getenv('STAGE_ARTIFACT_PATH', default_cache_path('stage_artifacts.sqlite3'))
+            )
+        return _default_store
@@ -0,0 +1,30 @@
+"""
+Default locations of the on-disk caches
+"""
+
+import os
+
+
+def cache_dir():
+    """
+    Return the directory for on-disk caches
+
+    LEAD_QUALIFICATION_CACHE_DIR overrides it; otherwise the user cache
+    directory ($XDG_CACHE_HOME or ~/.cache) is used, so caches do not
+    depend on the directory the app was started from.
+
+    Returns:
+        str: Absolute directory path (created on first write by each cache)
+    """
+    directory = os.getenv('LEAD_QUALIFICATION_CACHE_DIR')
+    if not directory:
+        base = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        directory = os.path.join(base, 'lead-qualification')
+    return os.path.abspath(directory)
+
+
+def default_cache_path(filename):
+    """
+    Return the default path of a cache file inside cache_dir()
+    """
+    return os.path.join(cache_dir(), filename)
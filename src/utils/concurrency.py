@@ -0,0 +1,174 @@
+"""
+Adaptive (AIMD) concurrency control for Katonic gateway calls
+"""
+
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.utils.resilience import is_retryable_error, is_throttle_error
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limit in-flight LLM calls with additive-increase/multiplicative-decrease
+
+    While calls succeed at the limit and the rolling median latency stays
+    within `latency_tolerance` times the baseline, the limit grows by one
+    per `limit` successes. The baseline is the lowest full-window median
+    since the last cut. Throttling, transient errors or a latency blow-up
+    cut the limit by `decrease_factor`, at most once per `cooldown`
+    seconds, and the baseline is learned again afterwards, so a lasting
+    rise in the gateway's normal latency costs one cut rather than
+    pinning the limit at `min_limit`. Every change is recorded with its
+    reason.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=32, latency_tolerance=2.0,
+                 decrease_factor=0.5, window=20, cooldown=1.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._baseline = None
+        self._decreased_at = 0.0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self.decisions = deque(maxlen=100)
+        self.counters = {'increases': 0, 'decreases': 0, 'completed': 0, 'errors': 0}
+
+    @property
+    def limit(self):
+        """
+        Current number of calls allowed in flight
+        """
+        return int(self._limit)
+
+    def acquire(self):
+        """
+        Block until a call slot is free
+        """
+        with self._lock:
+            while self._in_flight >= int(self._limit):
+                self._available.wait()
+            self._in_flight += 1
+
+    def release(self, latency, error=None):
+        """
+        Free a call slot and adjust the limit from the outcome
+
+        Args:
+            latency: Call latency in seconds
+            error: Exception raised by the call, if any
+        """
+        with self._lock:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            self.counters['completed'] += 1
+
+            if error is not None:
+                if is_throttle_error(error):
+                    self._decrease('throttled')
+                elif is_retryable_error(error):
+                    self._decrease('error')
+                self.counters['errors'] += 1
+            else:
+                self._latencies.append(latency)
+                median = statistics.median(self._latencies)
+                if len(self._latencies) == self._latencies.maxlen:
+                    self._baseline = median if self._baseline is None else min(self._baseline, median)
+                if self._baseline is not None and median > self._baseline * self.latency_tolerance:
+                    self._decrease('latency')
+                elif saturated:
+                    self._increase()
+
+            self._available.notify_all()
+
+    def _record(self, old, reason):
+        """
+        Record a change of the integer limit
+        """
+        if int(self._limit) != int(old):
+            self.decisions.append({
+                'time': time.time(),
+                'old_limit': int(old),
+                'new_limit': int(self._limit),
+                'reason': reason,
+                'baseline_latency': self._baseline
+            })
+
+    def _increase(self):
+        old = self._limit
+        self._limit = min(self.max_limit, self._limit + 1.0 / max(1, int(self._limit)))
+        if int(self._limit) > int(old):
+            self.counters['increases'] += 1
+        self._record(old, 'saturated')
+
+    def _decrease(self, reason):
+        now = time.monotonic()
+        if now - self._decreased_at < self.cooldown:
+            return
+        self._decreased_at = now
+        old = self._limit
+        self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+        self.counters['decreases'] += 1
+        self._record(old, reason)
+        # Latencies from before the cut no longer describe the new load
+        self._latencies.clear()
+        self._baseline = None
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold a call slot for the duration of the block, feeding its latency
+        and any exception back into the controller
+        """
+        self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.release(time.monotonic() - start, error=e)
+            raise
+        self.release(time.monotonic() - start)
+
+    def stats(self):
+        """
+        Return the current limit, in-flight count, counters and recent decisions
+
+        Returns:
+            dict: Controller metrics
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['limit'] = int(self._limit)
+            stats['in_flight'] = self._in_flight
+            stats['baseline_latency'] = self._baseline
+            stats['decisions'] = list(self.decisions)
+            return stats
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(model_id):
+    """
+    Return the process-wide adaptive concurrency limiter for a model
+
+    Args:
+        model_id: Katonic model ID
+
+    Returns:
+        AdaptiveConcurrencyLimiter: Shared controller
+    """
+    with _limiters_lock:
+        if model_id not in _limiters:
+            _limiters[model_id] = AdaptiveConcurrencyLimiter()
+        return _limiters[model_id]
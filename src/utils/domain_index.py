@@ -0,0 +1,254 @@
+"""
+Memory-mapped email domain classification index
+"""
+
+import mmap
+import os
+import struct
+import threading
+
+from src.utils.cache_paths import default_cache_path
+
+
+LIST_DIRECTORY = os.path.join(os.path.dirname(__file__), 'domain_lists')
+
+# Category codes stored in the index, keyed by the list file they come from
+CATEGORIES = {
+    'freemail': 1,
+    'disposable': 2,
+    'corporate': 3,
+    'public_suffix': 4
+}
+CATEGORY_NAMES = {code: name for name, code in CATEGORIES.items()}
+LIST_FILES = {
+    'freemail': 'freemail.txt',
+    'disposable': 'disposable.txt',
+    'corporate': 'corporate.txt',
+    'public_suffix': 'public_suffixes.txt'
+}
+
+# Categories whose addresses belong to a person rather than a company
+PERSONAL_CATEGORIES = frozenset(['freemail', 'disposable'])
+
+MAGIC = b'DIX1'
+# Magic, record width, record count
+HEADER = struct.Struct('<4sHI')
+
+
+def read_domain_list(path):
+    """
+    Read one domain per line, skipping blank lines and # comments
+    """
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            domain = line.split('#', 1)[0].strip().lower()
+            if domain:
+                yield domain
+
+
+def build_domain_index(path, list_directory=LIST_DIRECTORY):
+    """
+    Compile the domain lists into a sorted fixed-width index file
+
+    Each record is the domain, NUL-padded to the longest domain, followed by
+    one category byte. Fixed-width sorted records let lookups binary-search
+    the memory-mapped file without parsing it. A domain listed in several
+    files keeps the category listed first in CATEGORIES.
+
+    Args:
+        path: Index file to write
+        list_directory: Directory holding the LIST_FILES
+
+    Returns:
+        int: Number of domains indexed
+    """
+    entries = {}
+    for name, filename in LIST_FILES.items():
+        list_path = os.path.join(list_directory, filename)
+        if not os.path.exists(list_path):
+            continue
+        for domain in read_domain_list(list_path):
+            entries.setdefault(domain.encode('idna'), CATEGORIES[name])
+
+    width = max((len(domain) for domain in entries), default=0) + 1
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write beside the target and rename, so readers never map a partial file
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, width, len(entries)))
+        for domain in sorted(entries):
+            handle.write(domain.ljust(width - 1, b'\0') + bytes([entries[domain]]))
+    os.replace(temporary, path)
+    return len(entries)
+
+
+def index_is_stale(path, list_directory=LIST_DIRECTORY):
+    """
+    Return True if the index is missing or older than any domain list
+    """
+    if not os.path.exists(path):
+        return True
+    built = os.path.getmtime(path)
+    for filename in LIST_FILES.values():
+        list_path = os.path.join(list_directory, filename)
+        if os.path.exists(list_path) and os.path.getmtime(list_path) > built:
+            return True
+    return False
+
+
+class DomainIndex:
+    """
+    Look up email domains in an index file built by build_domain_index
+
+    The file is memory-mapped on first lookup and binary-searched in place,
+    so loading costs nothing until a domain is classified and the pages
+    are shared between processes. Each lookup is a few dozen byte
+    comparisons.
+    """
+
+    def __init__(self, path, list_directory=LIST_DIRECTORY):
+        self.path = path
+        self.list_directory = list_directory
+        self._lock = threading.Lock()
+        self._map = None
+        self._width = 0
+        self._count = 0
+
+    def _load(self):
+        """
+        Build the index if it is stale and map it into memory
+        """
+        if self._map is not None:
+            return self._map
+        with self._lock:
+            if self._map is None:
+                if index_is_stale(self.path, self.list_directory):
+                    build_domain_index(self.path, self.list_directory)
+                with open(self.path, 'rb') as handle:
+                    data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, width, count = HEADER.unpack_from(data)
+                if magic != MAGIC:
+                    data.close()
+                    raise ValueError(f"{self.path} is not a domain index")
+                # Publish the map last: the unlocked check above treats a
+                # mapped index as fully loaded
+                self._width, self._count = width, count
+                self._map = data
+        return self._map
+
+    def lookup(self, domain):
+        """
+        Return the category of an exact domain
+
+        Args:
+            domain: Domain name
+
+        Returns:
+            str: 'freemail', 'disposable', 'corporate' or 'public_suffix',
+                or None if the domain is not listed
+        """
+        data = self._load()
+        try:
+            key = domain.strip().lower().rstrip('.').encode('idna')
+        except UnicodeError:
+            return None
+        if not key or len(key) >= self._width:
+            return None
+        key = key.ljust(self._width - 1, b'\0')
+
+        width, low, high = self._width, 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = HEADER.size + middle * width
+            record = data[start:start + width - 1]
+            if record < key:
+                low = middle + 1
+            elif record > key:
+                high = middle
+            else:
+                return CATEGORY_NAMES.get(data[start + width - 1])
+        return None
+
+    def registrable_domain(self, domain):
+        """
+        Strip subdomains down to the domain an organisation registered
+
+        'mail.acme.co.uk' -> 'acme.co.uk'; a single-label TLD is assumed
+        when no listed public suffix matches.
+
+        Args:
+            domain: Domain name
+
+        Returns:
+            str: Registrable domain
+        """
+        labels = domain.strip().lower().rstrip('.').split('.')
+        for position in range(1, len(labels) - 1):
+            if self.lookup('.'.join(labels[position:])) == 'public_suffix':
+                return '.'.join(labels[position - 1:])
+        return '.'.join(labels[-2:])
+
+    def classify(self, domain):
+        """
+        Classify an email domain, falling back to its registrable domain
+
+        Args:
+            domain: Domain name, e.g. 'uk.mail.yahoo.com' or 'acme.com'
+
+        Returns:
+            str: 'freemail', 'disposable', 'corporate', or 'unknown' for
+                domains not in any list (typically a company's own domain)
+        """
+        if not domain:
+            return 'unknown'
+        category = self.lookup(domain)
+        if category is None:
+            category = self.lookup(self.registrable_domain(domain))
+        if category in (None, 'public_suffix'):
+            return 'unknown'
+        return category
+
+    def domain_type(self, domain):
+        """
+        Return 'personal' for free-mail and disposable domains, else 'business'
+        """
+        return 'personal' if self.classify(domain) in PERSONAL_CATEGORIES else 'business'
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_domain_index():
+    """
+    Return the process-wide domain index
+
+    The compiled index lives at DOMAIN_INDEX_PATH (by default in the user
+    cache directory) and is rebuilt from src/utils/domain_lists whenever a
+    list is newer than it.
+
+    Returns:
+        DomainIndex: Shared index
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = DomainIndex(os.getenv('DOMAIN_INDEX_PATH', default_cache_path('domain_index.bin')))
+        return _default_index
+
+
+def email_domain_category(email):
+    """
+    Classify the domain of an email address with the shared index
+
+    Args:
+        email: Email address
+
+    Returns:
+        str: 'freemail', 'disposable', 'corporate' or 'unknown'
+    """
+    domain = email.rsplit('@', 1)[-1] if email and '@' in email else ''
+    return get_domain_index().classify(domain)
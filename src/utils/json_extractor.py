@@ -0,0 +1,300 @@
+"""
+Single-pass extraction of JSON objects from LLM and agent transcripts
+"""
+
+import json
+import re
+
+
+# Characters that change scanner state outside and inside strings
+STRUCTURE_PATTERN = re.compile(r'[{}"\']')
+# An opening brace only starts an object when followed by a key or '}'
+OBJECT_START_PATTERN = re.compile(r'\{\s*(?:["\'}]|$)')
+DOUBLE_STRING_PATTERN = re.compile(r'[\\"]')
+SINGLE_STRING_PATTERN = re.compile(r"[\\']")
+
+LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+
+
+class JSONObjectScanner:
+    """
+    Incremental scanner for top-level JSON objects in free text
+
+    Text can be fed in arbitrary chunks. The scanner tracks brace depth and
+    string/escape state, so objects may nest to any depth and may contain
+    braces inside strings. Each position is visited once, and consumed text
+    is discarded, so memory stays bounded by the largest open object.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._start = None
+        self._depth = 0
+        self._quote = None
+
+    @staticmethod
+    def _opens_string(buffer, index):
+        """
+        Treat a single quote as a string delimiter only where a JSON value or
+        key may start, so apostrophes in prose are ignored
+        """
+        index -= 1
+        while index >= 0 and buffer[index].isspace():
+            index -= 1
+        return index >= 0 and buffer[index] in '{[,:'
+
+    def feed(self, chunk):
+        """
+        Add text and return the objects completed by it
+
+        Args:
+            chunk: Next piece of text
+
+        Returns:
+            list: Raw text of each completed top-level object
+        """
+        self._buffer += chunk
+        found = []
+        buffer = self._buffer
+        pos = self._pos
+
+        while True:
+            if self._quote is not None:
+                pattern = DOUBLE_STRING_PATTERN if self._quote == '"' else SINGLE_STRING_PATTERN
+                match = pattern.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(buffer):
+                        # Escape split across chunks; resume at the backslash
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._quote = None
+                pos = match.end()
+                continue
+
+            if self._depth == 0:
+                match = OBJECT_START_PATTERN.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.end() == len(buffer) and not buffer[match.end() - 1] in '"\'}':
+                    # Need more text to see what follows the brace
+                    pos = match.start()
+                    break
+                self._start = match.start()
+                self._depth = 1
+                pos = match.start() + 1
+                continue
+
+            match = STRUCTURE_PATTERN.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char = match.group()
+            pos = match.end()
+            if char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    found.append(buffer[self._start:pos])
+                    self._start = None
+            elif char == '"' or self._opens_string(buffer, match.start()):
+                self._quote = char
+
+        # Drop text that can no longer be part of an object
+        keep_from = self._start if self._start is not None else pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._start is not None:
+            self._start = 0
+        return found
+
+    def unterminated(self):
+        """
+        Return the text of an object that was opened but never closed
+        """
+        return self._buffer if self._depth > 0 else ''
+
+
+def repair_json(text):
+    """
+    Fix common LLM JSON mistakes: single-quoted strings, trailing commas
+    and Python literals (True/False/None)
+
+    Args:
+        text: Candidate JSON object text
+
+    Returns:
+        str: Repaired text
+    """
+    out = []
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '"':
+            end = i + 1
+            while end < length and text[end] != '"':
+                end += 2 if text[end] == '\\' else 1
+            out.append(text[i:end + 1])
+            i = end + 1
+        elif char == "'":
+            out.append('"')
+            i += 1
+            while i < length and text[i] != "'":
+                if text[i] == '\\' and i + 1 < length:
+                    out.append("'" if text[i + 1] == "'" else text[i:i + 2])
+                    i += 2
+                    continue
+                out.append('\\"' if text[i] == '"' else text[i])
+                i += 1
+            out.append('"')
+            i += 1
+        elif char == ',':
+            following = i + 1
+            while following < length and text[following].isspace():
+                following += 1
+            if following >= length or text[following] not in '}]':
+                out.append(char)
+            i += 1
+        elif char.isalpha():
+            end = i
+            while end < length and (text[end].isalnum() or text[end] == '_'):
+                end += 1
+            word = text[i:end]
+            out.append(LITERALS.get(word, word))
+            i = end
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out)
+
+
+def loads_strict(text):
+    """
+    Parse a JSON object without repairs
+
+    Args:
+        text: Candidate JSON object text
+
+    Returns:
+        dict: Parsed object, or None if it is not valid JSON
+    """
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, RecursionError):
+        return None
+
+
+def loads_lenient(text):
+    """
+    Parse a JSON object, repairing it if strict parsing fails
+
+    Args:
+        text: Candidate JSON object text
+
+    Returns:
+        dict: Parsed object, or None if it cannot be parsed
+    """
+    obj = loads_strict(text)
+    if obj is None:
+        obj = loads_strict(repair_json(text))
+    return obj
+
+
+def brace_blocks(text):
+    """
+    Find the balanced brace blocks in `text` in one pass
+
+    Blocks start where an object may (see OBJECT_START_PATTERN) and follow
+    the scanner's string rules. Blocks inside a brace that never closes are
+    promoted to its level instead of being lost.
+
+    Args:
+        text: Free text
+
+    Returns:
+        list: (start, end, child blocks) tuples, in order of appearance
+    """
+    roots = []
+    open_blocks = []
+    quote = None
+    pos = 0
+    while True:
+        if quote is not None:
+            pattern = DOUBLE_STRING_PATTERN if quote == '"' else SINGLE_STRING_PATTERN
+            match = pattern.search(text, pos)
+            if match is None:
+                break
+            pos = match.end() + 1 if match.group() == '\\' else match.end()
+            if match.group() == quote:
+                quote = None
+            continue
+
+        if not open_blocks:
+            match = OBJECT_START_PATTERN.search(text, pos)
+            if match is None:
+                break
+            open_blocks.append((match.start(), []))
+            pos = match.start() + 1
+            continue
+
+        match = STRUCTURE_PATTERN.search(text, pos)
+        if match is None:
+            break
+        char = match.group()
+        pos = match.end()
+        if char == '{':
+            open_blocks.append((match.start(), []))
+        elif char == '}':
+            start, children = open_blocks.pop()
+            (open_blocks[-1][1] if open_blocks else roots).append((start, pos, children))
+        elif char == '"' or JSONObjectScanner._opens_string(text, match.start()):
+            quote = char
+
+    while open_blocks:
+        _, children = open_blocks.pop()
+        (open_blocks[-1][1] if open_blocks else roots).extend(children)
+    return roots
+
+
+# Characters of repair work allowed per input character; past it, blocks
+# are only parsed strictly, so deeply nested garbage stays linear
+REPAIR_BUDGET_FACTOR = 8
+
+
+def iter_json_objects(text):
+    """
+    Yield every parseable top-level JSON object in `text`, including objects
+    inside ```json fences
+
+    When a brace-delimited block is not valid JSON (for example prose in
+    braces wrapping a real object), the blocks inside it are tried instead.
+
+    Args:
+        text: Free text such as an agent transcript
+
+    Yields:
+        dict: Parsed objects, in order of appearance
+    """
+    repair_budget = REPAIR_BUDGET_FACTOR * len(text)
+    # Blocks still to try, next one last, so nesting needs no recursion
+    pending = list(reversed(brace_blocks(text)))
+    while pending:
+        start, end, children = pending.pop()
+        raw = text[start:end]
+        if repair_budget >= len(raw):
+            repair_budget -= len(raw)
+            obj = loads_lenient(raw)
+        else:
+            obj = loads_strict(raw)
+        if isinstance(obj, dict):
+            yield obj
+        elif obj is None:
+            pending.extend(reversed(children))
@@ -0,0 +1,243 @@
+"""
+Tiered response cache for Katonic LLM completions
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+
+from src.utils.cache_paths import default_cache_path
+
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt):
+    """
+    Collapse whitespace so prompts differing only in formatting share a key
+    """
+    return WHITESPACE_PATTERN.sub(' ', prompt).strip()
+
+
+def make_cache_key(model_id, temperature, prompt, max_tokens=None):
+    """
+    Build a content-addressed cache key
+
+    Args:
+        model_id: Katonic model ID
+        temperature: Model temperature
+        prompt: Prompt text
+        max_tokens: Answer length limit, if any
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    material = f"{model_id}\x00{temperature}\x00{normalize_prompt(prompt)}"
+    if max_tokens is not None:
+        material += f"\x00{max_tokens}"
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier LLM response cache: an in-memory LRU in front of an optional
+    SQLite table. Both tiers expire entries after `ttl_seconds` and evict
+    the least recently used entries beyond their size limits.
+    """
+
+    def __init__(self, path=None, max_memory_entries=1024, max_disk_entries=50000,
+                 ttl_seconds=24 * 3600):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._connection = None
+        self._writes_since_prune = 0
+        self.counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0
+        }
+
+    def _db(self):
+        """
+        Open the SQLite tier on first use
+        """
+        if self._connection is None and self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _remember(self, key, response, created_at):
+        """
+        Insert into the memory tier, evicting the least recently used entry
+        """
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def get(self, key):
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            str: Cached response, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, created_at = entry
+                if now - created_at < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return response
+                del self._memory[key]
+
+            db = self._db()
+            if db is not None:
+                row = db.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl_seconds:
+                    db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.counters['disk_hits'] += 1
+                    return row[0]
+
+            self.counters['misses'] += 1
+            return None
+
+    def set(self, key, response):
+        """
+        Store a response in both tiers
+
+        Args:
+            key: Key from make_cache_key
+            response: Response text
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            self.counters['writes'] += 1
+
+            db = self._db()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)", (key, response, now, now)
+            )
+            self._writes_since_prune += 1
+            # Pruning scans the table, so only do it periodically
+            if self._writes_since_prune >= 100:
+                self._prune(db, now)
+            db.commit()
+
+    def delete(self, key):
+        """
+        Remove one response from both tiers
+
+        Args:
+            key: Key from make_cache_key
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+            db = self._db()
+            if db is not None:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                db.commit()
+
+    def _prune(self, db, now):
+        """
+        Drop expired rows and the least recently used rows beyond the size limit
+        """
+        self._writes_since_prune = 0
+        expired = db.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        ).rowcount
+        self.counters['evictions'] += max(expired, 0) + max(overflow, 0)
+
+    def clear(self):
+        """
+        Remove every entry from both tiers
+        """
+        with self._lock:
+            self._memory.clear()
+            db = self._db()
+            if db is not None:
+                db.execute("DELETE FROM responses")
+                db.commit()
+
+    def stats(self):
+        """
+        Return hit/miss counters and the hit rate
+
+        Returns:
+            dict: Counter values
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Return the process-wide response cache
+
+    The SQLite tier lives at LLM_CACHE_PATH, by default in the user cache
+    directory (see cache_dir); set it to an empty string for a memory-only
+    cache. Entries expire after LLM_CACHE_TTL seconds.
+
+    Returns:
+        ResponseCache: Shared cache instance
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                path=os.getenv('LLM_CACHE_PATH', default_cache_path('llm_responses.sqlite3')),
+                ttl_seconds=float(os.getenv('LLM_CACHE_TTL', 24 * 3600))
+            )
+        return _default_cache
@@ -0,0 +1,235 @@
+"""
+Background, batched delivery of request logs to the Katonic platform
+"""
+
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+
+
+_FLUSH = object()
+_STOP = object()
+
+
+def log_batch_to_platform(records):
+    """
+    Deliver a batch of request logs with katonic's log_request_to_platform
+
+    The platform takes one record per call, so one failed record does not
+    stop the rest of the batch.
+
+    Args:
+        records: List of keyword-argument dictionaries
+
+    Returns:
+        int: Number of records that could not be delivered
+    """
+    from katonic.llm.log_requests import log_request_to_platform
+
+    failed = 0
+    for record in records:
+        try:
+            log_request_to_platform(**record)
+        except Exception as log_error:
+            failed += 1
+            print(f"Logging warning: {log_error}")
+    return failed
+
+
+class LogQueue:
+    """
+    Bounded queue drained by a worker thread that delivers records in batches
+
+    Each batch is handed to `sink` (by default `log_batch_to_platform`) in
+    one call, as a list of keyword-argument dictionaries; the sink returns
+    the number of records it failed to deliver, and raising fails the
+    whole batch. A batch is delivered once `batch_size` records are
+    waiting or `flush_interval` seconds have passed. When the queue is full,
+    new records are dropped and counted rather than blocking the caller.
+    Failed requests are always kept; successful ones are kept with
+    probability `success_sample_rate`.
+    """
+
+    def __init__(self, sink=log_batch_to_platform, max_size=1000, batch_size=20, flush_interval=2.0,
+                 success_sample_rate=1.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.success_sample_rate = success_sample_rate
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._drained = threading.Condition(self._lock)
+        self._pending = 0
+        self._worker = None
+        self._closed = False
+        self.counters = {
+            'submitted': 0,
+            'sampled_out': 0,
+            'dropped': 0,
+            'delivered': 0,
+            'errors': 0,
+            'batches': 0
+        }
+
+    def _ensure_worker(self):
+        """
+        Start the worker thread on first use
+        """
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="katonic-log-queue", daemon=True)
+            self._worker.start()
+
+    def submit(self, **record):
+        """
+        Queue a log record without blocking
+
+        Args:
+            **record: Keyword arguments for log_request_to_platform
+
+        Returns:
+            bool: True if the record was queued
+        """
+        with self._lock:
+            self.counters['submitted'] += 1
+            if self._closed:
+                self.counters['dropped'] += 1
+                return False
+            if record.get('status') != 'failed' and random.random() >= self.success_sample_rate:
+                self.counters['sampled_out'] += 1
+                return False
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self.counters['dropped'] += 1
+                return False
+            self._pending += 1
+            self._ensure_worker()
+            return True
+
+    def _collect(self):
+        """
+        Gather the next batch of records
+
+        Returns:
+            tuple: (list of records, whether the worker should stop)
+        """
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            if item is _FLUSH:
+                break
+            batch.append(item)
+        return batch, False
+
+    def _deliver(self, batch):
+        """
+        Send a batch of records to the sink, counting failures
+        """
+        try:
+            errors = min(len(batch), self.sink(batch) or 0)
+        except Exception as log_error:
+            errors = len(batch)
+            print(f"Logging warning: {log_error}")
+        delivered = len(batch) - errors
+
+        with self._lock:
+            self.counters['delivered'] += delivered
+            self.counters['errors'] += errors
+            self.counters['batches'] += 1
+            self._pending -= len(batch)
+            self._drained.notify_all()
+
+    def _run(self):
+        """
+        Worker loop
+        """
+        while True:
+            batch, stop = self._collect()
+            if batch:
+                self._deliver(batch)
+            if stop:
+                return
+
+    def flush(self, timeout=10.0):
+        """
+        Deliver every queued record now and wait until they are sent
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if the queue drained in time
+        """
+        with self._lock:
+            if self._worker is None or self._pending == 0:
+                return True
+        self._queue.put(_FLUSH)
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._drained.wait(remaining)
+            return True
+
+    def close(self, timeout=10.0):
+        """
+        Flush outstanding records and stop the worker
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join(timeout)
+
+    def stats(self):
+        """
+        Return delivery counters
+
+        Returns:
+            dict: Counter values and the number of records still pending
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['pending'] = self._pending
+            return stats
+
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+def get_log_queue():
+    """
+    Return the process-wide log queue, flushed when the interpreter exits
+
+    LOG_SUCCESS_SAMPLE_RATE sets the fraction of successful requests logged;
+    failed requests are always logged.
+
+    Returns:
+        LogQueue: Shared queue instance
+    """
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = LogQueue(
+                success_sample_rate=float(os.getenv('LOG_SUCCESS_SAMPLE_RATE', 1.0))
+            )
+            atexit.register(_default_queue.close)
+        return _default_queue
@@ -0,0 +1,176 @@
+"""
+Process-wide token-bucket rate limiting per Katonic model
+"""
+
+import os
+import threading
+import time
+
+
+def estimate_tokens(text):
+    """
+    Rough token count for a prompt (about four characters per token)
+    """
+    return len(text) // 4 + 1
+
+
+class RateLimiter:
+    """
+    Requests-per-second and tokens-per-minute token buckets
+
+    Callers are served strictly in arrival order: each takes a ticket and
+    only the caller at the head of the line may draw from the buckets, so a
+    large request cannot be starved by a stream of small ones. A limit of
+    None disables that bucket.
+    """
+
+    def __init__(self, requests_per_second=None, tokens_per_minute=None, burst=None):
+        self._lock = threading.Lock()
+        self._turn = threading.Condition(self._lock)
+        self._next_ticket = 0
+        self._serving = 0
+        self.counters = {
+            'acquired': 0,
+            'waited': 0,
+            'wait_seconds': 0.0,
+            'max_wait_seconds': 0.0
+        }
+        self.configure(requests_per_second, tokens_per_minute, burst)
+
+    def configure(self, requests_per_second=None, tokens_per_minute=None, burst=None):
+        """
+        Change the limits; buckets start full
+
+        Args:
+            requests_per_second: Sustained request rate, or None for no limit
+            tokens_per_minute: Sustained prompt-token rate, or None for no limit
+            burst: Request bucket capacity; defaults to one second of requests
+        """
+        with self._lock:
+            self.requests_per_second = requests_per_second
+            self.tokens_per_minute = tokens_per_minute
+            self.request_capacity = burst or max(1.0, requests_per_second or 1.0)
+            self.token_capacity = float(tokens_per_minute or 0)
+            self._requests = self.request_capacity
+            self._tokens = self.token_capacity
+            self._refilled_at = time.monotonic()
+            self._turn.notify_all()
+
+    def _refill(self, now):
+        """
+        Add the tokens accrued since the last refill
+        """
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.requests_per_second:
+            self._requests = min(self.request_capacity, self._requests + elapsed * self.requests_per_second)
+        if self.tokens_per_minute:
+            self._tokens = min(self.token_capacity, self._tokens + elapsed * self.tokens_per_minute / 60.0)
+
+    def _delay(self, tokens):
+        """
+        Seconds until both buckets can cover a request of `tokens`
+        """
+        delay = 0.0
+        if self.requests_per_second and self._requests < 1:
+            delay = max(delay, (1 - self._requests) / self.requests_per_second)
+        if self.tokens_per_minute and self._tokens < tokens:
+            delay = max(delay, (tokens - self._tokens) * 60.0 / self.tokens_per_minute)
+        return delay
+
+    def acquire(self, tokens=1):
+        """
+        Block until the request may be sent
+
+        Args:
+            tokens: Estimated prompt tokens for the request
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        start = time.monotonic()
+        with self._lock:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while True:
+                if ticket == self._serving:
+                    now = time.monotonic()
+                    self._refill(now)
+                    needed = min(tokens, self.token_capacity)
+                    delay = self._delay(needed)
+                    if delay <= 0:
+                        break
+                    self._turn.wait(delay)
+                else:
+                    self._turn.wait()
+
+            if self.requests_per_second:
+                self._requests -= 1
+            if self.tokens_per_minute:
+                self._tokens -= needed
+            self._serving += 1
+            self._turn.notify_all()
+
+            waited = time.monotonic() - start
+            self.counters['acquired'] += 1
+            if waited > 0.001:
+                self.counters['waited'] += 1
+            self.counters['wait_seconds'] += waited
+            self.counters['max_wait_seconds'] = max(self.counters['max_wait_seconds'], waited)
+            return waited
+
+    def stats(self):
+        """
+        Return acquisition and wait-time metrics
+
+        Returns:
+            dict: Counter values and the number of callers currently queued
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['queued'] = self._next_ticket - self._serving
+            return stats
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _env_limit(name):
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def get_rate_limiter(model_id):
+    """
+    Return the process-wide rate limiter for a model
+
+    New limiters take their limits from KATONIC_REQUESTS_PER_SECOND and
+    KATONIC_TOKENS_PER_MINUTE; without them requests are not throttled.
+
+    Args:
+        model_id: Katonic model ID
+
+    Returns:
+        RateLimiter: Shared limiter
+    """
+    with _limiters_lock:
+        if model_id not in _limiters:
+            _limiters[model_id] = RateLimiter(
+                requests_per_second=_env_limit('KATONIC_REQUESTS_PER_SECOND'),
+                tokens_per_minute=_env_limit('KATONIC_TOKENS_PER_MINUTE')
+            )
+        return _limiters[model_id]
+
+
+def configure_rate_limit(model_id, requests_per_second=None, tokens_per_minute=None, burst=None):
+    """
+    Set the limits for a model's shared rate limiter
+
+    Args:
+        model_id: Katonic model ID
+        requests_per_second: Sustained request rate, or None for no limit
+        tokens_per_minute: Sustained prompt-token rate, or None for no limit
+        burst: Request bucket capacity
+    """
+    get_rate_limiter(model_id).configure(requests_per_second, tokens_per_minute, burst)
@@ -0,0 +1,353 @@
+"""
+Retry, backoff, circuit breaking and request hedging for Katonic gateway calls
+"""
+
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+RETRYABLE_MESSAGES = (
+    'timeout', 'timed out', 'temporarily unavailable', 'rate limit', 'too many requests',
+    'connection reset', 'connection aborted', 'bad gateway', 'service unavailable',
+    'gateway timeout'
+)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when the circuit breaker for a model rejects a call
+    """
+
+
+def get_status_code(error):
+    """
+    Return the HTTP status code attached to an exception, if any
+    """
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    return status
+
+
+def is_retryable_error(error):
+    """
+    Classify an exception from the gateway as transient or permanent
+
+    Timeouts, connection failures, throttling and 5xx responses are
+    retryable; anything else (bad requests, auth errors, bugs) is not.
+
+    Args:
+        error: Exception raised by the gateway call
+
+    Returns:
+        bool: True if the call may succeed when retried
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = get_status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    message = str(error).lower()
+    return any(pattern in message for pattern in RETRYABLE_MESSAGES)
+
+
+def is_throttle_error(error):
+    """
+    Return True if the gateway rejected the call for rate limiting
+    """
+    message = str(error).lower()
+    return get_status_code(error) == 429 or 'rate limit' in message or 'too many requests' in message
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff_delay(self, attempt):
+        """
+        Return the delay before retry number `attempt` (1-based)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class RetryBudget:
+    """
+    Thread-safe count of retries a single lead may still spend
+    """
+
+    def __init__(self, max_retries):
+        self.remaining = max_retries
+        self._lock = threading.Lock()
+
+    def consume(self):
+        """
+        Take one retry from the budget
+
+        Returns:
+            bool: False if the budget is exhausted
+        """
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+_current_retry_budget = contextvars.ContextVar('retry_budget', default=None)
+
+
+@contextmanager
+def retry_budget(max_retries):
+    """
+    Limit the total number of retries spent by gateway calls in this context
+
+    Args:
+        max_retries: Retries shared by every LLM call of one lead
+
+    Yields:
+        RetryBudget: The active budget
+    """
+    budget = RetryBudget(max_retries)
+    token = _current_retry_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_retry_budget.reset(token)
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a model's gateway is failing
+
+    After `failure_threshold` consecutive retryable failures the circuit
+    opens and rejects calls for `reset_timeout` seconds. It then lets a
+    single trial call through; success closes it, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Return True if a call may proceed
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Close the circuit after a successful call
+        """
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """
+        Let the next call through after a trial that says nothing about the
+        gateway's health, e.g. a rejected request
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """
+        Count a retryable failure, opening the circuit past the threshold
+        """
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """
+    Rolling window of call latencies
+    """
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        """
+        Add a latency sample in seconds
+        """
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percent, min_samples=20):
+        """
+        Return a latency percentile, or None until enough samples exist
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+
+_breakers = {}
+_trackers = {}
+_hedge_executors = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(model_id):
+    """
+    Return the process-wide circuit breaker for a model
+    """
+    with _registry_lock:
+        if model_id not in _breakers:
+            _breakers[model_id] = CircuitBreaker()
+        return _breakers[model_id]
+
+
+def get_latency_tracker(model_id):
+    """
+    Return the process-wide latency tracker for a model
+    """
+    with _registry_lock:
+        if model_id not in _trackers:
+            _trackers[model_id] = LatencyTracker()
+        return _trackers[model_id]
+
+
+def get_hedge_executor(model_id):
+    """
+    Return the process-wide thread pool for a model's hedged calls
+
+    The pool has room for a primary and a duplicate per call slot of the
+    model's adaptive concurrency limiter, so hedges never queue behind
+    primaries; the limiter still bounds how many reach the gateway.
+    """
+    # Imported here: src.utils.concurrency imports this module
+    from src.utils.concurrency import get_concurrency_limiter
+
+    workers = 2 * get_concurrency_limiter(model_id).max_limit
+    with _registry_lock:
+        if model_id not in _hedge_executors:
+            _hedge_executors[model_id] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="katonic-hedge")
+        return _hedge_executors[model_id]
+
+
+def hedging_enabled():
+    """
+    Return True if KATONIC_HEDGE_REQUESTS turns request hedging on
+    """
+    return os.getenv('KATONIC_HEDGE_REQUESTS', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def hedged_call(fn, hedge_after, model_id=None):
+    """
+    Run `fn`, starting a duplicate call if the first has not finished within
+    `hedge_after` seconds, and return whichever succeeds first
+
+    Args:
+        fn: Zero-argument callable
+        hedge_after: Seconds to wait before hedging
+        model_id: Katonic model ID whose hedge pool runs the calls
+
+    Returns:
+        The first successful result
+    """
+    executor = get_hedge_executor(model_id)
+    futures = [executor.submit(contextvars.copy_context().run, fn)]
+    done, _ = wait(futures, timeout=hedge_after)
+    if not done:
+        futures.append(executor.submit(contextvars.copy_context().run, fn))
+
+    error = None
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+def call_with_resilience(model_id, fn, policy=None, hedge=None):
+    """
+    Call the gateway with retries, a per-model circuit breaker and optional
+    hedging after the model's observed p95 latency
+
+    Args:
+        model_id: Katonic model ID, used to pick the breaker and latency tracker
+        fn: Zero-argument callable making the gateway request
+        policy: RetryPolicy; defaults to three attempts
+        hedge: Start a duplicate request when the first exceeds the p95
+            latency; None follows hedging_enabled()
+
+    Returns:
+        The gateway response
+    """
+    policy = policy or RetryPolicy()
+    if hedge is None:
+        hedge = hedging_enabled()
+    breaker = get_circuit_breaker(model_id)
+    tracker = get_latency_tracker(model_id)
+    budget = _current_retry_budget.get()
+    attempt = 0
+
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for model {model_id}; Katonic gateway is failing")
+
+        start_time = time.time()
+        try:
+            hedge_after = tracker.percentile(95) if hedge else None
+            result = hedged_call(fn, hedge_after, model_id) if hedge_after else fn()
+        except Exception as e:
+            retryable = is_retryable_error(e)
+            if retryable:
+                breaker.record_failure()
+            else:
+                # A rejected request is the caller's fault, not the gateway's
+                breaker.release_trial()
+            attempt += 1
+            if not retryable or attempt >= policy.max_attempts:
+                raise
+            if budget is not None and not budget.consume():
+                raise
+            time.sleep(policy.backoff_delay(attempt))
+            continue
+
+        breaker.record_success()
+        tracker.record(time.time() - start_time)
+        return result
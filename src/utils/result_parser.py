@@ -2,8 +2,34 @@
 Parse CrewAI results into structured format
 """
 
-import json
-import re
+from src.utils.json_extractor import iter_json_objects
+
+
+def find_key_owner(obj, key):
+    """
+    Return the first dictionary, at any nesting depth, that contains `key`
+    
+    Args:
+        obj: Parsed JSON value
+        key: Key to look for
+        
+    Returns:
+        dict: Owning dictionary, or None
+    """
+    if isinstance(obj, dict):
+        if key in obj:
+            return obj
+        children = obj.values()
+    elif isinstance(obj, list):
+        children = obj
+    else:
+        return None
+    
+    for child in children:
+        owner = find_key_owner(child, key)
+        if owner is not None:
+            return owner
+    return None
 
 
 def parse_crew_result(result):
@@ -19,10 +45,6 @@ def parse_crew_result(result):
     
     result_text = str(result)
     
-    # Try to extract JSON from the result
-    json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-    json_matches = re.findall(json_pattern, result_text, re.DOTALL)
-    
     parsed_data = {
         'raw_output': result_text,
         'parsed_json': [],
@@ -31,25 +53,24 @@ def parse_crew_result(result):
         'recommendations': None
     }
     
-    for match in json_matches:
-        try:
-            json_obj = json.loads(match)
-            parsed_data['parsed_json'].append(json_obj)
-            
-            # Extract score if present
-            if 'total_score' in json_obj:
-                parsed_data['score'] = json_obj['total_score']
-                parsed_data['score_breakdown'] = json_obj
-            
-            # Extract qualification
-            if 'qualification_status' in json_obj:
-                parsed_data['qualification'] = json_obj['qualification_status']
-            
-            # Extract recommendations
-            if 'next_action' in json_obj:
-                parsed_data['recommendations'] = json_obj
-                
-        except json.JSONDecodeError:
-            continue
+    # Extract every top-level JSON object in one pass over the text
+    for json_obj in iter_json_objects(result_text):
+        parsed_data['parsed_json'].append(json_obj)
+        
+        # Extract score if present
+        score_owner = find_key_owner(json_obj, 'total_score')
+        if score_owner is not None:
+            parsed_data['score'] = score_owner['total_score']
+            parsed_data['score_breakdown'] = score_owner
+        
+        # Extract qualification
+        qualification_owner = find_key_owner(json_obj, 'qualification_status')
+        if qualification_owner is not None:
+            parsed_data['qualification'] = qualification_owner['qualification_status']
+        
+        # Extract recommendations
+        recommendation_owner = find_key_owner(json_obj, 'next_action')
+        if recommendation_owner is not None:
+            parsed_data['recommendations'] = recommendation_owner
     
     return parsed_data
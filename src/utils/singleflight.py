@@ -0,0 +1,77 @@
+"""
+Coalescing of identical in-flight calls
+"""
+
+import threading
+
+
+class _Call:
+    """
+    State of one in-flight call shared by its waiters
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time
+
+    Callers arriving while a call with the same key is in flight wait for it
+    and receive its result, or its exception, instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.counters = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """
+        Run `fn` for `key`, or join an identical call already in flight
+
+        Args:
+            key: Hashable call key
+            fn: Zero-argument callable
+
+        Returns:
+            The result of the shared call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.counters['executed'] += 1
+            else:
+                self.counters['coalesced'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """
+        Return the number of executed and coalesced calls
+        """
+        with self._lock:
+            return dict(self.counters)
+
+
+default_singleflight = SingleFlight()
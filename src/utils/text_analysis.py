@@ -0,0 +1,193 @@
+"""
+Single-pass extraction of scores and recommendations from text analyses
+"""
+
+import re
+
+
+# Section headers requested by the prompt in simple_lead_qualification
+SECTION_PATTERN = re.compile(
+    r'^[\s#*=\-]*(contact information|company analysis|scoring breakdown|score breakdown|'
+    r'qualification level|qualification|recommendations?|final assessment)\b[\s*:]*',
+    re.IGNORECASE
+)
+FRACTION_PATTERN = re.compile(r'(\d{1,3})\s*/\s*(100|40|20)\b')
+QUALIFICATION_PATTERN = re.compile(r'\b(hot|warm|cold)\b', re.IGNORECASE)
+PRIORITY_PATTERN = re.compile(r'\b(high|medium|low)\b', re.IGNORECASE)
+BULLET_PATTERN = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s*')
+LABEL_PATTERN = re.compile(r'^([^:]{1,60}):\s*(.*)$')
+
+# (label keywords, result key, denominator) in match priority order
+BREAKDOWN_LABELS = (
+    (('overall', 'total'), 'score', '100'),
+    (('email', 'domain'), 'email_domain_score', '20'),
+    (('company', 'fit'), 'company_fit_score', '40'),
+    (('role', 'contact'), 'role_score', '20'),
+    (('intent', 'message'), 'message_intent_score', '20'),
+)
+
+SECTION_KEYS = {
+    'contact information': 'contact',
+    'company analysis': 'company',
+    'scoring breakdown': 'scoring',
+    'score breakdown': 'scoring',
+    'qualification level': 'qualification',
+    'qualification': 'qualification',
+    'recommendation': 'recommendations',
+    'recommendations': 'recommendations',
+    'final assessment': 'final',
+}
+
+
+def classify_fraction(label, denominator):
+    """
+    Map the text before an "X/Y" figure to a score field
+
+    Args:
+        label: Text preceding the figure on its line
+        denominator: '100', '40' or '20'
+
+    Returns:
+        str: Result key, or None if the label is not recognised
+    """
+    label = label.lower()
+    for keywords, key, expected in BREAKDOWN_LABELS:
+        if expected == denominator and any(keyword in label for keyword in keywords):
+            return key
+    if denominator == '100' and 'score' in label:
+        return 'score'
+    return None
+
+
+def is_section_header(line, header):
+    """
+    Accept a header match only if it is upper case, ends with a colon or
+    stands alone on its line, so prose such as "Recommendations for..." is
+    not mistaken for a section
+    """
+    name = header.group(1)
+    return name.isupper() or ':' in header.group(0) or not line[header.end():].strip()
+
+
+def parse_text_analysis(text_response):
+    """
+    Parse text response into structured format
+
+    The response is split into lines once. Figures inside the SCORING
+    BREAKDOWN section, the first Hot/Warm/Cold inside QUALIFICATION LEVEL
+    and the RECOMMENDATIONS section take precedence; labelled figures and
+    qualifiers elsewhere are used only when a section is missing.
+
+    Args:
+        text_response: Free-text analysis
+
+    Returns:
+        dict: Result with score, qualification, score_breakdown,
+            recommendations, analysis_summary, contact_info and company_analysis
+    """
+    result = {
+        'score': 0,
+        'qualification': 'Unknown',
+        'score_breakdown': {},
+        'recommendations': {},
+        'analysis_summary': text_response,
+        'contact_info': {},
+        'company_analysis': {}
+    }
+
+    section = None
+    in_section = {}
+    fallback = {}
+    qualification = None
+    fallback_qualification = None
+    recommendation_lines = []
+    mentions_recommendation = False
+
+    for line in text_response.splitlines():
+        header = SECTION_PATTERN.match(line)
+        if header and is_section_header(line, header):
+            section = SECTION_KEYS[header.group(1).lower()]
+            if section == 'recommendations':
+                mentions_recommendation = True
+            # Content may follow the header on the same line
+            line = line[header.end():]
+            if not line.strip():
+                continue
+
+        if not mentions_recommendation and 'recommend' in line.lower():
+            mentions_recommendation = True
+
+        for match in FRACTION_PATTERN.finditer(line):
+            key = classify_fraction(line[:match.start()], match.group(2))
+            if key is None:
+                continue
+            target = in_section if section == 'scoring' else fallback
+            target.setdefault(key, int(match.group(1)))
+
+        qualifier = QUALIFICATION_PATTERN.search(line)
+        if qualifier:
+            if section == 'qualification' and qualification is None:
+                qualification = qualifier.group(1).title()
+            elif fallback_qualification is None:
+                fallback_qualification = qualifier.group(1).title()
+
+        if section == 'recommendations' and line.strip():
+            recommendation_lines.append(BULLET_PATTERN.sub('', line).strip())
+
+    scores = dict(fallback)
+    scores.update(in_section)
+    if 'score' in scores:
+        result['score'] = scores.pop('score')
+    result['score_breakdown'] = scores
+
+    result['qualification'] = qualification or fallback_qualification or 'Unknown'
+
+    if recommendation_lines:
+        result['recommendations'] = parse_recommendation_lines(recommendation_lines)
+    elif mentions_recommendation:
+        result['recommendations'] = {
+            'next_action': 'Review analysis for specific recommendations',
+            'priority': 'Medium',
+            'reasoning': 'See detailed analysis above'
+        }
+
+    return result
+
+
+def parse_recommendation_lines(lines):
+    """
+    Build the recommendations dictionary from the RECOMMENDATIONS section
+
+    Args:
+        lines: Non-empty lines of the section with bullets removed
+
+    Returns:
+        dict: next_action, priority and reasoning
+    """
+    next_action = None
+    priority = None
+    reasoning = []
+
+    for line in lines:
+        label_match = LABEL_PATTERN.match(line)
+        label = label_match.group(1).lower() if label_match else ''
+        value = label_match.group(2).strip() if label_match else line
+
+        if 'priority' in label or (priority is None and 'priority' in line.lower()):
+            level = PRIORITY_PATTERN.search(value) or PRIORITY_PATTERN.search(line)
+            if level and priority is None:
+                priority = level.group(1).title()
+                continue
+        if next_action is None and ('action' in label or 'next step' in label):
+            next_action = value
+            continue
+        reasoning.append(value if 'reason' in label else line)
+
+    if next_action is None and reasoning:
+        next_action = reasoning.pop(0)
+
+    return {
+        'next_action': next_action or 'Review analysis for specific recommendations',
+        'priority': priority or 'Medium',
+        'reasoning': ' '.join(reasoning) or 'See detailed analysis above'
+    }
@@ -4,6 +4,8 @@ Input validation utilities
 
 import re
 
+from .domain_index import email_domain_category
+
 
 def validate_email(email):
     """
@@ -19,6 +21,19 @@ def validate_email(email):
     return bool(re.match(pattern, email))
 
 
+def is_disposable_email(email):
+    """
+    Check whether an email address uses a disposable mailbox service
+    
+    Args:
+        email: Email address
+        
+    Returns:
+        bool: True if the domain is in the disposable domain list
+    """
+    return email_domain_category(email) == 'disposable'
+
+
 def validate_form_data(name, company, email, query):
     """
     Validate form submission data
@@ -39,6 +54,9 @@ def validate_form_data(name, company, email, query):
     if not validate_email(email):
         return False, "Invalid email address format"
     
+    if is_disposable_email(email):
+        return False, "Disposable email addresses are not accepted"
+    
     if len(name) < 2:
         return False, "Name is too short"
     
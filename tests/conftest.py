@@ -0,0 +1,12 @@
+"""
+Shared test setup
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the default on-disk caches out of the user's cache directory
+os.environ.setdefault('LEAD_QUALIFICATION_CACHE_DIR', tempfile.mkdtemp(prefix='lead-qualification-tests-'))
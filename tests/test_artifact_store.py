@@ -0,0 +1,73 @@
+"""
+Tests for the stage artifact store and cache locations
+"""
+
+import os
+
+from src.utils import artifact_store, llm_cache
+from src.utils.artifact_store import StageArtifactStore, make_context_key
+from src.utils.cache_paths import cache_dir, default_cache_path
+
+
+def test_context_keys_depend_on_every_part():
+    key = make_context_key('model', 0.3, {'industries': ['Technology']})
+
+    assert key == make_context_key('model', 0.3, {'industries': ['Technology']})
+    assert key != make_context_key('model', 0.3, {'industries': ['Finance']})
+    assert key != make_context_key('model', 0.7, {'industries': ['Technology']})
+
+
+def test_artifacts_are_keyed_by_lead_stage_and_context():
+    store = StageArtifactStore()
+    store.put('lead', 'score', 'config-a', {'total_score': 80}, 'raw a')
+
+    assert store.get('lead', 'score', 'config-a') == ({'total_score': 80}, 'raw a')
+    assert store.get('lead', 'score', 'config-b') is None
+    assert store.get('other', 'score', 'config-a') is None
+    assert store.stats()['hits'] == 1 and store.stats()['misses'] == 2
+
+
+def test_stored_data_is_copied():
+    store = StageArtifactStore()
+    data = {'industry': 'Technology'}
+    store.put('lead', 'company', 'model', data)
+    data['industry'] = 'Retail'
+    store.get('lead', 'company', 'model')[0]['industry'] = 'Finance'
+
+    assert store.get('lead', 'company', 'model')[0] == {'industry': 'Technology'}
+
+
+def test_disk_store_persists_and_invalidates(tmp_path):
+    path = str(tmp_path / 'nested' / 'artifacts.sqlite3')
+    store = StageArtifactStore(path)
+    for stage in ('contact', 'company', 'score', 'recommendation'):
+        store.put('lead', stage, 'key', {'stage': stage})
+    store.put('other', 'score', 'key', {'stage': 'score'})
+
+    reopened = StageArtifactStore(path)
+    assert reopened.get('lead', 'company', 'key') == ({'stage': 'company'}, '')
+    assert reopened.invalidate(fingerprint='lead') == 2
+    assert reopened.get('lead', 'score', 'key') is None
+    assert reopened.get('other', 'score', 'key') is not None
+    assert reopened.get('lead', 'contact', 'key') is not None
+
+
+def test_default_paths_do_not_depend_on_the_working_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv('LEAD_QUALIFICATION_CACHE_DIR', raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    monkeypatch.chdir(tmp_path)
+
+    assert cache_dir() == str(tmp_path / 'xdg' / 'lead-qualification')
+    monkeypatch.setenv('LEAD_QUALIFICATION_CACHE_DIR', 'relative')
+    assert default_cache_path('a.sqlite3') == str(tmp_path / 'relative' / 'a.sqlite3')
+
+
+def test_default_stores_use_the_cache_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv('LEAD_QUALIFICATION_CACHE_DIR', str(tmp_path))
+    for name in ('STAGE_ARTIFACT_PATH', 'LLM_CACHE_PATH'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(artifact_store, '_default_store', None)
+    monkeypatch.setattr(llm_cache, '_default_cache', None)
+
+    assert artifact_store.get_artifact_store().path == os.path.join(str(tmp_path), 'stage_artifacts.sqlite3')
+    assert llm_cache.get_response_cache().path == os.path.join(str(tmp_path), 'llm_responses.sqlite3')
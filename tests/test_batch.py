@@ -0,0 +1,111 @@
+"""
+Tests for batch qualification
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('crewai')
+
+from src.crew import batch
+
+
+MODEL = {'model_id': 'model', 'user_email': 'user@example.com', 'project_name': 'project', 'model_name': 'gpt'}
+TARGET = {'industries': ['Technology'], 'company_sizes': ['SMB (51-500)'], 'regions': ['Europe']}
+
+
+def test_results_keep_input_order_and_errors_stay_per_lead(monkeypatch):
+    def fake_qualify(lead, target_config, model_config, registry=None, **kwargs):
+        if lead.get('email') == 'bad@example.com':
+            raise RuntimeError('gateway down')
+        time.sleep(0.01 if lead['id'] == 'a' else 0)
+        return lead['email']
+
+    monkeypatch.setattr(batch, 'qualify_lead', fake_qualify)
+    leads = [{'id': 'a', 'email': 'a@example.com'}, {'email': 'bad@example.com'}, {'id': 'c', 'email': 'c@example.com'}]
+
+    results = batch.run_batch_qualification(leads, TARGET, max_concurrency=3, **MODEL)
+
+    assert [entry['id'] for entry in results] == ['a', 1, 'c']
+    assert results[0] == {'id': 'a', 'result': 'a@example.com', 'error': None}
+    assert results[1]['result'] is None and 'gateway down' in results[1]['error']
+
+
+def test_max_concurrency_bounds_leads_in_flight(monkeypatch):
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def fake_qualify(lead, *args, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return lead['email']
+
+    monkeypatch.setattr(batch, 'qualify_lead', fake_qualify)
+    leads = [{'email': f'{index}@example.com'} for index in range(8)]
+
+    batch.run_batch_qualification(leads, TARGET, max_concurrency=2, **MODEL)
+
+    assert peak[0] == 2
+
+
+@pytest.mark.parametrize('options', [
+    {'pack': True, 'pipeline': True},
+    {'pack': True, 'cascade': True},
+    {'pack': True, 'artifact_store': object()},
+    {'pack': True, 'stage_workers': 2},
+    {'pipeline': True, 'backend': 'fused'},
+    {'pipeline': True, 'concurrent': True},
+    {'pipeline': True, 'max_concurrency': 4},
+    {'token_budget': 1000},
+    {'stage_queue_sizes': 4},
+])
+def test_conflicting_batch_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        batch.run_batch_qualification([], TARGET, **options, **MODEL)
+
+
+def test_packed_batch_reports_malformed_leads_per_lead(monkeypatch):
+    from src.crew import stages
+
+    monkeypatch.setattr(stages, 'run_pack', lambda stage, header, pack, llm: {
+        key: {'total_score': 85, 'qualification_status': 'Qualified', 'next_action': 'Forward to Sales',
+              'industry': 'Technology', 'sender_name': 'A'} for key, _ in pack
+    })
+    leads = [{'id': 'x', 'nonsense': True},
+             {'sender_email': 'a@x.com', 'email_subject': 'Hi', 'email_content': 'Pricing'}]
+
+    results = batch.run_batch_qualification(leads, TARGET, pack=True, **MODEL)
+
+    assert results[0]['id'] == 0 and results[0]['result'] is None and 'Lead must be' in results[0]['error']
+    assert results[1]['error'] is None and results[1]['result'].score.total_score == 85
+
+
+def test_pipeline_reads_the_leads_lazily_and_returns_them_in_order(monkeypatch):
+    read = []
+
+    def leads():
+        for index in range(4):
+            read.append(index)
+            yield {'email': f'{index}@example.com'}
+
+    def fake_pipeline(leads, target_config, **kwargs):
+        assert not isinstance(leads, list)
+        iterator = iter(leads)
+        first = next(iterator)
+        assert read == [0]
+        entries = [(0, first)] + list(enumerate(iterator, start=1))
+        for index, lead in reversed(entries):
+            yield index, {'id': index, 'result': lead['email'], 'error': None}
+
+    monkeypatch.setattr(batch, 'run_pipelined_qualification', fake_pipeline)
+
+    results = batch.run_batch_qualification(leads(), TARGET, pipeline=True, **MODEL)
+
+    assert [entry['result'] for entry in results] == [f'{index}@example.com' for index in range(4)]
@@ -0,0 +1,147 @@
+"""
+Tests for the cheap-first qualification cascade
+"""
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('katonic')
+
+from src.crew import cascade
+from src.crew.cascade import CascadeStats, run_cascade_qualification, run_local_tier
+from src.models.lead import Lead
+from src.scoring.rubric import qualification_status
+
+
+TARGET = {'industries': ['Technology'], 'company_sizes': ['Enterprise (500+)'], 'regions': ['North America']}
+
+
+def form_lead(designation='CTO', email='ada@microsoft.com', query='We need pricing and a demo for 300 seats'):
+    return Lead(kind='form', email=email, name='Ada Lovelace', company='Microsoft', designation=designation,
+                content=query)
+
+
+# Rubric without the lines that need research
+NO_RESEARCH_WEIGHTS = {'email_domain': 20, 'industry': 0, 'company_size': 10, 'region': 0, 'role': 20,
+                       'message_intent': 20}
+
+
+def test_lead_is_qualified_locally_when_research_cannot_change_it():
+    result, confidence = run_local_tier(form_lead(), TARGET, NO_RESEARCH_WEIGHTS)
+
+    assert confidence == 1.0
+    assert result.score.qualification_status == 'Qualified'
+    assert result.recommendation['next_action'] == 'Forward to Sales'
+
+
+def test_strong_lead_escalates_when_research_could_change_its_status():
+    target = {'industries': ['Healthcare'], 'company_sizes': ['Enterprise (500+)'], 'regions': ['Latin America']}
+    result, confidence = run_local_tier(form_lead(designation='VP Engineering'), target)
+
+    assert result.score.total_score == 70
+    assert result.score.qualification_status == 'Needs Review'
+    assert confidence < cascade.DEFAULT_THRESHOLDS['local']
+
+
+@pytest.mark.parametrize('lead', [
+    form_lead(), form_lead(email='ada@analytical-engines.com'), form_lead(designation='Intern', query='hi'),
+    form_lead(email='ada@gmail.com'), Lead(kind='email', email='cto@microsoft.com', subject='Pricing',
+                                           content='I am the CTO at Microsoft and need pricing.')
+])
+def test_status_agrees_with_the_total(lead):
+    result, _ = run_local_tier(lead, TARGET)
+
+    assert result.score.qualification_status == qualification_status(result.score.total_score)
+
+
+def test_unknown_company_fit_is_uncertain():
+    result, confidence = run_local_tier(form_lead(email='ada@analytical-engines.com'), TARGET)
+
+    assert result.score.qualification_status == 'Needs Review'
+    assert confidence < cascade.DEFAULT_THRESHOLDS['local']
+
+
+def test_disposable_address_is_a_hard_negative():
+    result, confidence = run_local_tier(form_lead(email='ada@mailinator.com'), TARGET)
+
+    assert result.score.qualification_status == 'Unqualified'
+    assert confidence == 1.0
+
+
+def test_spam_wording_escalates_instead_of_rejecting():
+    lead = form_lead(query='Pricing please. We also offer SEO services, click here')
+    result, confidence = run_local_tier(lead, TARGET)
+
+    assert confidence <= cascade.SPAM_CONFIDENCE < cascade.DEFAULT_THRESHOLDS['local']
+
+
+def fake_fused(monkeypatch, confidence=None, error=None):
+    calls = []
+
+    def run(lead, *args, **kwargs):
+        calls.append(lead)
+        if error:
+            raise error
+        result, _ = run_local_tier(lead, TARGET)
+        return result, confidence
+
+    monkeypatch.setattr(cascade, 'run_fused_qualification', run)
+    return calls
+
+
+def fake_crew(monkeypatch):
+    calls = []
+
+    def run(**kwargs):
+        calls.append(kwargs)
+        result, _ = run_local_tier(form_lead(), TARGET)
+        return result
+
+    monkeypatch.setattr(cascade, 'run_form_qualification', run)
+    return calls
+
+
+def cascade_args():
+    return dict(target_config=TARGET, model_id='model', user_email='me@example.com', project_name='project',
+                model_name='name')
+
+
+def test_local_answer_skips_the_llm_tiers(monkeypatch):
+    fused, crew, stats = fake_fused(monkeypatch, 1.0), fake_crew(monkeypatch), CascadeStats()
+
+    run_cascade_qualification(form_lead(), scoring_weights=NO_RESEARCH_WEIGHTS, stats=stats, **cascade_args())
+
+    assert not fused and not crew
+    assert stats.stats()['local']['accepted'] == 1
+
+
+def test_confident_fused_answer_skips_the_crew(monkeypatch):
+    fused, crew, stats = fake_fused(monkeypatch, 0.8), fake_crew(monkeypatch), CascadeStats()
+
+    run_cascade_qualification(form_lead(query='SEO services, click here'), stats=stats, **cascade_args())
+
+    assert len(fused) == 1 and not crew
+    assert stats.stats()['fused']['accepted'] == 1
+
+
+@pytest.mark.parametrize('confidence, error', [(0.5, None), (None, RuntimeError('down'))])
+def test_uncertain_or_failed_fused_call_reaches_the_crew(monkeypatch, confidence, error):
+    fused, crew, stats = fake_fused(monkeypatch, confidence, error), fake_crew(monkeypatch), CascadeStats()
+    lead = form_lead(email='ada@analytical-engines.com')
+
+    result = run_cascade_qualification(lead, stats=stats, **cascade_args())
+
+    assert len(fused) == 1 and len(crew) == 1
+    assert result.lead is not None
+    counters = stats.stats()
+    assert counters['crew']['accepted'] == 1
+    assert counters['fused']['errors'] == int(error is not None)
+
+
+def test_thresholds_can_be_overridden(monkeypatch):
+    fused, crew = fake_fused(monkeypatch, 0.6), fake_crew(monkeypatch)
+    lead = form_lead(email='ada@analytical-engines.com')
+
+    run_cascade_qualification(lead, thresholds={'local': 0.5}, stats=CascadeStats(), **cascade_args())
+
+    assert not fused and not crew
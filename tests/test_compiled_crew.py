@@ -0,0 +1,99 @@
+"""
+Tests for routing leads through compiled crews
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('katonic')
+
+from src.agents.registry import AgentRegistry
+from src.crew import lead_crew
+from src.utils.artifact_store import StageArtifactStore
+
+
+TARGET = {'industries': ['Technology'], 'company_sizes': ['Enterprise (500+)'], 'regions': ['North America']}
+
+ANSWERS = {
+    'contact': {'sender_name': 'Ada Lovelace', 'company_name': 'Analytical', 'email': 'ada@analytical.com'},
+    'company': {'industry': 'Technology', 'company_size': 'Enterprise (500+)', 'location': 'North America'},
+    'score': {'total_score': 85, 'qualification_status': 'Qualified'},
+    'recommendation': {'next_action': 'Forward to Sales', 'priority': 'High', 'reasoning': 'Strong fit'}
+}
+
+
+class FakeCrew:
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.kickoffs = []
+
+    def kickoff(self, inputs=None):
+        self.kickoffs.append(inputs)
+        stages = ('contact', 'company', 'score', 'recommendation')[-len(self.tasks):]
+        return SimpleNamespace(tasks_output=[
+            SimpleNamespace(pydantic=None, json_dict=ANSWERS[stage], raw=json.dumps(ANSWERS[stage]))
+            for stage in stages
+        ])
+
+
+@pytest.fixture
+def crews(monkeypatch):
+    built = []
+
+    def compile_crew(agents, tasks):
+        built.append(FakeCrew(tasks))
+        return built[-1]
+
+    monkeypatch.setattr(lead_crew, 'compile_crew', compile_crew)
+    monkeypatch.setattr(lead_crew, 'create_lead_qualification_agents', lambda **kwargs: {})
+    monkeypatch.setattr(lead_crew, 'create_email_task_templates',
+                        lambda agents, target_config, known_contact=False: ['research'] * (3 if known_contact else 4))
+    monkeypatch.setattr(lead_crew, 'create_form_task_templates',
+                        lambda agents, target_config, known_contact=False: ['research'] * (3 if known_contact else 4))
+    return built
+
+
+def qualify_form(registry, store):
+    return lead_crew.run_form_qualification('Ada Lovelace', 'Analytical', 'CTO', 'ada@analytical.com',
+                                            'Can we see pricing?', TARGET, 'model', 'user@example.com',
+                                            'project', 'model', registry=registry, artifact_store=store)
+
+
+def test_staged_form_runs_through_compiled_crew_with_known_contact(crews):
+    registry, store = AgentRegistry(), StageArtifactStore()
+
+    result = qualify_form(registry, store)
+
+    assert len(crews) == 1 and len(crews[0].tasks) == 3
+    inputs = crews[0].kickoffs[0]
+    assert inputs['name'] == 'Ada Lovelace'
+    assert json.loads(inputs['known_contact'])['email'] == 'ada@analytical.com'
+    assert result.score.total_score == 85
+    assert result.recommendation['next_action'] == 'Forward to Sales'
+    # The local contact is rebuilt each run, so only the crew's stages are stored
+    assert store.stats()['writes'] == 3
+
+
+def test_stored_artifacts_skip_the_crew(crews):
+    registry, store = AgentRegistry(), StageArtifactStore()
+    qualify_form(registry, store)
+
+    result = qualify_form(registry, store)
+
+    assert len(crews[0].kickoffs) == 1
+    assert result.score.total_score == 85
+
+
+def test_compiled_crew_is_reused_across_leads(crews):
+    registry = AgentRegistry()
+    for subject in ('Pricing', 'Demo'):
+        lead_crew.run_email_qualification('ada@analytical.com', subject, 'Hi', TARGET, 'model',
+                                          'user@example.com', 'project', 'model', registry=registry,
+                                          local_structuring=False)
+
+    assert len(crews) == 1
+    assert len(crews[0].tasks) == 4
+    assert [inputs['email_subject'] for inputs in crews[0].kickoffs] == ['Pricing', 'Demo']
@@ -0,0 +1,106 @@
+"""
+Tests for adaptive gateway concurrency
+"""
+
+import threading
+
+import pytest
+
+from src.utils.concurrency import AdaptiveConcurrencyLimiter
+
+
+class GatewayError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f'HTTP {status_code}')
+        self.status_code = status_code
+
+
+def saturate(limiter, latency=0.1):
+    """
+    Complete one call with every slot taken
+    """
+    for _ in range(limiter.limit):
+        limiter.acquire()
+    for _ in range(limiter.limit):
+        limiter.release(latency)
+
+
+def test_saturated_successes_raise_the_limit_additively():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4, cooldown=0)
+    saturate(limiter)
+    saturate(limiter)
+
+    assert limiter.limit == 3
+    assert limiter.stats()['decisions'][-1]['reason'] == 'saturated'
+    for _ in range(10):
+        saturate(limiter)
+    assert limiter.limit == 4
+
+
+def test_throttling_halves_the_limit_once_per_cooldown():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, cooldown=60)
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(0.1, error=GatewayError(429))
+
+    assert limiter.limit == 4
+    stats = limiter.stats()
+    assert (stats['decreases'], stats['errors']) == (1, 3)
+    assert stats['decisions'][-1]['reason'] == 'throttled'
+
+
+def test_rejected_requests_do_not_change_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, cooldown=0)
+    limiter.acquire()
+    limiter.release(0.1, error=GatewayError(400))
+
+    assert limiter.limit == 4
+
+
+def test_latency_blow_up_cuts_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, window=4, cooldown=60)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(0.1)
+    assert limiter.stats()['baseline_latency'] == pytest.approx(0.1)
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(1.0)
+
+    assert limiter.limit == 2
+    assert limiter.stats()['decisions'][-1]['reason'] == 'latency'
+
+
+def test_limit_recovers_after_latency_rises_for_good():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8, window=4, cooldown=0)
+    for _ in range(4):
+        saturate(limiter, latency=0.1)
+
+    # The gateway's normal latency steps up and stays up
+    for _ in range(30):
+        saturate(limiter, latency=1.0)
+
+    stats = limiter.stats()
+    assert stats['decreases'] == 1
+    assert stats['baseline_latency'] == pytest.approx(1.0)
+    assert limiter.limit >= 4
+    assert stats['decisions'][-1]['reason'] == 'saturated'
+
+
+def test_callers_block_at_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    limiter.acquire()
+    entered = threading.Event()
+
+    def call():
+        with limiter.slot():
+            entered.set()
+
+    thread = threading.Thread(target=call)
+    thread.start()
+    assert not entered.wait(0.05)
+    limiter.release(0.1)
+    thread.join(5)
+    assert entered.is_set()
+    assert limiter.stats()['in_flight'] == 0
@@ -0,0 +1,99 @@
+"""
+Tests for the memory-mapped email domain index
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.utils import domain_index
+from src.utils.domain_index import DomainIndex, HEADER, build_domain_index, email_domain_category
+
+
+@pytest.fixture
+def lists(tmp_path):
+    directory = tmp_path / 'lists'
+    directory.mkdir()
+    (directory / 'freemail.txt').write_text('# free mail\ngmail.com\nyahoo.co.uk\n')
+    (directory / 'disposable.txt').write_text('mailinator.com\ngmail.com  # also listed as free mail\n')
+    (directory / 'corporate.txt').write_text('microsoft.com\n')
+    (directory / 'public_suffixes.txt').write_text('co.uk\n')
+    return str(directory)
+
+
+def test_build_writes_sorted_records(tmp_path, lists):
+    path = str(tmp_path / 'index.bin')
+
+    assert build_domain_index(path, lists) == 5
+    with open(path, 'rb') as handle:
+        magic, width, count = HEADER.unpack_from(handle.read(HEADER.size))
+    assert (magic, width, count) == (b'DIX1', len('mailinator.com') + 1, 5)
+
+
+@pytest.mark.parametrize('domain, category', [
+    ('gmail.com', 'freemail'), ('GMAIL.COM.', 'freemail'), ('mailinator.com', 'disposable'),
+    ('microsoft.com', 'corporate'), ('uk.mail.yahoo.co.uk', 'freemail'), ('mail.microsoft.com', 'corporate'),
+    ('acme.com', 'unknown'), ('co.uk', 'unknown'), ('', 'unknown'), ('a' * 80 + '.com', 'unknown')
+])
+def test_classify(tmp_path, lists, domain, category):
+    index = DomainIndex(str(tmp_path / 'index.bin'), lists)
+
+    assert index.classify(domain) == category
+
+
+def test_domain_type_and_registrable_domain(tmp_path, lists):
+    index = DomainIndex(str(tmp_path / 'index.bin'), lists)
+
+    assert index.registrable_domain('mail.acme.co.uk') == 'acme.co.uk'
+    assert index.registrable_domain('eu.mail.acme.com') == 'acme.com'
+    assert index.domain_type('gmail.com') == 'personal'
+    assert index.domain_type('acme.com') == 'business'
+
+
+def test_stale_index_is_rebuilt(tmp_path, lists):
+    path = str(tmp_path / 'index.bin')
+    build_domain_index(path, lists)
+    with open(f'{lists}/corporate.txt', 'a') as handle:
+        handle.write('acme.com\n')
+    os.utime(f'{lists}/corporate.txt', (os.path.getmtime(path) + 10,) * 2)
+
+    assert DomainIndex(path, lists).classify('acme.com') == 'corporate'
+
+
+def test_foreign_file_is_rejected(tmp_path, lists):
+    path = tmp_path / 'index.bin'
+    path.write_bytes(b'NOPE' + bytes(16))
+    index = DomainIndex(str(path), str(tmp_path / 'missing'))
+
+    with pytest.raises(ValueError):
+        index.lookup('gmail.com')
+    assert index._map is None
+
+
+def test_concurrent_first_lookups_see_a_loaded_index(tmp_path, lists):
+    index = DomainIndex(str(tmp_path / 'index.bin'), lists)
+    start = threading.Barrier(8)
+    results = []
+
+    def classify():
+        start.wait()
+        results.append(index.classify('gmail.com'))
+
+    threads = [threading.Thread(target=classify) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['freemail'] * 8
+
+
+def test_default_index_lives_in_the_cache_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv('LEAD_QUALIFICATION_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('DOMAIN_INDEX_PATH', raising=False)
+    monkeypatch.setattr(domain_index, '_default_index', None)
+
+    assert domain_index.get_domain_index().path == str(tmp_path / 'domain_index.bin')
+    assert email_domain_category('someone@gmail.com') == 'freemail'
+    assert email_domain_category('not-an-email') == 'unknown'
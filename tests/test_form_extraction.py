@@ -0,0 +1,55 @@
+"""
+Tests for structuring form submissions locally
+"""
+
+import pytest
+
+from src.extraction.form import classify_intent, email_domain, structure_form
+
+
+def test_form_fields_are_copied_and_derived():
+    contact = structure_form(' Ada Lovelace ', 'Analytical Engines', 'CTO', 'Ada@Analytical.com ',
+                             'We would like pricing for 200 seats')
+
+    assert contact == {
+        'sender_name': 'Ada Lovelace',
+        'company_name': 'Analytical Engines',
+        'designation': 'CTO',
+        'email': 'Ada@Analytical.com',
+        'domain': 'analytical.com',
+        'domain_type': 'business',
+        'intent': 'Pricing / purchase inquiry'
+    }
+
+
+def test_missing_designation_and_personal_domain():
+    contact = structure_form('Bob', 'Shop', 'n/a', 'bob@gmail.com', 'hello')
+
+    assert contact['designation'] == 'Not provided'
+    assert contact['domain_type'] == 'personal'
+    assert contact['intent'] == 'Unclear'
+
+
+@pytest.mark.parametrize('query, intent', [
+    ('Can we get a quote?', 'Pricing / purchase inquiry'),
+    ('I would like a demo next week', 'Demo / trial request'),
+    ('How do we integrate with Salesforce?', 'Implementation / integration inquiry'),
+    ('Interested in becoming a reseller', 'Partnership inquiry'),
+    ('Our dashboard is broken', 'Support request'),
+    ('Are you hiring engineers?', 'Job application'),
+    ('We offer SEO services for your site', 'Spam / unsolicited offer'),
+    ('Tell me more about your company', 'General inquiry'),
+    ('', 'Unclear'),
+])
+def test_intent_buckets(query, intent):
+    assert classify_intent(query) == intent
+
+
+def test_pricing_wins_over_a_demo_in_the_same_query():
+    assert classify_intent('Demo first, then pricing') == 'Pricing / purchase inquiry'
+
+
+def test_email_domain():
+    assert email_domain('a@B.Example.COM') == 'b.example.com'
+    assert email_domain('not-an-email') == ''
+    assert email_domain(None) == ''
@@ -0,0 +1,100 @@
+"""
+Tests for single-call qualification and its repair loop
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('katonic')
+
+from src.crew import fused
+from src.crew.fused import FUSED_JSON_SCHEMA, parse_fused_response, repair_prompt, run_fused_qualification
+from src.models.lead import Lead
+
+
+TARGET = {'industries': ['Technology'], 'company_sizes': ['Enterprise (500+)'], 'regions': ['North America']}
+
+LEAD = Lead(kind='form', email='ada@analytical.com', name='Ada Lovelace', company='Analytical', designation='CTO',
+            content='Pricing for 300 seats')
+
+ANSWER = {
+    'contact': {'sender_name': 'Ada Lovelace', 'company_name': 'Analytical', 'designation': 'CTO'},
+    'company': {'industry': 'Technology', 'company_size': 'Enterprise (500+)', 'location': 'Boston'},
+    'score': {'total_score': 90, 'email_domain_score': 20, 'company_fit_score': 30, 'role_score': 20,
+              'message_intent_score': 20, 'qualification_status': 'Qualified'},
+    'recommendation': {'next_action': 'Forward to Sales', 'priority': 'High', 'reasoning': 'Strong fit'},
+    'confidence': 0.85
+}
+
+
+class FakeLLM:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+        self.forgotten = []
+
+    def generate_completion(self, prompt):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+    def forget(self, prompt):
+        self.forgotten.append(prompt)
+
+
+def invalid_answer():
+    answer = dict(ANSWER, score=dict(ANSWER['score'], role_score=45))
+    return 'Here you go: ' + json.dumps(answer)
+
+
+def test_valid_answer_becomes_a_result():
+    result, confidence = parse_fused_response('Sure.\n' + json.dumps(ANSWER), LEAD)
+
+    assert confidence == 0.85
+    assert result.score.total_score == 90
+    assert result.recommendation['next_action'] == 'Forward to Sales'
+    assert result.lead is LEAD
+
+
+@pytest.mark.parametrize('response', ['no json here', invalid_answer(), json.dumps(dict(ANSWER, extra=1))])
+def test_invalid_answers_are_rejected(response):
+    with pytest.raises(ValueError):
+        parse_fused_response(response, LEAD)
+
+
+def test_first_valid_answer_is_kept():
+    llm = FakeLLM(json.dumps(ANSWER))
+
+    result, _ = run_fused_qualification(LEAD, TARGET, 'model', 'me', 'project', 'name', llm=llm)
+
+    assert len(llm.prompts) == 1 and not llm.forgotten
+    assert FUSED_JSON_SCHEMA in llm.prompts[0]
+    assert result.score.qualification_status == 'Qualified'
+
+
+def test_invalid_answer_is_evicted_and_repaired():
+    llm = FakeLLM(invalid_answer(), json.dumps(ANSWER))
+
+    result, confidence = run_fused_qualification(LEAD, TARGET, 'model', 'me', 'project', 'name', llm=llm)
+
+    assert confidence == 0.85
+    assert llm.forgotten == llm.prompts[:1]
+    repair = llm.prompts[1]
+    assert 'role_score' in repair and invalid_answer() in repair
+    assert FUSED_JSON_SCHEMA in repair and 'ada@analytical.com' in repair
+
+
+def test_repair_attempts_are_bounded(monkeypatch):
+    monkeypatch.setattr(fused, 'FUSED_REPAIR_ATTEMPTS', 1)
+    llm = FakeLLM(invalid_answer(), 'still no json')
+
+    with pytest.raises(ValueError):
+        run_fused_qualification(LEAD, TARGET, 'model', 'me', 'project', 'name', llm=llm)
+    assert llm.forgotten == llm.prompts
+
+
+def test_repair_prompt_reports_parse_errors():
+    prompt = repair_prompt(LEAD, TARGET, 'oops', ValueError('Fused answer contains no JSON object'))
+
+    assert 'contains no JSON object' in prompt and '{json_schema}' not in prompt
@@ -0,0 +1,58 @@
+"""
+Tests for the JSON object scanner
+"""
+
+from src.utils.json_extractor import JSONObjectScanner, iter_json_objects, repair_json
+
+
+def test_objects_are_found_in_prose_and_fences():
+    text = 'Thought: done.\n```json\n{"total_score": 80, "nested": {"a": [1, {"b": 2}]}}\n```\nFinal: {"x": 1}'
+
+    assert list(iter_json_objects(text)) == [{'total_score': 80, 'nested': {'a': [1, {'b': 2}]}}, {'x': 1}]
+
+
+def test_braces_and_quotes_inside_strings_are_ignored():
+    text = 'It\'s {"reason": "uses { and } and \\" quotes", "ok": true} done'
+
+    assert list(iter_json_objects(text)) == [{'reason': 'uses { and } and " quotes', 'ok': True}]
+
+
+def test_common_llm_mistakes_are_repaired():
+    assert list(iter_json_objects("{'name': 'Ada', 'active': True, 'tags': ['a', 'b',], 'x': None,}")) == [
+        {'name': 'Ada', 'active': True, 'tags': ['a', 'b'], 'x': None}
+    ]
+    assert repair_json('{"a": "it\'s", "b": False}') == '{"a": "it\'s", "b": false}'
+
+
+def test_blocks_inside_invalid_braces_are_recovered_in_order():
+    text = 'pre {note {"a": 1} and {"b": 2}} mid {"c": 3} {oops'
+
+    assert list(iter_json_objects(text)) == [{'a': 1}, {'b': 2}, {'c': 3}]
+
+
+def test_deeply_nested_invalid_block_does_not_recurse():
+    text = '{"k": ' * 1500 + '1 x' + '}' * 1500
+
+    assert list(iter_json_objects(text)) == []
+    assert list(iter_json_objects(text + ' {"after": 1}')) == [{'after': 1}]
+
+
+def test_many_unmatched_braces_do_not_hide_later_objects():
+    assert list(iter_json_objects('{"a" ' * 150 + ' {"z": 1}')) == [{'z': 1}]
+    assert list(iter_json_objects('{"a" ' * 5000 + ' {"z": 1} {"y": 2}')) == [{'z': 1}, {'y': 2}]
+
+
+def test_empty_and_brace_free_text():
+    assert list(iter_json_objects('')) == []
+    assert list(iter_json_objects('no objects {here')) == []
+
+
+def test_scanner_handles_objects_split_across_chunks():
+    text = '{"a": "x\\"}"} junk {"b": {"c": 1}}'
+    scanner = JSONObjectScanner()
+    found = []
+    for index in range(len(text)):
+        found.extend(scanner.feed(text[index]))
+
+    assert found == ['{"a": "x\\"}"}', '{"b": {"c": 1}}']
+    assert scanner.unterminated() == ''
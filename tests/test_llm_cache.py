@@ -0,0 +1,80 @@
+"""
+Tests for the tiered LLM response cache
+"""
+
+from src.utils.llm_cache import ResponseCache, make_cache_key
+
+
+def test_keys_ignore_whitespace_but_not_settings():
+    key = make_cache_key('model', 0.3, 'Score  this\nlead')
+
+    assert key == make_cache_key('model', 0.3, ' Score this lead ')
+    assert key != make_cache_key('model', 0.7, 'Score this lead')
+    assert key != make_cache_key('other', 0.3, 'Score this lead')
+    assert key != make_cache_key('model', 0.3, 'Score this lead', max_tokens=200)
+
+
+def test_memory_tier_hits_and_misses():
+    cache = ResponseCache()
+
+    assert cache.get('key') is None
+    cache.set('key', 'answer')
+    assert cache.get('key') == 'answer'
+
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['misses'], stats['writes']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_memory_entries=2)
+    cache.set('a', '1')
+    cache.set('b', '2')
+    cache.get('a')
+    cache.set('c', '3')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == '1'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire(monkeypatch):
+    cache = ResponseCache(ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr('src.utils.llm_cache.time.time', lambda: now[0])
+    cache.set('key', 'answer')
+
+    now[0] += 11
+    assert cache.get('key') is None
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / 'cache' / 'responses.sqlite3')
+    ResponseCache(path=path).set('key', 'answer')
+
+    cache = ResponseCache(path=path)
+    assert cache.get('key') == 'answer'
+    assert cache.get('key') == 'answer'
+    stats = cache.stats()
+    assert (stats['disk_hits'], stats['memory_hits']) == (1, 1)
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / 'responses.sqlite3'))
+    cache.set('key', 'answer')
+    cache.clear()
+
+    assert cache.get('key') is None
+    assert ResponseCache(path=cache.path).get('key') is None
+
+
+def test_delete_removes_one_entry_from_both_tiers(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / 'responses.sqlite3'))
+    cache.set('bad', 'invalid answer')
+    cache.set('good', 'answer')
+    cache.delete('bad')
+    cache.delete('missing')
+
+    assert cache.get('bad') is None
+    assert ResponseCache(path=cache.path).get('bad') is None
+    assert cache.get('good') == 'answer'
@@ -0,0 +1,61 @@
+"""
+Tests for the background log queue
+"""
+
+import threading
+
+from src.utils.log_queue import LogQueue
+
+
+def test_each_batch_is_one_sink_call():
+    batches = []
+    log_queue = LogQueue(sink=batches.append, batch_size=3, flush_interval=5.0)
+    for number in range(7):
+        log_queue.submit(input_query=f'q{number}', status='success')
+
+    assert log_queue.flush()
+    log_queue.close()
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [record['input_query'] for batch in batches for record in batch] == [f'q{n}' for n in range(7)]
+    stats = log_queue.stats()
+    assert (stats['delivered'], stats['batches'], stats['pending']) == (7, 3, 0)
+
+
+def test_sink_failures_are_counted():
+    def sink(records):
+        if records[0]['input_query'] == 'bad':
+            raise RuntimeError('gateway down')
+        return 1
+
+    log_queue = LogQueue(sink=sink, batch_size=2)
+    log_queue.submit(input_query='bad', status='failed')
+    log_queue.flush()
+    log_queue.submit(input_query='good', status='failed')
+    log_queue.submit(input_query='partly', status='failed')
+    log_queue.flush()
+    log_queue.close()
+
+    stats = log_queue.stats()
+    assert (stats['delivered'], stats['errors']) == (1, 2)
+
+
+def test_full_queue_drops_instead_of_blocking():
+    release = threading.Event()
+    log_queue = LogQueue(sink=lambda records: release.wait(5), max_size=2, batch_size=1)
+    accepted = [log_queue.submit(input_query='q', status='failed') for _ in range(10)]
+    release.set()
+    log_queue.close()
+
+    # Two records wait in the queue and at most one is with the sink
+    assert accepted.count(True) in (2, 3)
+    assert log_queue.stats()['dropped'] == accepted.count(False)
+
+
+def test_successes_are_sampled_and_failures_kept():
+    log_queue = LogQueue(sink=lambda records: None, success_sample_rate=0.0)
+
+    assert not log_queue.submit(status='success')
+    assert log_queue.submit(status='failed')
+    log_queue.close()
+    assert log_queue.stats()['sampled_out'] == 1
@@ -0,0 +1,65 @@
+"""
+Tests for multi-team matrix scoring
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.models.lead import Lead
+from src.scoring.rubric import score_lead
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEAMS = {
+    'enterprise': {'industries': ['Technology'], 'company_sizes': ['Enterprise (500+)'], 'regions': ['North America']},
+    'emea': {'industries': ['Finance', 'Retail'], 'company_sizes': ['SMB (51-500)'], 'regions': ['Europe']},
+    'anyone': {'industries': [], 'company_sizes': [], 'regions': []}
+}
+
+LEADS = [
+    Lead(kind='form', email='ada@analytical.com', name='Ada', company='Analytical', designation='CTO',
+         content='Pricing for 300 seats please'),
+    Lead(kind='form', email='bob@gmail.com', name='Bob', company='Shop', designation='Store Manager',
+         content='Tell me more'),
+    Lead(kind='email', email='cy@bank.co.uk', subject='Demo', content='Can we book a demo?')
+]
+CONTACTS = [{'company_name': 'Analytical'}, {'company_name': 'Shop'}, None]
+COMPANIES = [
+    {'industry': 'Technology', 'company_size': 'Enterprise (500+)', 'location': 'Seattle'},
+    {'industry': 'Retail', 'company_size': '120 employees', 'location': 'London'},
+    None
+]
+
+
+def test_matrix_matches_scoring_each_pair():
+    pytest.importorskip('numpy')
+    from src.scoring.matrix import score_lead_matrix
+
+    table = score_lead_matrix(LEADS, CONTACTS, COMPANIES, TEAMS)
+
+    assert table['teams'] == list(TEAMS)
+    for row, (lead, contact, company) in enumerate(zip(LEADS, CONTACTS, COMPANIES)):
+        for column, config in enumerate(TEAMS.values()):
+            expected = score_lead(lead, contact, company, config)
+            assert table['scores'][row][column] == expected['total_score']
+            assert table['company_fit'][row][column] == expected['company_fit_score']
+    assert table['best_team'][:2] == ['enterprise', 'emea']
+    assert list(table['best_score']) == [max(row) for row in table['scores'].tolist()]
+
+
+def test_matrix_needs_a_team():
+    pytest.importorskip('numpy')
+    from src.scoring.matrix import score_lead_matrix
+
+    with pytest.raises(ValueError):
+        score_lead_matrix(LEADS, CONTACTS, COMPANIES, [])
+
+
+def test_scoring_package_does_not_import_numpy():
+    code = 'import sys; import src.scoring; assert "numpy" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                   env=dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + sys.path)))
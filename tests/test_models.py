@@ -0,0 +1,68 @@
+"""
+Tests for the Lead model and JSONL serialization
+"""
+
+import io
+import json
+
+import pytest
+
+from src.models.lead import Lead, get_lead_type
+from src.models.results import QualificationResult, dump_jsonl, load_jsonl
+
+
+EMAIL = {'sender_email': 'ada@analytical.com', 'email_subject': 'Pricing', 'email_content': 'Hi', 'id': 'e1'}
+FORM = {'name': 'Ada', 'company': 'Analytical', 'designation': 'CTO', 'email': 'ada@analytical.com',
+        'query': 'Demo please'}
+
+
+def test_lead_type_is_inferred_or_explicit():
+    assert get_lead_type(EMAIL) == 'email'
+    assert get_lead_type(FORM) == 'form'
+    assert get_lead_type(dict(FORM, type='email')) == 'email'
+    with pytest.raises(ValueError):
+        get_lead_type({'email': 'ada@analytical.com'})
+
+
+def test_leads_round_trip_through_dicts():
+    email = Lead.from_dict(EMAIL)
+    form = Lead.from_dict(FORM, default_id=3)
+
+    assert email.to_dict() == dict(EMAIL, type='email')
+    assert form.to_dict() == dict(FORM, type='form', id=3)
+    assert form.task_fields()['query'] == 'Demo please'
+
+
+def test_fingerprint_ignores_the_id_only():
+    lead = Lead.from_dict(EMAIL)
+
+    assert lead.fingerprint() == Lead.from_dict(dict(EMAIL, id='other')).fingerprint()
+    assert lead.fingerprint() != Lead.from_dict(dict(EMAIL, email_subject='Demo')).fingerprint()
+
+
+def test_results_round_trip_through_jsonl():
+    lead = Lead.from_dict(FORM, default_id=1)
+    results = [
+        QualificationResult.from_stage_data({'sender_name': 'Ada'}, {'industry': 'Technology'},
+                                            {'total_score': 75, 'role_score': 20, 'role_justification': 'CTO',
+                                             'qualification_status': 'Qualified'},
+                                            {'priority': 'High'}, raw='answer', lead=lead),
+        QualificationResult.from_stage_data({}, {}, {'total_score': 10}, {})
+    ]
+    fp = io.StringIO()
+
+    assert dump_jsonl(results, fp) == 2
+    lines = fp.getvalue().splitlines()
+    assert json.loads(lines[1]) == {'score': {'total_score': 10}}
+
+    fp.seek(0)
+    loaded = list(load_jsonl(fp))
+    assert loaded[0].to_record() == results[0].to_record()
+    assert loaded[0].lead == lead
+    assert loaded[1].total_score == 10
+
+
+def test_raw_text_can_be_left_out():
+    result = QualificationResult.from_stage_data({}, {}, {'total_score': 1}, {}, raw='long answer')
+
+    assert 'raw' not in json.loads(result.to_json(include_raw=False))
@@ -0,0 +1,139 @@
+"""
+Tests for packing several leads into each stage request
+"""
+
+import json
+import re
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('katonic')
+
+from src.crew.stages import (
+    pack_items,
+    packed_prompt,
+    parse_packed_response,
+    run_pack,
+    run_packed_qualification,
+    stage_header
+)
+from src.models.lead import Lead
+
+
+TARGET = {'industries': ['Technology'], 'company_sizes': ['Enterprise (500+)'], 'regions': ['North America']}
+
+TAG_PATTERN = re.compile(r'<lead id="(L\d+)">')
+
+
+class FakeLLM:
+    """
+    Answers every tagged lead except those in `skip`, for packs larger than one
+    """
+
+    def __init__(self, skip=(), fail=()):
+        self.skip = set(skip)
+        self.fail = set(fail)
+        self.prompts = []
+
+    def for_agent(self, agent_name):
+        return self
+
+    def generate_completion(self, prompt):
+        self.prompts.append(prompt)
+        tags = TAG_PATTERN.findall(prompt)
+        emails = re.findall(r'"(?:sender_)?email": "([^"]+)"', prompt)
+        if self.fail & set(emails):
+            raise RuntimeError('gateway error')
+        results = []
+        for tag, email in zip(tags, emails):
+            if len(tags) > 1 and email in self.skip:
+                continue
+            results.append({'id': tag, 'sender_name': email.split('@')[0], 'email': email,
+                            'industry': 'Technology', 'total_score': 85, 'qualification_status': 'Qualified',
+                            'next_action': 'Forward to Sales', 'priority': 'High'})
+        return 'Answer:\n' + json.dumps({'results': results})
+
+
+def pack(*emails):
+    return [(index, {'email': email}) for index, email in enumerate(emails)]
+
+
+def test_results_are_split_by_tag():
+    response = json.dumps({'results': [
+        {'id': 'L2', 'industry': 'Retail'},
+        {'id': 'L1', 'industry': 'Technology', 'company_size': 'SMB (51-500)'},
+        {'id': 'L9', 'industry': 'Finance'}
+    ]})
+
+    parsed = parse_packed_response('company', response, ['L1', 'L2'])
+
+    assert parsed == {'L1': {'industry': 'Technology', 'company_size': 'SMB (51-500)'},
+                      'L2': {'industry': 'Retail'}}
+
+
+def test_keyed_answers_are_accepted():
+    response = '{"L1": {"next_action": "Disqualify"}, "L2": {"priority": "Low"}}'
+
+    parsed = parse_packed_response('recommendation', response, ['L1', 'L2'])
+
+    assert parsed['L1']['next_action'] == 'Disqualify'
+    assert parsed['L2']['priority'] == 'Low'
+
+
+def test_invalid_and_empty_sub_answers_are_dropped():
+    response = json.dumps({'results': [
+        {'id': 'L1', 'total_score': 'lots'},
+        {'id': 'L2', 'unrelated': True},
+        'not an entry',
+        {'id': 'L3', 'total_score': 70}
+    ]})
+
+    assert list(parse_packed_response('score', response, ['L1', 'L2', 'L3'])) == ['L3']
+    assert parse_packed_response('score', 'no json', ['L1']) == {}
+
+
+def test_unanswered_leads_are_retried_one_by_one():
+    llm = FakeLLM(skip={'b@x.com'})
+    header = stage_header('contact', TARGET)
+
+    outputs = run_pack('contact', header, pack('a@x.com', 'b@x.com', 'c@x.com'), llm)
+
+    assert [outputs[key]['email'] for key in range(3)] == ['a@x.com', 'b@x.com', 'c@x.com']
+    assert [len(TAG_PATTERN.findall(prompt)) for prompt in llm.prompts] == [3, 1]
+
+
+def test_a_failing_pack_falls_back_to_single_leads():
+    llm = FakeLLM(fail={'b@x.com'})
+    header = stage_header('contact', TARGET)
+
+    outputs = run_pack('contact', header, pack('a@x.com', 'b@x.com'), llm)
+
+    assert outputs[0]['email'] == 'a@x.com'
+    assert isinstance(outputs[1], RuntimeError)
+    assert len(llm.prompts) == 3
+
+
+def test_packs_respect_the_budget_and_the_cap():
+    header = stage_header('contact', TARGET)
+    items = pack(*[f'lead{number}@x.com' for number in range(10)])
+    fixed = len(packed_prompt(header, [])) // 4
+
+    assert [len(group) for group in pack_items(items, 'contact', header, max_pack=4)] == [4, 4, 2]
+    assert all(len(group) == 1 for group in pack_items(items, 'contact', header, token_budget=fixed + 1))
+
+
+def test_batch_runs_every_stage_and_reports_failures():
+    leads = [
+        Lead(kind='email', email='a@x.com', subject='Pricing', content='Pricing please'),
+        Lead(kind='email', email='b@x.com', subject='Demo', content='Demo please')
+    ]
+    llm = FakeLLM(fail={'b@x.com'})
+
+    results = run_packed_qualification(leads, TARGET, 'model', 'me', 'project', 'name', llm=llm,
+                                       local_structuring=False, max_concurrency=2)
+
+    assert [entry['id'] for entry in results] == [0, 1]
+    assert results[0]['result'].score.total_score == 85
+    assert results[0]['result'].recommendation['next_action'] == 'Forward to Sales'
+    assert results[1]['result'] is None and results[1]['error'].startswith('contact stage failed')
@@ -0,0 +1,124 @@
+"""
+Tests for the stage-pipelined batch executor
+"""
+
+import itertools
+import json
+import re
+import threading
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('katonic')
+
+from src.crew.pipeline import run_pipelined_qualification, stage_settings
+from src.models.lead import Lead
+
+
+TARGET = {'industries': ['Technology'], 'company_sizes': ['Enterprise (500+)'], 'regions': ['North America']}
+
+
+class FakeLLM:
+    """
+    Answers each single-lead stage request; fails for addresses in `fail`
+    """
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def for_agent(self, agent_name):
+        return self
+
+    def generate_completion(self, prompt):
+        with self._lock:
+            self.calls += 1
+        email = re.search(r'"email": "([^"]+)"', prompt).group(1)
+        if email in self.fail:
+            raise RuntimeError('gateway error')
+        return json.dumps({'results': [{
+            'id': 'L1', 'sender_name': email.split('@')[0], 'email': email, 'industry': 'Technology',
+            'total_score': 85, 'qualification_status': 'Qualified', 'next_action': 'Forward to Sales',
+            'priority': 'High'
+        }]})
+
+
+def form_lead(number):
+    return Lead(kind='form', email=f'lead{number}@x.com', name=f'Lead {number}', company='X', designation='CTO',
+                content='Pricing please')
+
+
+def run(leads, llm, **kwargs):
+    return run_pipelined_qualification(leads, TARGET, 'model', 'me', 'project', 'name', llm=llm,
+                                       local_structuring=False, **kwargs)
+
+
+def pipeline_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-')]
+
+
+def test_every_lead_finishes_once():
+    llm = FakeLLM(fail={'lead3@x.com'})
+
+    entries = dict(run([form_lead(number) for number in range(8)], llm))
+
+    assert sorted(entries) == list(range(8))
+    assert entries[0]['result'].score.total_score == 85
+    assert entries[3]['result'] is None and entries[3]['error'].startswith('contact stage failed')
+    assert llm.calls == 7 * 4 + 1
+    assert not pipeline_threads()
+
+
+def test_invalid_leads_are_reported_without_stopping_the_batch():
+    entries = dict(run([{'kind': 'nonsense'}, form_lead(1)], FakeLLM()))
+
+    assert entries[0]['result'] is None and entries[0]['error']
+    assert entries[1]['error'] is None
+
+
+def test_rules_scoring_skips_the_scoring_call():
+    llm = FakeLLM()
+
+    entries = dict(run([form_lead(0)], llm, scoring='rules'))
+
+    assert llm.calls == 3
+    assert entries[0]['result'].score.qualification_status is not None
+
+
+def test_stopping_early_joins_every_thread():
+    results = run((form_lead(number) for number in itertools.count()), FakeLLM(), workers=2, queue_sizes=2)
+
+    assert [position for position, _ in itertools.islice(results, 3)]
+    assert pipeline_threads()
+    results.close()
+
+    assert not pipeline_threads()
+
+
+def test_leads_are_read_lazily():
+    read = []
+
+    def leads():
+        for number in itertools.count():
+            read.append(number)
+            yield form_lead(number)
+
+    results = run(leads(), FakeLLM(), workers=1, queue_sizes=1)
+    next(results)
+    next(results)
+    results.close()
+
+    # Two yielded, one waiting in each stage queue, with each worker and in the
+    # results queue, and one held by the feeder
+    assert len(read) <= 2 + 4 + 4 + 1 + 1
+
+
+@pytest.mark.parametrize('values, expected', [
+    (None, {'contact': 2, 'company': 4, 'score': 4, 'recommendation': 2}),
+    (3, {'contact': 3, 'company': 3, 'score': 3, 'recommendation': 3}),
+    ({'lead_scorer': 6, 'contact': 0}, {'contact': 1, 'company': 4, 'score': 6, 'recommendation': 2}),
+])
+def test_stage_settings(values, expected):
+    assert stage_settings(values, {'contact': 2, 'company': 4, 'score': 4, 'recommendation': 2}) == expected
@@ -0,0 +1,99 @@
+"""
+Tests for the per-model token-bucket rate limiter
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.utils.rate_limiter import RateLimiter, estimate_tokens
+
+
+def test_unlimited_limiter_never_waits():
+    limiter = RateLimiter()
+
+    for _ in range(100):
+        assert limiter.acquire(10000) < 0.01
+    assert limiter.stats()['waited'] == 0
+
+
+def test_requests_beyond_the_burst_wait_for_refill():
+    limiter = RateLimiter(requests_per_second=20, burst=2)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+
+    # Two requests come from the burst, two more at 20/s
+    assert time.monotonic() - start >= 0.09
+    assert limiter.stats()['acquired'] == 4
+
+
+def test_large_requests_are_capped_at_the_bucket_size():
+    limiter = RateLimiter(tokens_per_minute=600)
+
+    # A request larger than the whole bucket still goes through once it is full
+    assert limiter.acquire(10000) < 0.01
+
+
+def test_callers_are_served_in_arrival_order():
+    limiter = RateLimiter(requests_per_second=50, burst=1)
+    limiter.acquire()
+    order = []
+    threads = []
+    for number in range(5):
+        thread = threading.Thread(target=lambda n=number: (limiter.acquire(), order.append(n)))
+        thread.start()
+        threads.append(thread)
+        # Each caller takes its ticket before the next one starts
+        while limiter.stats()['queued'] < number + 1:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_token_estimate_grows_with_text():
+    assert estimate_tokens('') == 1
+    assert estimate_tokens('x' * 400) == 101
+
+
+def test_every_gateway_attempt_takes_tokens(monkeypatch):
+    pytest.importorskip('crewai')
+    pytest.importorskip('katonic')
+    from src.agents import lead_agents
+    from src.utils.agent_metrics import AgentMetrics
+    from src.utils.llm_cache import ResponseCache
+    from src.utils.log_queue import LogQueue
+    from src.utils.resilience import RetryPolicy
+
+    class GatewayError(Exception):
+        status_code = 503
+
+    class CountingLimiter:
+        def __init__(self):
+            self.acquired = []
+
+        def acquire(self, tokens=1):
+            self.acquired.append(tokens)
+
+    limiter = CountingLimiter()
+    calls = []
+
+    def generate_completion(model_id, data):
+        calls.append(data['query'])
+        if len(calls) < 3:
+            raise GatewayError('busy')
+        return 'answer'
+
+    monkeypatch.setattr(lead_agents, 'get_rate_limiter', lambda model_id: limiter)
+    monkeypatch.setattr(lead_agents, 'generate_completion', generate_completion)
+    llm = lead_agents.KatonicLLMWrapper('retried-model', 'user@example.com', 'project', 'model',
+                                        cache=ResponseCache(), log_queue=LogQueue(sink=lambda records: None),
+                                        retry_policy=RetryPolicy(max_attempts=3, base_delay=0, max_delay=0),
+                                        hedge=False, metrics=AgentMetrics())
+
+    assert llm.generate_completion('Score this lead') == 'answer'
+    assert len(calls) == 3
+    assert limiter.acquired == [estimate_tokens('Score this lead')] * 3
@@ -0,0 +1,149 @@
+"""
+Tests for the agent registry
+"""
+
+import pytest
+
+pytest.importorskip('crewai')
+pytest.importorskip('katonic')
+
+from src.agents import lead_agents
+from src.agents.lead_agents import KatonicLLMWrapper, create_lead_qualification_agents, resolve_agent_models
+from src.agents.registry import AgentRegistry
+from src.utils.agent_metrics import AgentMetrics
+from src.utils.llm_cache import ResponseCache, make_cache_key
+
+
+def test_checked_in_instances_are_reused():
+    registry = AgentRegistry()
+    built = []
+
+    def factory():
+        built.append(object())
+        return built[-1]
+
+    with registry.checkout('key', factory) as first:
+        pass
+    with registry.checkout('key', factory) as second:
+        pass
+
+    assert first is second
+    assert registry.stats() == {'keys': 1, 'builds': 1, 'reuses': 1}
+
+
+def test_concurrent_checkouts_get_separate_instances():
+    registry = AgentRegistry(max_idle_per_key=1)
+
+    with registry.checkout('key', object) as first:
+        with registry.checkout('key', object) as second:
+            assert first is not second
+
+    # Only one of the two is kept idle
+    with registry.checkout('key', object) as third:
+        with registry.checkout('key', object) as fourth:
+            assert third in (first, second)
+            assert fourth not in (first, second)
+
+
+def test_least_recently_used_key_is_evicted():
+    registry = AgentRegistry(max_keys=2)
+    for key in ('a', 'b', 'c'):
+        with registry.checkout(key, object):
+            pass
+
+    assert registry.stats()['keys'] == 2
+    with registry.checkout('a', object):
+        pass
+    assert registry.stats()['builds'] == 4
+
+
+def test_shared_objects_are_built_once_per_key():
+    registry = AgentRegistry()
+    calls = []
+
+    first = registry.shared('key', 'llm', lambda: calls.append(1) or object())
+    second = registry.shared('key', 'llm', lambda: calls.append(1) or object())
+
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_one_llm_wrapper_per_model_configuration():
+    registry = AgentRegistry()
+
+    first = registry.shared_llm('model', 'user@example.com', 'project', 'gpt', 0.3)
+    second = registry.shared_llm('model', 'user@example.com', 'project', 'gpt', 0.3)
+    other = registry.shared_llm('model', 'user@example.com', 'project', 'gpt', 0.7)
+
+    assert first is second
+    assert other is not first
+
+
+def test_agent_models_are_merged_over_the_defaults():
+    resolved = resolve_agent_models('big', 'Big', 0.3, {'email_parser': {'model_id': 'small', 'max_tokens': 400},
+                                                        'lead_scorer': {'temperature': None}})
+
+    assert resolved['email_parser'] == {'model_id': 'small', 'model_name': 'small', 'temperature': 0.3,
+                                        'max_tokens': 400}
+    assert resolved['lead_scorer'] == {'model_id': 'big', 'model_name': 'Big', 'temperature': 0.3,
+                                       'max_tokens': None}
+    assert set(resolved) == set(lead_agents.AGENT_PROFILES)
+
+
+@pytest.mark.parametrize('agent_models', [{'summarizer': {}}, {'email_parser': {'top_p': 0.9}}])
+def test_unknown_agents_and_settings_are_rejected(agent_models):
+    with pytest.raises(ValueError):
+        resolve_agent_models('big', 'Big', 0.3, agent_models)
+
+
+def test_routing_key_tracks_the_resolved_settings():
+    key = AgentRegistry.routing_key(resolve_agent_models('big', 'Big', 0.3))
+
+    assert key == AgentRegistry.routing_key(resolve_agent_models('big', 'Big', 0.3, {'email_parser': {}}))
+    assert key != AgentRegistry.routing_key(resolve_agent_models('big', 'Big', 0.3,
+                                                                 {'email_parser': {'max_tokens': 400}}))
+    hash(key)
+
+
+def test_agent_llms_are_labelled_and_shared_per_agent():
+    registry = AgentRegistry()
+    routing = {'email_parser': {'model_id': 'small'}}
+
+    llms = registry.agent_llms('big', 'me', 'project', 'Big', 0.3, routing)
+    again = registry.agent_llms('big', 'me', 'project', 'Big', 0.3, routing)
+
+    assert {name: llm.agent_name for name, llm in llms.items()} == {name: name for name in llms}
+    assert llms['email_parser'].model_id == 'small' and llms['lead_scorer'].model_id == 'big'
+    assert all(again[name] is llms[name] for name in llms)
+
+
+def test_shared_wrapper_is_viewed_per_agent():
+    metrics = AgentMetrics()
+    cache = ResponseCache()
+    cache.set(make_cache_key('big', 0.3, 'prompt'), 'answer')
+    llm = KatonicLLMWrapper('big', 'me', 'project', 'Big', cache=cache, metrics=metrics)
+
+    agents = create_lead_qualification_agents('big', 'me', 'project', 'Big', llm=llm,
+                                              agent_models={'lead_scorer': {'model_id': 'small'}})
+
+    assert agents['llm'] is llm
+    assert agents['llms']['email_parser'].agent_name == 'email_parser'
+    assert agents['llms']['email_parser'].cache is llm.cache
+    assert agents['llms']['email_parser'].metrics is metrics
+    assert agents['llms']['lead_scorer'].model_id == 'small'
+    assert llm.agent_name == 'shared'
+
+    agents['llms']['email_parser'].generate_completion('prompt')
+    agents['llms']['company_researcher'].generate_completion('prompt')
+    assert set(metrics.stats()) == {'email_parser', 'company_researcher'}
+
+
+def test_no_unused_default_wrapper_is_built(monkeypatch):
+    built = []
+    monkeypatch.setattr(lead_agents, 'KatonicLLMWrapper',
+                        lambda **kwargs: built.append(kwargs['agent_name']) or KatonicLLMWrapper(**kwargs))
+
+    agents = create_lead_qualification_agents('big', 'me', 'project', 'Big')
+
+    assert sorted(built) == sorted(lead_agents.AGENT_PROFILES)
+    assert agents['llm'] is None
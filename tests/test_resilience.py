@@ -0,0 +1,175 @@
+"""
+Tests for retries, the circuit breaker and request hedging
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.utils import resilience
+from src.utils.concurrency import get_concurrency_limiter
+from src.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_resilience,
+    get_circuit_breaker,
+    get_hedge_executor,
+    hedged_call,
+    is_retryable_error,
+    retry_budget
+)
+
+
+class GatewayError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f'HTTP {status_code}')
+        self.status_code = status_code
+
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+def failing(errors, result='ok'):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return fn, calls
+
+
+def test_errors_are_classified():
+    assert is_retryable_error(GatewayError(503))
+    assert is_retryable_error(TimeoutError())
+    assert is_retryable_error(RuntimeError('Too Many Requests'))
+    assert not is_retryable_error(GatewayError(400))
+    assert not is_retryable_error(ValueError('bad prompt'))
+    assert not is_retryable_error(CircuitOpenError())
+
+
+def test_breaker_opens_then_half_opens_and_closes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    now[0] += 30
+    assert breaker.allow() and breaker.state == 'half_open'
+    # Only one trial call at a time
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+
+def test_failed_trial_reopens_the_breaker(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    now[0] += 30
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+
+def test_transient_errors_are_retried():
+    fn, calls = failing([GatewayError(503), TimeoutError()])
+
+    assert call_with_resilience('retry-model', fn, policy=NO_WAIT, hedge=False) == 'ok'
+    assert len(calls) == 3
+    assert get_circuit_breaker('retry-model').failures == 0
+
+
+def test_non_retryable_errors_fail_at_once_and_leave_the_breaker_alone():
+    breaker = get_circuit_breaker('rejected-model')
+    breaker.record_failure()
+    fn, calls = failing([GatewayError(400)])
+
+    with pytest.raises(GatewayError):
+        call_with_resilience('rejected-model', fn, policy=NO_WAIT, hedge=False)
+    assert len(calls) == 1
+    assert breaker.failures == 1
+
+
+def test_rejected_trial_releases_the_half_open_slot():
+    breaker = get_circuit_breaker('trial-model')
+    breaker.state, breaker.opened_at = 'open', time.monotonic() - breaker.reset_timeout
+    fn, _ = failing([GatewayError(400)])
+
+    with pytest.raises(GatewayError):
+        call_with_resilience('trial-model', fn, policy=NO_WAIT, hedge=False)
+    assert breaker.state == 'half_open'
+    assert call_with_resilience('trial-model', lambda: 'ok', policy=NO_WAIT, hedge=False) == 'ok'
+    assert breaker.state == 'closed'
+
+
+def test_retry_budget_is_shared_across_calls():
+    with retry_budget(1):
+        fn, calls = failing([GatewayError(503)])
+        assert call_with_resilience('budget-model', fn, policy=NO_WAIT, hedge=False) == 'ok'
+        fn, calls = failing([GatewayError(503)])
+        with pytest.raises(GatewayError):
+            call_with_resilience('budget-model', fn, policy=NO_WAIT, hedge=False)
+        assert len(calls) == 1
+
+
+def test_hedged_call_returns_the_faster_duplicate():
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            return 'slow'
+        return 'fast'
+
+    assert hedged_call(fn, 0.01) == 'fast'
+    release.set()
+    assert len(calls) == 2
+
+
+def test_hedges_do_not_queue_behind_primaries():
+    limiter = get_concurrency_limiter('hedge-pool-model')
+    release = threading.Event()
+    started = []
+    lock = threading.Lock()
+
+    def fn():
+        with lock:
+            started.append(1)
+            duplicate = len(started) > limiter.max_limit
+        if duplicate:
+            return 'fast'
+        release.wait(5)
+        return 'slow'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(hedged_call(fn, 0.2, 'hedge-pool-model')))
+               for _ in range(limiter.max_limit)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+    release.set()
+
+    # Every primary is stuck, so each caller must get its duplicate's answer
+    assert results == ['fast'] * limiter.max_limit
+    assert get_hedge_executor('hedge-pool-model')._max_workers == 2 * limiter.max_limit
+
+
+def test_hedging_follows_the_environment(monkeypatch):
+    monkeypatch.setenv('KATONIC_HEDGE_REQUESTS', 'true')
+    assert resilience.hedging_enabled()
+    monkeypatch.setenv('KATONIC_HEDGE_REQUESTS', '0')
+    assert not resilience.hedging_enabled()
@@ -0,0 +1,63 @@
+"""
+Tests for building typed results from task outputs
+"""
+
+from types import SimpleNamespace
+
+from src.models.results import QualificationResult, ScoreBreakdown, task_output_data
+
+
+class Validated:
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def model_dump(self, exclude_none=False):
+        return {key: value for key, value in self.fields.items() if not (exclude_none and value is None)}
+
+
+def output(pydantic=None, json_dict=None, raw=''):
+    return SimpleNamespace(pydantic=pydantic, json_dict=json_dict, raw=raw)
+
+
+def test_task_output_data_prefers_validated_then_json_then_raw():
+    assert task_output_data(output(Validated(a=1, b=None), {'a': 2}, '{"a": 3}')) == {'a': 1}
+    assert task_output_data(output(None, {'a': 2}, '{"a": 3}')) == {'a': 2}
+    assert task_output_data(output(raw='Thought {"a": 3} then {"a": 4}')) == {'a': 4}
+    assert task_output_data(output(raw='no json')) == {}
+    assert task_output_data(None) == {}
+
+
+def test_result_from_crew_output_reads_each_task():
+    crew_output = SimpleNamespace(
+        tasks_output=[
+            output(json_dict={'sender_name': 'Ada', 'intent': 'pricing'}),
+            output(raw='{"industry": "Technology", "company_size": "Enterprise (500+)"}'),
+            output(json_dict={'total_score': 82, 'role_score': 20, 'qualification_status': 'Qualified',
+                              'role_justification': 'CTO'}),
+            output(json_dict={'next_action': 'Forward to Sales', 'priority': 'High'})
+        ],
+        raw='final answer'
+    )
+
+    result = QualificationResult.from_crew_output(crew_output)
+
+    assert result.contact['sender_name'] == 'Ada'
+    assert result.company['industry'] == 'Technology'
+    assert (result.total_score, result.qualification) == (82, 'Qualified')
+    assert result.score.justifications == (('role_score', 'CTO'),)
+    assert result.to_dict()['recommendations']['priority'] == 'High'
+    assert str(result) == 'final answer'
+
+
+def test_missing_tasks_leave_empty_stages():
+    result = QualificationResult.from_crew_output(SimpleNamespace(tasks_output=[], raw=''))
+
+    assert (result.contact, result.company, result.recommendation) == ({}, {}, {})
+    assert (result.total_score, result.qualification) == (0, 'Unknown')
+
+
+def test_total_is_summed_when_the_scorer_omits_it():
+    score = ScoreBreakdown.from_dict({'email_domain_score': '15', 'company_fit_score': 30, 'role_score': 'n/a'})
+
+    assert score.total_score == 45
+    assert score.components() == {'email_domain_score': 15, 'company_fit_score': 30}
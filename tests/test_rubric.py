@@ -0,0 +1,97 @@
+"""
+Tests for the local scoring rubric
+"""
+
+import pytest
+
+from src.models.lead import Lead
+from src.scoring.rubric import (
+    classify_company_size,
+    match_region,
+    qualification_status,
+    score_lead,
+    score_message_intent,
+    score_role
+)
+
+
+TARGET = {
+    'industries': ['Technology', 'Finance'],
+    'company_sizes': ['Enterprise (500+)'],
+    'regions': ['North America']
+}
+
+COMPANY = {'industry': 'Technology / SaaS', 'company_size': 'about 2,000 employees', 'location': 'Boston, MA'}
+
+
+def form_lead(designation='CTO', email='ada@analytical.com', query='Can we get pricing and a demo?'):
+    return Lead(kind='form', email=email, name='Ada', company='Analytical', designation=designation,
+                content=query)
+
+
+def test_strong_lead_scores_full_marks():
+    score = score_lead(form_lead(), {'company_name': 'Analytical'}, COMPANY, TARGET)
+
+    assert score['total_score'] == 100
+    assert (score['email_domain_score'], score['company_fit_score'], score['role_score'],
+            score['message_intent_score']) == (20, 40, 20, 20)
+    assert score['qualification_status'] == 'Qualified'
+    assert score['company_fit_justification'].startswith('Industry matches Technology')
+
+
+def test_components_add_up_to_the_total():
+    lead = form_lead(designation='Marketing Manager', email='ada@gmail.com', query='Tell me more about you')
+    score = score_lead(lead, {'company_name': 'Analytical'}, {'industry': 'Retail', 'location': 'Paris'}, TARGET)
+
+    components = (score['email_domain_score'], score['company_fit_score'], score['role_score'],
+                  score['message_intent_score'])
+    assert components == (10, 0, 10, 0)
+    assert score['total_score'] == sum(components)
+    assert score['qualification_status'] == 'Unqualified'
+
+
+def test_custom_weights_are_normalised_to_100():
+    weights = {'email_domain': 10, 'industry': 10, 'company_size': 10, 'region': 10, 'role': 40,
+               'message_intent': 20}
+    score = score_lead(form_lead(), {}, {}, TARGET, weights)
+
+    # Domain, role and intent: 70 of 100 points
+    assert score['total_score'] == 70
+    assert score['qualification_status'] == 'Needs Review'
+
+
+def test_disposable_domain_scores_zero():
+    score = score_lead(form_lead(email='x@mailinator.com'), {'company_name': 'Analytical'}, COMPANY, TARGET)
+
+    assert score['email_domain_score'] == 0
+
+
+@pytest.mark.parametrize('total, status', [
+    (100, 'Qualified'), (80, 'Qualified'), (79, 'Needs Review'), (50, 'Needs Review'), (49, 'Unqualified')
+])
+def test_status_thresholds(total, status):
+    assert qualification_status(total) == status
+
+
+@pytest.mark.parametrize('designation, points', [
+    ('Chief Executive Officer', 20), ('VP of Sales', 20), ('Head of IT', 20), ('Engineering Manager', 10),
+    ('Senior Developer', 10), ('Marketing Intern', 0), ('Junior Director', 0), ('', 0), ('Developer', 0)
+])
+def test_role_seniority(designation, points):
+    assert score_role(designation, 20)[0] == points
+
+
+def test_message_intent():
+    assert score_message_intent('', 'We need pricing for 200 seats', 20)[0] == 20
+    assert score_message_intent('', 'I would like to learn more about what your company does', 20)[0] == 10
+    assert score_message_intent('', 'hi', 20)[0] == 0
+    assert score_message_intent('', 'Cheap SEO services, click here for a demo', 20)[0] == 0
+
+
+def test_size_and_region_matching():
+    assert classify_company_size('SMB (51-500)') == 'SMB (51-500)'
+    assert classify_company_size('early stage startup') == 'Startup (1-50)'
+    assert classify_company_size('120 employees') == 'SMB (51-500)'
+    assert classify_company_size('unknown') is None
+    assert match_region('Toronto, Canada', ['Europe', 'North America']) == 'North America'
+    assert match_region('Dubai', ['Europe']) is None
@@ -0,0 +1,118 @@
+"""
+Tests for the concurrent task-graph scheduler
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('crewai')
+
+from src.crew import scheduler
+from src.crew.scheduler import CONTEXT_SEPARATOR, get_task_dependencies, run_task_graph
+
+
+class FakeCrewOutput:
+    """
+    Stand-in for CrewOutput, which validates its task outputs as TaskOutput models
+    """
+
+    def __init__(self, raw='', pydantic=None, json_dict=None, tasks_output=None):
+        self.raw = raw
+        self.pydantic = pydantic
+        self.json_dict = json_dict
+        self.tasks_output = tasks_output
+
+
+@pytest.fixture(autouse=True)
+def fake_crew_output(monkeypatch):
+    # The fake tasks return plain outputs, so keep the test independent of
+    # the installed crewai's CrewOutput validation
+    monkeypatch.setattr(scheduler, 'CrewOutput', FakeCrewOutput)
+
+
+class FakeOutput:
+    def __init__(self, raw):
+        self.raw = raw
+        self.pydantic = None
+        self.json_dict = None
+
+
+class FakeTask:
+    """
+    Stand-in for a CrewAI Task that records when it ran and with what context
+    """
+
+    def __init__(self, name, log, context=None, delay=0.0):
+        self.name = name
+        self.log = log
+        self.context = context
+        self.delay = delay
+        self.agent = None
+        self.received = None
+
+    def execute_sync(self, agent=None, context=None):
+        self.log.append(('start', self.name))
+        self.received = context
+        time.sleep(self.delay)
+        self.log.append(('end', self.name))
+        return FakeOutput(self.name)
+
+
+def test_dependencies_only_include_tasks_in_the_graph():
+    log = []
+    outside = FakeTask('outside', log)
+    parse = FakeTask('parse', log)
+    score = FakeTask('score', log, context=[parse, outside])
+
+    assert get_task_dependencies(score, [parse, score]) == [parse]
+    assert get_task_dependencies(parse, [parse, score]) == []
+
+
+def test_tasks_start_after_their_dependencies_finish():
+    log = []
+    parse = FakeTask('parse', log, delay=0.02)
+    research = FakeTask('research', log, context=[parse], delay=0.02)
+    score = FakeTask('score', log, context=[parse, research])
+    recommend = FakeTask('recommend', log, context=[score])
+
+    result = run_task_graph([parse, research, score, recommend])
+
+    position = {event: index for index, event in enumerate(log)}
+    assert position[('end', 'parse')] < position[('start', 'research')]
+    assert position[('end', 'research')] < position[('start', 'score')]
+    assert position[('end', 'score')] < position[('start', 'recommend')]
+    assert [output.raw for output in result.tasks_output] == ['parse', 'research', 'score', 'recommend']
+    assert result.raw == 'recommend'
+    assert score.received == CONTEXT_SEPARATOR.join(['parse', 'research'])
+
+
+def test_independent_tasks_run_at_the_same_time():
+    log = []
+    running = []
+    overlap = threading.Event()
+
+    class TrackingTask(FakeTask):
+        def execute_sync(self, agent=None, context=None):
+            running.append(self.name)
+            if len(running) > 1:
+                overlap.set()
+            time.sleep(0.05)
+            running.remove(self.name)
+            return FakeOutput(self.name)
+
+    tasks = [TrackingTask('parse', log), TrackingTask('research', log)]
+    run_task_graph(tasks, max_workers=2)
+
+    assert overlap.is_set()
+
+
+def test_cycle_is_rejected():
+    log = []
+    first = FakeTask('first', log)
+    second = FakeTask('second', log, context=[first])
+    first.context = [second]
+
+    with pytest.raises(ValueError):
+        run_task_graph([first, second])
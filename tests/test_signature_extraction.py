@@ -0,0 +1,98 @@
+"""
+Tests for local email contact extraction and the shared seniority lexicon
+"""
+
+import pytest
+
+from src.extraction.signature import EMAIL_CONFIDENCE_THRESHOLD, extract_email_contact, find_self_introduction
+from src.models.lead import Lead
+from src.scoring.rubric import score_lead
+from src.scoring.seniority import normalize_title, title_seniority
+
+
+NO_TARGET = {'industries': [], 'company_sizes': [], 'regions': []}
+
+
+SIGNED_EMAIL = """Hi team,
+
+We are evaluating tools for our data platform. Could you share pricing?
+
+Best regards,
+Grace Hopper
+VP Eng, Analytical Engines
++1 555 010 2000
+"""
+
+
+def test_signature_fields_and_confidence():
+    contact, confidence = extract_email_contact('Grace Hopper <grace.hopper@analytical.com>', 'Pricing',
+                                                SIGNED_EMAIL)
+
+    assert contact['sender_name'] == 'Grace Hopper'
+    assert contact['company_name'] == 'Analytical Engines'
+    assert contact['designation'] == 'VP Engineering'
+    assert contact['seniority'] == 'VP'
+    assert contact['domain_type'] == 'business'
+    assert confidence['overall'] >= EMAIL_CONFIDENCE_THRESHOLD
+
+
+def test_missing_signature_has_low_confidence():
+    contact, confidence = extract_email_contact('x123@gmail.com', 'hi', 'hello there')
+
+    assert contact['designation'] == 'Not provided'
+    assert contact['seniority'] == 'Unknown'
+    assert confidence['overall'] < EMAIL_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize('body, title, company', [
+    ('Hello, I am the Head of IT at BigCo and we need a demo.', 'Head of IT', 'BigCo'),
+    ("I'm the VP of Sales at Globex Corp, looking for pricing.", 'VP of Sales', 'Globex Corp'),
+    ('As Director of Operations for Initech we are interested.', 'Director of Operations', 'Initech'),
+    ('I am the CEO of Acme and would like a call.', 'CEO', 'Acme'),
+])
+def test_self_introductions(body, title, company):
+    assert find_self_introduction(body) == (title, company)
+
+
+def test_introduction_without_a_role_is_ignored():
+    assert find_self_introduction('I am a fan of Acme products') is None
+
+
+def test_introduction_fills_title_and_company():
+    contact, confidence = extract_email_contact('h@bigco.com', 'Demo',
+                                                'Hello, I am the Head of IT at BigCo and we need a demo.')
+
+    assert (contact['designation'], contact['company_name']) == ('Head of IT', 'BigCo')
+    assert contact['seniority'] == 'Director'
+    assert confidence['designation'] == 0.7
+
+
+@pytest.mark.parametrize('title, level', [
+    ('Sr Mgr', 'Manager'), ('VP Eng', 'VP'), ('Head of IT', 'Director'), ('Head Chef', 'Director'),
+    ('Partner', 'Director'), ('Managing Partner', 'C-level'), ('Principal Architect', 'Senior contributor'),
+    ('Jr Developer', 'Junior'), ('Data Analyst', 'Individual contributor'), ('Astronaut', None)
+])
+def test_title_seniority(title, level):
+    assert title_seniority(title) == level
+
+
+def test_normalize_title():
+    assert normalize_title('sr. mgr, ops') == 'Senior Manager, Operations'
+
+
+@pytest.mark.parametrize('title', ['Partner', 'Head of Growth', 'Head Chef', 'Principal Architect'])
+def test_rubric_and_extraction_agree(title):
+    lead = Lead(kind='form', email='a@acme.com', name='A', company='Acme', designation=title, content='')
+    score = score_lead(lead, {'designation': title}, {}, NO_TARGET)
+    expected = 20 if title_seniority(title) in ('C-level', 'VP', 'Director') else 10
+
+    assert score['role_score'] == expected
+
+
+def test_rubric_uses_the_extracted_seniority():
+    lead = Lead(kind='email', email='a@acme.com', subject='', content='')
+    score = score_lead(lead, {'designation': 'Growth Wizard', 'seniority': 'VP'}, {}, NO_TARGET)
+    unknown = score_lead(lead, {'designation': 'Growth Wizard', 'seniority': 'Unknown'}, {}, NO_TARGET)
+
+    assert score['role_score'] == 20
+    assert unknown['role_score'] == 0
@@ -0,0 +1,117 @@
+"""
+Tests for coalescing identical in-flight LLM requests
+"""
+
+import threading
+
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+
+def run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'answer'
+
+    leader = run_concurrently(1, lambda: results.append(flight.do('key', fn)))
+    started.wait(5)
+    followers = run_concurrently(4, lambda: results.append(flight.do('key', fn)))
+    while flight.stats()['coalesced'] < 4:
+        pass
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ['answer'] * 5
+    assert flight.stats() == {'executed': 1, 'coalesced': 4}
+
+
+def test_waiters_receive_the_leaders_error():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def fn():
+        started.set()
+        release.wait(5)
+        raise RuntimeError('gateway down')
+
+    def call():
+        try:
+            flight.do('key', fn)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = run_concurrently(1, call)
+    started.wait(5)
+    follower = run_concurrently(1, call)
+    while flight.stats()['coalesced'] < 1:
+        pass
+    release.set()
+    for thread in leader + follower:
+        thread.join(5)
+
+    assert errors == ['gateway down'] * 2
+
+
+def test_finished_calls_run_again_and_keys_are_separate():
+    flight = SingleFlight()
+
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('a', lambda: 2) == 2
+    assert flight.do('b', lambda: 3) == 3
+    with pytest.raises(ValueError):
+        flight.do('a', lambda: int('x'))
+    assert flight.stats() == {'executed': 4, 'coalesced': 0}
+
+
+def test_wrapper_answers_repeats_from_cache_and_coalesces_concurrent_prompts(monkeypatch):
+    pytest.importorskip('crewai')
+    pytest.importorskip('katonic')
+    from src.agents import lead_agents
+    from src.utils.agent_metrics import AgentMetrics
+    from src.utils.llm_cache import ResponseCache
+    from src.utils.log_queue import LogQueue
+
+    release = threading.Event()
+    calls = []
+    payloads = []
+
+    def generate_completion(model_id, data):
+        calls.append(data['query'])
+        payloads.append(data)
+        release.wait(5)
+        return 'answer'
+
+    monkeypatch.setattr(lead_agents, 'generate_completion', generate_completion)
+    flight = SingleFlight()
+    llm = lead_agents.KatonicLLMWrapper('dedup-model', 'user@example.com', 'project', 'model',
+                                        cache=ResponseCache(), log_queue=LogQueue(sink=lambda records: None),
+                                        inflight=flight, metrics=AgentMetrics())
+    results = []
+    threads = run_concurrently(3, lambda: results.append(llm.generate_completion('Score this lead')))
+    while flight.stats()['coalesced'] < 2:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ['answer'] * 3
+    assert llm.generate_completion('Score  this lead') == 'answer'
+    assert calls == ['Score this lead']
+    assert payloads == [{'query': 'Score this lead', 'temperature': 0.3}]
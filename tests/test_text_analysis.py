@@ -0,0 +1,78 @@
+"""
+Tests for parsing free-text lead analyses
+"""
+
+from src.utils.text_analysis import parse_recommendation_lines, parse_text_analysis
+
+
+ANALYSIS = """CONTACT INFORMATION:
+- Name: Ada Lovelace, CTO at Analytical Engines
+
+COMPANY ANALYSIS:
+Mid-size firm; a cold market for some competitors, overall score 10/100 last year.
+
+SCORING BREAKDOWN:
+- Email Domain: 18/20
+- Company Fit: 35/40
+- Role/Seniority: 20/20
+- Message Intent: 15/20
+- Total Score: 88/100
+
+QUALIFICATION LEVEL:
+Hot - strong fit and clear buying intent
+
+RECOMMENDATIONS:
+- Next Action: Forward to Sales
+- Priority: High
+- Reasoning: Decision maker asking about pricing
+
+FINAL ASSESSMENT:
+Recommend a demo this week.
+"""
+
+
+def test_sections_take_precedence_over_prose():
+    result = parse_text_analysis(ANALYSIS)
+
+    assert result['score'] == 88
+    assert result['score_breakdown'] == {
+        'email_domain_score': 18,
+        'company_fit_score': 35,
+        'role_score': 20,
+        'message_intent_score': 15
+    }
+    assert result['qualification'] == 'Hot'
+    assert result['recommendations'] == {
+        'next_action': 'Forward to Sales',
+        'priority': 'High',
+        'reasoning': 'Decision maker asking about pricing'
+    }
+    assert result['analysis_summary'] == ANALYSIS
+
+
+def test_figures_outside_sections_are_a_fallback():
+    result = parse_text_analysis('The lead looks warm. Overall score: 61/100, company fit 30/40.')
+
+    assert result['score'] == 61
+    assert result['score_breakdown'] == {'company_fit_score': 30}
+    assert result['qualification'] == 'Warm'
+
+
+def test_prose_that_starts_like_a_header_is_not_a_section():
+    result = parse_text_analysis('Recommendations for the team are below\nPriority is low')
+
+    assert result['recommendations']['next_action'] == 'Review analysis for specific recommendations'
+
+
+def test_empty_analysis():
+    result = parse_text_analysis('')
+
+    assert (result['score'], result['qualification'], result['recommendations']) == (0, 'Unknown', {})
+
+
+def test_unlabelled_recommendation_lines():
+    assert parse_recommendation_lines(['Book a call', 'This is a high priority lead', 'Budget confirmed']) == {
+        'next_action': 'Book a call',
+        'priority': 'High',
+        'reasoning': 'Budget confirmed'
+    }